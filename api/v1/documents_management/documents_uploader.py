@@ -1,23 +1,44 @@
+import itertools
 import json
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Security, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from sqlalchemy.orm import Session
 
 from constants.core import security as security_constants
 from constants.controller import documents_management as documents_management_constants
 from constants import general as general_constants
+from core.archives import is_archive_file_name, iter_archive_files
+from core.configs import settings
 from core.db_connection import database
-from core.utilities import hash_a_file
+from core.utilities import FileTooLargeError, hash_and_measure_a_file
 from models import TblUsers
 from schemas import (
     AllDocumentsResponse,
+    DocumentBulkUploadManifest,
+    DocumentBulkUploadResponse,
     DocumentDeleteRequest,
+    DocumentsPageResponse,
     DocumentUploadRequest,
     DocumentUploadResponse,
+    EmbeddingCacheStatsResponse,
+    EmbeddingModelResponse,
+    EmbeddingQueueStatsResponse,
+    EmbeddingRequest,
+    EmbeddingResponse,
+    IngestionJobResponse,
 )
 from services import document_management_service, get_current_active_user
+from services.embeddings import (
+    EmbeddingQueueFullError,
+    embedding_cache,
+    embedding_executor,
+    embedding_model_registry,
+)
 
 documents_uploader_controller = APIRouter()
 
@@ -74,7 +95,86 @@ def get_my_uploaded_documents(
         uploader_id=current_user.id
     )
 
-@documents_uploader_controller.post("/upload", response_model=DocumentUploadResponse)
+@documents_uploader_controller.get("/documents/page", response_model=DocumentsPageResponse)
+def get_documents_page(
+    db: Session = Depends(database.get_postgresql_db),
+    *,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+) -> DocumentsPageResponse:
+    """
+    Get a page of all documents, newest first. Pass the next_cursor of a page to get the next one.
+    :param db:
+    :param limit:
+    :param cursor:
+    :param with_total:
+    :param current_user:
+    :return:
+    """
+    try:
+        return document_management_service.get_documents_page(
+            db=db,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
+    except ValueError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_INVALID_CURSOR
+        )
+
+@documents_uploader_controller.get("/documents/me/page", response_model=DocumentsPageResponse)
+def get_my_documents_page(
+    db: Session = Depends(database.get_postgresql_db),
+    *,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+) -> DocumentsPageResponse:
+    """
+    Get a page of the documents uploaded by the current user, newest first
+    :param db:
+    :param limit:
+    :param cursor:
+    :param with_total:
+    :param current_user:
+    :return:
+    """
+    try:
+        return document_management_service.get_documents_page(
+            db=db,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+            uploader_id=current_user.id,
+        )
+    except ValueError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_INVALID_CURSOR
+        )
+
+@documents_uploader_controller.post(
+    "/upload",
+    response_model=DocumentUploadResponse,
+    status_code=general_constants.HTTP_STATUS_ACCEPTED,
+)
 async def upload_a_document(
     db: Session = Depends(database.get_postgresql_db),
     *,
@@ -89,7 +189,10 @@ async def upload_a_document(
     ],
 ):
     """
-    Upload a document
+    Upload a document, the ingestion runs in the background.
+    Poll the returned job_id on /jobs/{job_id} for the ingestion status.
+    The document is spooled by the multipart parser, then hashed and measured in one pass
+    and streamed into the blob store as a file handle.
     :param db:
     :param current_user:
     :param supporting_data:
@@ -119,25 +222,246 @@ async def upload_a_document(
             documents_management_constants.ERR_INVALID_JSON
         )
 
-    document_hash = hash_a_file(document.file)
+    try:
+        document_hash, document_size = await run_in_threadpool(
+            hash_and_measure_a_file,
+            document.file,
+            settings.MAX_UPLOAD_SIZE_BYTES,
+        )
+    except FileTooLargeError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_PAYLOAD_TOO_LARGE,
+            documents_management_constants.ERR_DOCUMENT_TOO_LARGE
+        )
     parsed_supporting_data = json.loads(supporting_data)
     supporting_data_model = DocumentUploadRequest(**parsed_supporting_data)
-    document_contents = await document.read()
-    uploaded_document = document_management_service.upload_source_document(
+    uploaded_document, ingestion_job = await run_in_threadpool(
+        document_management_service.upload_source_document,
         db=db,
         document_name=supporting_data_model.document_name,
         document_type=supporting_data_model.document_type,
         document_description=supporting_data_model.document_description,
         document_hash=document_hash,
-        the_document=document_contents,
+        the_document=document.file,
         uploader_id=current_user.id,
     )
 
     return DocumentUploadResponse(
         document_name=document.filename,
-        document_size=document.file.__sizeof__(),
+        document_size=document_size,
+        document_hash=document_hash,
+        document_id=uploaded_document.id,
+        job_id=ingestion_job.job_id,
+        job_status=ingestion_job.status,
+    )
+
+@documents_uploader_controller.put(
+    "/documents/{document_id}",
+    response_model=DocumentUploadResponse,
+    status_code=general_constants.HTTP_STATUS_ACCEPTED,
+)
+async def replace_a_document(
+    db: Session = Depends(database.get_postgresql_db),
+    *,
+    document_id: int,
+    document: UploadFile,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_WRITE_DOCUMENTS]
+        )
+    ],
+):
+    """
+    Replace the file of a document, e.g. a corrected regulation, the ingestion runs in the background.
+    Only the chunks that changed are embedded again, the ingestion job reports the chunks
+    added, kept and deleted.
+    :param db:
+    :param document_id:
+    :param document:
+    :param current_user:
+    :return:
+    """
+    try:
+        document_hash, document_size = await run_in_threadpool(
+            hash_and_measure_a_file,
+            document.file,
+            settings.MAX_UPLOAD_SIZE_BYTES,
+        )
+    except FileTooLargeError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_PAYLOAD_TOO_LARGE,
+            documents_management_constants.ERR_DOCUMENT_TOO_LARGE
+        )
+    replaced_document = await run_in_threadpool(
+        document_management_service.replace_source_document,
+        db=db,
+        document_id=document_id,
+        document_hash=document_hash,
+        the_document=document.file,
+    )
+    if not replaced_document:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_NOT_FOUND,
+            general_constants.HTTP_STATUS_DETAIL_NOT_FOUND
+        )
+    uploaded_document, ingestion_job = replaced_document
+
+    return DocumentUploadResponse(
+        document_name=document.filename,
+        document_size=document_size,
         document_hash=document_hash,
         document_id=uploaded_document.id,
+        job_id=ingestion_job.job_id,
+        job_status=ingestion_job.status,
+    )
+
+@documents_uploader_controller.post(
+    documents_management_constants.BULK_UPLOAD_PATH,
+    response_model=DocumentBulkUploadResponse,
+    status_code=general_constants.HTTP_STATUS_ACCEPTED,
+)
+async def bulk_upload_documents(
+    *,
+    manifest: str = Form(...),
+    documents: Optional[List[UploadFile]] = None,
+    archive: Optional[UploadFile] = None,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_WRITE_DOCUMENTS]
+        )
+    ],
+)->DocumentBulkUploadResponse:
+    """
+    Upload many documents at once, either as files or as a zip/tar archive.
+    The manifest is a JSON of {"documents": [{"file_name", "document_name", "document_description",
+    "document_type"}, ...]}, a file is matched to its metadata by its file name, or by its path or
+    base name in the archive. The files are uploaded concurrently, up to BULK_UPLOAD_MAX_PARALLELISM
+    at a time, and each one gets its own result and ingestion job.
+    :param manifest:
+    :param documents:
+    :param archive:
+    :param current_user:
+    :return:
+    """
+    try:
+        parsed_manifest = DocumentBulkUploadManifest.model_validate_json(manifest)
+    except ValidationError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_INVALID_MANIFEST
+        )
+    if bool(documents) == bool(archive):
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_NO_BULK_DOCUMENTS
+        )
+    if len(parsed_manifest.documents) > settings.BULK_UPLOAD_MAX_FILES or (
+        documents and len(documents) > settings.BULK_UPLOAD_MAX_FILES
+    ):
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_TOO_MANY_BULK_DOCUMENTS
+        )
+    if archive and not is_archive_file_name(archive.filename or ""):
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_UNSUPPORTED_ARCHIVE
+        )
+
+    manifest_by_file_name = {document.file_name: document for document in parsed_manifest.documents}
+    if archive:
+        document_files = itertools.islice(
+            iter_archive_files(archive.file, archive.filename),
+            settings.BULK_UPLOAD_MAX_FILES,
+        )
+    else:
+        document_files = ((document.filename or "", document.file) for document in documents)
+    try:
+        results = await document_management_service.bulk_upload_source_documents(
+            uploader_id=current_user.id,
+            manifest=manifest_by_file_name,
+            document_files=document_files,
+            is_spooled=not archive,
+            archive_name=archive.filename if archive else None,
+        )
+    except ValueError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_UNSUPPORTED_ARCHIVE
+        )
+
+    failed_count = sum(1 for result in results if result.error)
+    return DocumentBulkUploadResponse(
+        results=results,
+        uploaded_count=len(results) - failed_count,
+        failed_count=failed_count,
+    )
+
+@documents_uploader_controller.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+def get_ingestion_job_status(
+    db: Session = Depends(database.get_postgresql_db),
+    *,
+    job_id: str,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->IngestionJobResponse:
+    """
+    Get the status of a document ingestion job
+    :param db:
+    :param job_id:
+    :param current_user:
+    :return:
+    """
+    ingestion_job = document_management_service.get_ingestion_job(db=db, job_id=job_id)
+    if not ingestion_job:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_NOT_FOUND,
+            documents_management_constants.ERR_JOB_NOT_FOUND
+        )
+    return ingestion_job
+
+@documents_uploader_controller.get("/documents/{document_id}/download")
+def download_document(
+    db: Session = Depends(database.get_postgresql_db),
+    *,
+    document_id: int,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->StreamingResponse:
+    """
+    Download a document, streamed from the blob store
+    :param db:
+    :param document_id:
+    :param current_user:
+    :return:
+    """
+    document_download = document_management_service.get_document_download(db=db, document_id=document_id)
+    if not document_download:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_NOT_FOUND,
+            general_constants.HTTP_STATUS_DETAIL_NOT_FOUND
+        )
+    uploaded_document, document_chunks = document_download
+    return StreamingResponse(
+        document_chunks,
+        media_type=documents_management_constants.DOCUMENT_MEDIA_TYPE_PDF,
+        headers={
+            general_constants.HEADERS_CONTENT_DISPOSITION: f'attachment; filename="{uploaded_document.document_hash}.pdf"'
+        },
     )
 
 @documents_uploader_controller.delete("/documents/{document_id}", response_model=AllDocumentsResponse)
@@ -186,3 +510,130 @@ def bulk_delete_document(
         db=db,
         document_ids=[item_data.document_ids for item_data in data]
     )
+
+@documents_uploader_controller.get("/embedding-models", response_model=List[EmbeddingModelResponse])
+def get_embedding_models(
+    *,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->List[EmbeddingModelResponse]:
+    """
+    Get the embedding models loaded by this process and their memory
+    :param current_user:
+    :return:
+    """
+    return embedding_model_registry.list_models()
+
+@documents_uploader_controller.delete("/embedding-models/{model_name:path}", response_model=List[EmbeddingModelResponse])
+def unload_embedding_model(
+    *,
+    model_name: str,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_UPDATE_DOCUMENTS]
+        )
+    ],
+)->List[EmbeddingModelResponse]:
+    """
+    Unload an embedding model of this process, it is loaded again on its next use
+    :param model_name:
+    :param current_user:
+    :return: the models still loaded
+    """
+    if not embedding_model_registry.unload(model_name):
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_NOT_FOUND,
+            documents_management_constants.ERR_EMBEDDING_MODEL_NOT_LOADED
+        )
+    return embedding_model_registry.list_models()
+
+@documents_uploader_controller.get("/embedding-cache", response_model=EmbeddingCacheStatsResponse)
+def get_embedding_cache_stats(
+    *,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->EmbeddingCacheStatsResponse:
+    """
+    Get the hits, misses and size of the embedding cache tiers of this process
+    :param current_user:
+    :return:
+    """
+    if embedding_cache is None:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_NOT_FOUND,
+            documents_management_constants.ERR_EMBEDDING_CACHE_DISABLED
+        )
+    return EmbeddingCacheStatsResponse(**embedding_cache.get_stats())
+
+@documents_uploader_controller.post("/embeddings", response_model=EmbeddingResponse)
+async def embed_texts(
+    *,
+    embedding_request: EmbeddingRequest,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->EmbeddingResponse:
+    """
+    Embed texts, e.g. search queries, with the embedding model of the documents.
+    The event loop is not blocked: the OpenAI models are called asynchronously
+    and the local models run on the bounded embedding executor.
+    :param embedding_request:
+    :param current_user:
+    :return:
+    """
+    if not embedding_request.texts:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_NO_EMBEDDING_TEXTS
+        )
+    if len(embedding_request.texts) > settings.EMBEDDING_REQUEST_MAX_TEXTS:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_BAD_REQUEST,
+            documents_management_constants.ERR_TOO_MANY_EMBEDDING_TEXTS
+        )
+    try:
+        embeddings = await document_management_service.aget_dense_vectors_from_texts(
+            embedding_request.texts,
+            settings.EMBEDDING_MODEL,  # type: ignore
+            settings.OPENAI_API_KEY,
+        )
+    except EmbeddingQueueFullError:
+        raise HTTPException(
+            general_constants.HTTP_STATUS_ERROR_SERVICE_UNAVAILABLE,
+            documents_management_constants.ERR_EMBEDDING_QUEUE_FULL
+        )
+    return EmbeddingResponse(embedding_model=settings.EMBEDDING_MODEL, embeddings=embeddings.tolist())
+
+@documents_uploader_controller.get("/embedding-queue", response_model=EmbeddingQueueStatsResponse)
+def get_embedding_queue_stats(
+    *,
+    current_user: Annotated[
+        TblUsers,
+        Security(
+            get_current_active_user,
+            scopes=[security_constants.PERMISSION_READ_DOCUMENTS]
+        )
+    ],
+)->EmbeddingQueueStatsResponse:
+    """
+    Get the queue depth and the task counts of the embedding executor of this process
+    :param current_user:
+    :return:
+    """
+    return EmbeddingQueueStatsResponse(**embedding_executor.get_stats())
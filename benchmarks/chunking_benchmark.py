@@ -0,0 +1,289 @@
+"""
+Benchmark of the Chunking strategies: throughput, peak memory and chunk size distribution
+over a synthetic corpus and a fixture corpus of Indonesian law.
+
+    python -m benchmarks.chunking_benchmark --output chunking_results.json
+    python -m benchmarks.chunking_benchmark --baseline chunking_results.json
+
+The semantic chunking backed by the OpenAI API is not benchmarked, the local semantic
+chunking is, with a hashing embedding, so it measures the chunking engine and not a model.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import zlib
+
+import numpy as np
+
+from services.rag import Chunking
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CORPUS_FILE_EXTENSIONS = (".txt", ".pdf")
+HASHING_EMBEDDING_DIM = 256
+SIZE_PERCENTILES = (50, 90, 99)
+SYNTHETIC_SEED = 13
+SYNTHETIC_VOCABULARY = (
+    "pekerja", "buruh", "pengusaha", "upah", "lembur", "waktu", "kerja", "cuti", "tahunan", "hari",
+    "minggu", "perjanjian", "hubungan", "pemutusan", "pesangon", "serikat", "perusahaan", "wajib",
+    "berhak", "ketentuan", "sebagaimana", "dimaksud", "dalam", "ayat", "diatur", "dengan", "peraturan",
+    "menteri", "pemerintah", "bagi", "yang", "dan", "atau", "paling", "banyak", "sedikit", "jam",
+)
+ROMAN_NUMERALS = (
+    (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+    (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+)
+
+# Strategy name -> function chunking a Chunking into a list of chunk texts
+ChunkingStrategy = Callable[[Chunking], List[str]]
+
+def hashing_embed_function(texts: List[str])->np.ndarray:
+    """
+    Function to embed texts as hashed bags of words, deterministic across processes
+    :param texts:
+    :return: (n_texts, HASHING_EMBEDDING_DIM) matrix
+    """
+    embeddings = np.zeros((len(texts), HASHING_EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            embeddings[row, zlib.crc32(word.encode("utf-8")) % HASHING_EMBEDDING_DIM] += 1.
+    return embeddings
+
+STRATEGIES: Dict[str, ChunkingStrategy] = {
+    "fixed_length": lambda chunking: chunking.fixed_length(1000),
+    "sentence_based": lambda chunking: chunking.sentence_based(),
+    "paragraph_based": lambda chunking: chunking.paragraph_based(),
+    "sliding_windows": lambda chunking: chunking.sliding_windows(n_slide=2),
+    "recursive_chunking": lambda chunking: chunking.recursive_chunking(chunk_size=1000, chunk_overlap=200),
+    "legal_structure_based": lambda chunking: [
+        legal_chunk.text for legal_chunk in chunking.legal_structure_based(max_chunk_size=2000)
+    ],
+    "token_based": lambda chunking: chunking.token_based(max_tokens=512, overlap_tokens=64),
+    "local_semantic_chunking": lambda chunking: chunking.local_semantic_chunking(
+        embed_function=hashing_embed_function
+    ),
+}
+
+def to_roman_numeral(number: int)->str:
+    """
+    Function to write a positive number in Roman numerals, as the chapters of the statutes are numbered
+    :param number:
+    :return:
+    """
+    roman_numeral = ""
+    for value, symbols in ROMAN_NUMERALS:
+        count, number = divmod(number, value)
+        roman_numeral += symbols * count
+    return roman_numeral
+
+def generate_synthetic_corpus(
+    n_documents: int = 20,
+    n_articles: int = 50,
+    seed: int = SYNTHETIC_SEED,
+)->List[str]:
+    """
+    Function to generate statute-like documents with chapters, articles and numbered paragraphs,
+    the same for the same seed
+    :param n_documents:
+    :param n_articles: articles per document
+    :param seed:
+    :return:
+    """
+    random_generator = random.Random(seed)
+
+    def sentence()->str:
+        words = random_generator.choices(SYNTHETIC_VOCABULARY, k=random_generator.randint(8, 30))
+        return " ".join(words).capitalize() + "."
+
+    documents = []
+    for document_number in range(1, n_documents + 1):
+        lines = [f"UNDANG-UNDANG NOMOR {document_number} TAHUN 2025", "TENTANG KETENAGAKERJAAN", ""]
+        for article_number in range(1, n_articles + 1):
+            if article_number % 10 == 1:
+                lines += ["", f"BAB {to_roman_numeral(article_number // 10 + 1)}", "KETENTUAN"]
+            lines.append(f"Pasal {article_number}")
+            for paragraph_number in range(1, random_generator.randint(1, 5) + 1):
+                sentences = " ".join(sentence() for _ in range(random_generator.randint(1, 4)))
+                lines.append(f"({paragraph_number}) {sentences}")
+            lines.append("")
+        documents.append("\n".join(lines))
+    return documents
+
+def load_corpus(corpus_dir: str)->List[str]:
+    """
+    Function to load the text of every .txt and .pdf file of a directory, in name order
+    :param corpus_dir:
+    :return:
+    """
+    documents = []
+    for file_name in sorted(os.listdir(corpus_dir)):
+        file_path = os.path.join(corpus_dir, file_name)
+        if file_name.lower().endswith(".txt"):
+            with open(file_path, encoding="utf-8") as corpus_file:
+                documents.append(corpus_file.read())
+        elif file_name.lower().endswith(".pdf"):
+            # Imported here, the extraction service is only needed for PDF corpora
+            from services.extraction import pdf_extraction_service
+            documents.append(pdf_extraction_service.extract_pages(file_path).get_full_text())
+    return documents
+
+def get_size_distribution(chunk_sizes: Sequence[int])->Dict[str, float]:
+    """
+    Function to summarize the chunk sizes, in characters
+    :param chunk_sizes:
+    :return:
+    """
+    if not chunk_sizes:
+        return {}
+    sizes = np.asarray(chunk_sizes, dtype=np.float64)
+    distribution = {
+        "min": float(sizes.min()),
+        "mean": float(sizes.mean()),
+        "std": float(sizes.std()),
+        "max": float(sizes.max()),
+    }
+    for percentile, value in zip(SIZE_PERCENTILES, np.percentile(sizes, SIZE_PERCENTILES)):
+        distribution[f"p{percentile}"] = float(value)
+    return distribution
+
+def benchmark_strategy(strategy: ChunkingStrategy, corpus: List[str], repeats: int = 3)->Dict[str, Any]:
+    """
+    Function to benchmark a chunking strategy over a corpus. The timed runs are separate from the
+    run measuring the peak memory, as tracemalloc slows down the allocations.
+    :param strategy:
+    :param corpus:
+    :param repeats: timed runs, the median is reported
+    :return:
+    """
+    n_chars = sum(len(document) for document in corpus)
+    elapsed_seconds = []
+    chunks: List[str] = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        chunks = [chunk for document in corpus for chunk in strategy(Chunking(document))]
+        elapsed_seconds.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        for document in corpus:
+            strategy(Chunking(document))
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median_seconds = statistics.median(elapsed_seconds)
+    return {
+        "n_documents": len(corpus),
+        "n_chars": n_chars,
+        "n_chunks": len(chunks),
+        "median_seconds": median_seconds,
+        "min_seconds": min(elapsed_seconds),
+        "chars_per_second": n_chars / median_seconds if median_seconds else None,
+        "chunks_per_second": len(chunks) / median_seconds if median_seconds else None,
+        "peak_memory_bytes": peak_memory_bytes,
+        "chunk_size_chars": get_size_distribution([len(chunk) for chunk in chunks]),
+    }
+
+def run_benchmark(
+    corpora: Dict[str, List[str]],
+    strategy_names: Optional[Sequence[str]] = None,
+    repeats: int = 3,
+)->Dict[str, Any]:
+    """
+    Function to benchmark the chunking strategies over every corpus. A strategy that fails,
+    e.g. without its tokenizer, is reported with its error.
+    :param corpora: corpus name -> documents
+    :param strategy_names: all the STRATEGIES if None
+    :param repeats:
+    :return: machine-readable results
+    """
+    results: Dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "corpora": {},
+    }
+    for corpus_name, corpus in corpora.items():
+        corpus_results = {}
+        for strategy_name in strategy_names or STRATEGIES:
+            try:
+                corpus_results[strategy_name] = benchmark_strategy(STRATEGIES[strategy_name], corpus, repeats)
+            except Exception as e:
+                corpus_results[strategy_name] = {"error": f"{type(e).__name__}: {e}"}
+        results["corpora"][corpus_name] = corpus_results
+    return results
+
+def format_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None)->str:
+    """
+    Function to format the results as a table, with the throughput relative to a baseline run
+    :param results:
+    :param baseline:
+    :return:
+    """
+    header = (
+        f"{'corpus':<10} {'strategy':<24} {'chars/s':>12} {'chunks/s':>10} "
+        f"{'peak MiB':>9} {'p50':>7} {'p90':>7} {'max':>7}"
+    )
+    if baseline:
+        header += f" {'vs base':>8}"
+    lines = [header]
+    for corpus_name, corpus_results in results["corpora"].items():
+        for strategy_name, strategy_results in corpus_results.items():
+            if "error" in strategy_results:
+                lines.append(f"{corpus_name:<10} {strategy_name:<24} {strategy_results['error']}")
+                continue
+            sizes = strategy_results["chunk_size_chars"]
+            line = (
+                f"{corpus_name:<10} {strategy_name:<24} {strategy_results['chars_per_second'] or 0:>12,.0f} "
+                f"{strategy_results['chunks_per_second'] or 0:>10,.0f} "
+                f"{strategy_results['peak_memory_bytes'] / 2 ** 20:>9.1f} "
+                f"{sizes.get('p50', 0):>7.0f} {sizes.get('p90', 0):>7.0f} {sizes.get('max', 0):>7.0f}"
+            )
+            if baseline:
+                baseline_results = baseline.get("corpora", {}).get(corpus_name, {}).get(strategy_name, {})
+                if baseline_results.get("chars_per_second") and strategy_results["chars_per_second"]:
+                    line += f" {strategy_results['chars_per_second'] / baseline_results['chars_per_second']:>7.2f}x"
+            lines.append(line)
+    return "\n".join(lines)
+
+def main(arguments: Optional[Sequence[str]] = None):
+    """
+    Function to run the benchmark from the command line
+    :param arguments:
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Chunking strategies.")
+    parser.add_argument("--corpus-dir", default=FIXTURES_DIR, help="directory of .txt and .pdf documents")
+    parser.add_argument("--synthetic-documents", type=int, default=20)
+    parser.add_argument("--synthetic-articles", type=int, default=50)
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="JSON file the results are saved to")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare to")
+    parsed_arguments = parser.parse_args(arguments)
+
+    corpora = {
+        "synthetic": generate_synthetic_corpus(parsed_arguments.synthetic_documents, parsed_arguments.synthetic_articles),
+        "fixture": load_corpus(parsed_arguments.corpus_dir),
+    }
+    results = run_benchmark(corpora, parsed_arguments.strategies, parsed_arguments.repeats)
+
+    baseline = None
+    if parsed_arguments.baseline:
+        with open(parsed_arguments.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_results(results, baseline))
+    if parsed_arguments.output:
+        with open(parsed_arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
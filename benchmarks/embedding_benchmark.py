@@ -0,0 +1,173 @@
+"""
+Benchmark of the BERT embedding backends on CPU: throughput of the fp32 model and of its int8
+dynamically quantized variant over chunks of a corpus, and the parity of their vectors.
+
+    python -m benchmarks.embedding_benchmark --model bert-base-uncased --threads 1
+    python -m benchmarks.embedding_benchmark --output embedding_results.json
+
+The process exits with an error when the quantized vectors disagree with the fp32 vectors
+beyond --min-cosine.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import torch
+
+from benchmarks.chunking_benchmark import FIXTURES_DIR, generate_synthetic_corpus, load_corpus
+from constants.core import DEVICE_CPU
+from constants.services import embeddings as embeddings_constants
+from services.embeddings import BertEncoder, EmbeddingModelRegistry, check_quantized_parity
+from services.rag import Chunking
+
+BACKENDS = {"fp32": False, "int8": True}
+
+def get_benchmark_chunks(corpus: List[str], max_chunks: int)->List[str]:
+    """
+    Function to chunk a corpus like the ingestion does by default
+    :param corpus:
+    :param max_chunks:
+    :return:
+    """
+    chunks = [
+        chunk
+        for document in corpus
+        for chunk in Chunking(document).recursive_chunking(chunk_size=1000, chunk_overlap=200)
+    ]
+    return chunks[:max_chunks]
+
+def benchmark_backend(encoder: BertEncoder, chunks: List[str], repeats: int = 3)->Dict[str, Any]:
+    """
+    Function to benchmark an encoder over chunks, after a warmup batch
+    :param encoder:
+    :param chunks:
+    :param repeats: timed runs, the median is reported
+    :return:
+    """
+    encoder.encode(chunks[:encoder.batch_size])
+    elapsed_seconds = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        encoder.encode(chunks)
+        elapsed_seconds.append(time.perf_counter() - start_time)
+
+    median_seconds = statistics.median(elapsed_seconds)
+    chunks_per_second = len(chunks) / median_seconds if median_seconds else None
+    loaded_model = encoder.registry.get(encoder.model_name, encoder.quantized)
+    return {
+        "n_chunks": len(chunks),
+        "median_seconds": median_seconds,
+        "min_seconds": min(elapsed_seconds),
+        "chunks_per_second": chunks_per_second,
+        "chunks_per_second_per_thread": chunks_per_second / torch.get_num_threads() if chunks_per_second else None,
+        "memory_bytes": loaded_model.get_memory_bytes(),
+    }
+
+def run_benchmark(
+    model_name: str,
+    chunks: List[str],
+    num_threads: Optional[int] = 1,
+    batch_size: int = 32,
+    repeats: int = 3,
+    min_cosine: float = embeddings_constants.QUANTIZATION_PARITY_MIN_COSINE,
+)->Dict[str, Any]:
+    """
+    Function to benchmark the fp32 and int8 backends of a model and check their parity
+    :param model_name:
+    :param chunks:
+    :param num_threads: torch threads, torch's default when None
+    :param batch_size:
+    :param repeats:
+    :param min_cosine: parity threshold
+    :return: machine-readable results
+    """
+    registry = EmbeddingModelRegistry(device=DEVICE_CPU, num_threads=num_threads)
+    backends = {
+        backend_name: benchmark_backend(
+            BertEncoder(model_name, batch_size=batch_size, quantized=quantized, registry=registry),
+            chunks,
+            repeats,
+        )
+        for backend_name, quantized in BACKENDS.items()
+    }
+    parity = check_quantized_parity(model_name, chunks, min_cosine, registry=registry, batch_size=batch_size)
+    fp32_throughput = backends["fp32"]["chunks_per_second"]
+    int8_throughput = backends["int8"]["chunks_per_second"]
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "model": model_name,
+        "threads": torch.get_num_threads(),
+        "batch_size": batch_size,
+        "repeats": repeats,
+        "backends": backends,
+        "speedup": int8_throughput / fp32_throughput if fp32_throughput and int8_throughput else None,
+        "parity": parity._asdict(),
+    }
+
+def format_results(results: Dict[str, Any])->str:
+    """
+    Function to format the results as a table
+    :param results:
+    :return:
+    """
+    lines = [
+        f"{results['model']} on {results['threads']} threads, batches of {results['batch_size']}",
+        f"{'backend':<8} {'chunks/s':>10} {'chunks/s/thread':>16} {'model MiB':>10}",
+    ]
+    for backend_name, backend_results in results["backends"].items():
+        lines.append(
+            f"{backend_name:<8} {backend_results['chunks_per_second'] or 0:>10,.1f} "
+            f"{backend_results['chunks_per_second_per_thread'] or 0:>16,.1f} "
+            f"{backend_results['memory_bytes'] / 2 ** 20:>10.1f}"
+        )
+    parity = results["parity"]
+    lines.append(f"int8 speedup {results['speedup'] or 0:.2f}x")
+    lines.append(
+        f"parity {'passed' if parity['passed'] else 'FAILED'}: min cosine {parity['min_cosine']:.4f}, "
+        f"mean cosine {parity['mean_cosine']:.4f}, threshold {parity['min_cosine_threshold']}"
+    )
+    return "\n".join(lines)
+
+def main(arguments: Optional[Sequence[str]] = None)->int:
+    """
+    Function to run the benchmark from the command line
+    :param arguments:
+    :return: exit code, 1 when the parity check fails
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the fp32 and int8 BERT embedding backends.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Huggingface model id or local path")
+    parser.add_argument("--corpus-dir", default=FIXTURES_DIR, help="directory of .txt and .pdf documents")
+    parser.add_argument("--synthetic-documents", type=int, default=5)
+    parser.add_argument("--max-chunks", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=1, help="torch threads, 0 for torch's default")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=embeddings_constants.QUANTIZATION_PARITY_MIN_COSINE)
+    parser.add_argument("--output", help="JSON file the results are saved to")
+    parsed_arguments = parser.parse_args(arguments)
+
+    corpus = load_corpus(parsed_arguments.corpus_dir) + generate_synthetic_corpus(parsed_arguments.synthetic_documents)
+    results = run_benchmark(
+        parsed_arguments.model,
+        get_benchmark_chunks(corpus, parsed_arguments.max_chunks),
+        num_threads=parsed_arguments.threads or None,
+        batch_size=parsed_arguments.batch_size,
+        repeats=parsed_arguments.repeats,
+        min_cosine=parsed_arguments.min_cosine,
+    )
+    print(format_results(results))
+    if parsed_arguments.output:
+        with open(parsed_arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    return 0 if results["parity"]["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
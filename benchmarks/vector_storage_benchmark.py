@@ -0,0 +1,194 @@
+"""
+Benchmark of the storage options of the dense embeddings: recall@k against the full float32 vectors
+versus the vector memory, for every kept dimension count and vector precision.
+
+    python -m benchmarks.vector_storage_benchmark --dimensions 1024 512 256
+    python -m benchmarks.vector_storage_benchmark --embeddings-file embeddings.npy --output storage_results.json
+
+The search is exact, so the recall measures the loss of the truncation and of the precision alone,
+not of the Milvus index. Without an embeddings file, synthetic Matryoshka-like vectors are used:
+their variance decays along the dimensions, as in the models trained to be truncated.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from constants.core import VECTOR_PRECISION_BYTES, VECTOR_PRECISION_FLOAT32
+from core.vector_storage import get_vector_memory_bytes, round_trip_vectors, truncate_vectors
+
+SYNTHETIC_SEED = 13
+
+def generate_matryoshka_embeddings(
+    n_vectors: int = 20000,
+    dimensions: int = 1024,
+    decay: float = 0.5,
+    seed: int = SYNTHETIC_SEED,
+)->np.ndarray:
+    """
+    Function to generate normalized vectors whose dimension i has a standard deviation of (i + 1) ** -decay
+    :param n_vectors:
+    :param dimensions:
+    :param decay: the larger, the more the leading dimensions dominate
+    :param seed:
+    :return: float32 (n_vectors, dimensions)
+    """
+    random_generator = np.random.default_rng(seed)
+    scales = np.arange(1, dimensions + 1, dtype=np.float32) ** -decay
+    vectors = random_generator.standard_normal((n_vectors, dimensions), dtype=np.float32) * scales
+    return truncate_vectors(vectors, dimensions)
+
+def generate_queries(corpus: np.ndarray, n_queries: int = 200, noise: float = 0.5, seed: int = SYNTHETIC_SEED)->np.ndarray:
+    """
+    Function to generate queries as noisy copies of vectors of the corpus, like paraphrases of chunks
+    :param corpus: (n, dim), normalized
+    :param n_queries:
+    :param noise: norm of the noise relative to the vectors
+    :param seed:
+    :return: float32 (n_queries, dim), normalized
+    """
+    random_generator = np.random.default_rng(seed + 1)
+    sources = corpus[random_generator.choice(len(corpus), size=n_queries, replace=False)]
+    perturbations = truncate_vectors(random_generator.standard_normal(sources.shape, dtype=np.float32), sources.shape[1])
+    return truncate_vectors(sources + noise * perturbations, sources.shape[1])
+
+def search_top_k(corpus: np.ndarray, queries: np.ndarray, k: int)->np.ndarray:
+    """
+    Function to find the k nearest vectors of every query by cosine, exactly
+    :param corpus: (n, dim), normalized
+    :param queries: (n_queries, dim), normalized
+    :param k:
+    :return: (n_queries, k) indexes in the corpus, unordered
+    """
+    scores = queries @ corpus.T
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+def get_recall_at_k(reference_ids: np.ndarray, candidate_ids: np.ndarray)->float:
+    """
+    Function to get the share of the reference neighbors found among the candidate neighbors
+    :param reference_ids: (n_queries, k)
+    :param candidate_ids: (n_queries, k)
+    :return:
+    """
+    found = sum(
+        len(np.intersect1d(reference_row, candidate_row, assume_unique=True))
+        for reference_row, candidate_row in zip(reference_ids, candidate_ids)
+    )
+    return found / reference_ids.size
+
+def benchmark_configuration(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    reference_ids: np.ndarray,
+    dimensions: int,
+    precision: str,
+)->Dict[str, Any]:
+    """
+    Function to measure the recall and the memory of the vectors truncated and stored at a precision
+    :param corpus: (n, dim), normalized float32
+    :param queries: (n_queries, dim), normalized float32
+    :param reference_ids: neighbors of the queries with the full float32 vectors
+    :param dimensions:
+    :param precision: VECTOR_PRECISION_*
+    :return:
+    """
+    stored_corpus = round_trip_vectors(truncate_vectors(corpus, dimensions), precision)
+    stored_queries = round_trip_vectors(truncate_vectors(queries, dimensions), precision)
+    memory_bytes = get_vector_memory_bytes(len(corpus), dimensions, precision)
+    return {
+        "dimensions": dimensions,
+        "precision": precision,
+        "recall_at_k": get_recall_at_k(reference_ids, search_top_k(stored_corpus, stored_queries, reference_ids.shape[1])),
+        "memory_bytes": memory_bytes,
+        "memory_ratio": memory_bytes / get_vector_memory_bytes(len(corpus), corpus.shape[1], VECTOR_PRECISION_FLOAT32),
+    }
+
+def run_benchmark(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    dimensions_list: Sequence[int],
+    precisions: Sequence[str],
+    k: int = 10,
+)->Dict[str, Any]:
+    """
+    Function to benchmark every combination of kept dimensions and precision
+    :param corpus: (n, dim)
+    :param queries: (n_queries, dim)
+    :param dimensions_list: kept dimensions, at most dim
+    :param precisions: VECTOR_PRECISION_*
+    :param k:
+    :return: machine-readable results
+    """
+    corpus = truncate_vectors(corpus, corpus.shape[1])
+    queries = truncate_vectors(queries, queries.shape[1])
+    reference_ids = search_top_k(corpus, queries, k)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "n_vectors": len(corpus),
+        "n_queries": len(queries),
+        "full_dimensions": corpus.shape[1],
+        "k": k,
+        "configurations": [
+            benchmark_configuration(corpus, queries, reference_ids, dimensions, precision)
+            for dimensions in dimensions_list
+            for precision in precisions
+        ],
+    }
+
+def format_results(results: Dict[str, Any])->str:
+    """
+    Function to format the results as a table
+    :param results:
+    :return:
+    """
+    lines = [
+        f"{results['n_vectors']} vectors of {results['full_dimensions']} dimensions, "
+        f"{results['n_queries']} queries, recall@{results['k']}",
+        f"{'dims':>6} {'precision':<10} {'recall':>7} {'MiB':>9} {'memory':>7}",
+    ]
+    for configuration in results["configurations"]:
+        lines.append(
+            f"{configuration['dimensions']:>6} {configuration['precision']:<10} "
+            f"{configuration['recall_at_k']:>7.3f} {configuration['memory_bytes'] / 2 ** 20:>9.1f} "
+            f"{configuration['memory_ratio']:>6.0%}"
+        )
+    return "\n".join(lines)
+
+def main(arguments: Optional[Sequence[str]] = None):
+    """
+    Function to run the benchmark from the command line
+    :param arguments:
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the recall and memory of the embedding storage options.")
+    parser.add_argument("--embeddings-file", help=".npy (n, dim) matrix of real embeddings, e.g. of the chunks")
+    parser.add_argument("--n-vectors", type=int, default=20000, help="synthetic vectors")
+    parser.add_argument("--full-dimensions", type=int, default=1024, help="synthetic vector dimensions")
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1024, 768, 512, 256])
+    parser.add_argument("--precisions", nargs="+", choices=sorted(VECTOR_PRECISION_BYTES), default=list(VECTOR_PRECISION_BYTES))
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--output", help="JSON file the results are saved to")
+    parsed_arguments = parser.parse_args(arguments)
+
+    if parsed_arguments.embeddings_file:
+        corpus = np.load(parsed_arguments.embeddings_file).astype(np.float32)
+    else:
+        corpus = generate_matryoshka_embeddings(parsed_arguments.n_vectors, parsed_arguments.full_dimensions)
+    queries = generate_queries(corpus, parsed_arguments.n_queries)
+    dimensions_list = [dimensions for dimensions in parsed_arguments.dimensions if dimensions <= corpus.shape[1]]
+    results = run_benchmark(corpus, queries, dimensions_list, parsed_arguments.precisions, parsed_arguments.k)
+
+    print(format_results(results))
+    if parsed_arguments.output:
+        with open(parsed_arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,17 @@ ERR_NO_DOCUMENT_NAME = "No \"document_name\" provided."
 ERR_NO_DOCUMENT_DESC = "No \"document_description\" provided."
 ERR_NO_DOCUMENT_TYPE = "No \"document_type\" provided."
 ERR_INVALID_JSON = "Invalid JSON format."
+ERR_JOB_NOT_FOUND = "Ingestion job not found."
+ERR_DOCUMENT_TOO_LARGE = "The document exceeds the maximum upload size."
+ERR_INVALID_CURSOR = "Invalid \"cursor\" provided."
+ERR_NO_BULK_DOCUMENTS = "Provide either \"documents\" or an \"archive\"."
+ERR_INVALID_MANIFEST = "Invalid \"manifest\" provided."
+ERR_UNSUPPORTED_ARCHIVE = "Unsupported or corrupted archive, use a zip or tar archive."
+ERR_TOO_MANY_BULK_DOCUMENTS = "Too many documents in a bulk upload."
+ERR_EMBEDDING_MODEL_NOT_LOADED = "Embedding model not loaded."
+ERR_EMBEDDING_CACHE_DISABLED = "The embedding cache is disabled."
+ERR_EMBEDDING_QUEUE_FULL = "Too many embedding requests, retry later."
+ERR_TOO_MANY_EMBEDDING_TEXTS = "Too many texts to embed in one request."
+ERR_NO_EMBEDDING_TEXTS = "No \"texts\" provided."
+DOCUMENT_MEDIA_TYPE_PDF = "application/pdf"
+BULK_UPLOAD_PATH = "/upload/bulk"
@@ -1,5 +1,9 @@
+from constants.core.archives import *
+from constants.core.blob_stores import *
+from constants.core.disk_cache import *
 from constants.core.huggingface_adapter import *
 from constants.core.llm_adapters import *
 from constants.core.ollama_adapter import *
 from constants.core.openai_adapter import *
 from constants.core.security import *
+from constants.core.vector_storage import *
@@ -0,0 +1,3 @@
+ARCHIVE_ZIP_EXTENSIONS = (".zip",)
+ARCHIVE_TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+ARCHIVE_IGNORED_PREFIXES = ("__MACOSX", ".DS_Store", "._")
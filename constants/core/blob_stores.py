@@ -0,0 +1,5 @@
+BLOB_STORE_LOCAL = "local"
+BLOB_STORE_S3 = "s3"
+BLOB_STORE_STREAM_CHUNK_SIZE = 1024 * 1024
+BLOB_STORE_SHARD_LENGTH = 2
+BLOB_STORE_TEMP_SUFFIX = ".tmp"
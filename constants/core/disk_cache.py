@@ -0,0 +1,2 @@
+DISK_CACHE_EVICTION_BATCH_SIZE = 64
+DISK_CACHE_FILE_NAME = "cache.sqlite3"
@@ -0,0 +1,9 @@
+VECTOR_PRECISION_FLOAT32 = "float32"
+VECTOR_PRECISION_FLOAT16 = "float16"
+VECTOR_PRECISION_BFLOAT16 = "bfloat16"
+# Bytes per element of a vector of every precision
+VECTOR_PRECISION_BYTES = {
+    VECTOR_PRECISION_FLOAT32: 4,
+    VECTOR_PRECISION_FLOAT16: 2,
+    VECTOR_PRECISION_BFLOAT16: 2,
+}
@@ -16,9 +16,12 @@ UU_DARURAT = "Undang-Undang Darurat"
 HTTP_STATUS_ERROR_BAD_REQUEST = 400
 HTTP_STATUS_ERROR_FORBIDDEN = 403
 HTTP_STATUS_ERROR_NOT_FOUND = 404
+HTTP_STATUS_ERROR_PAYLOAD_TOO_LARGE = 413
 HTTP_STATUS_ERROR_UNAUTHORIZED = 401
 HTTP_STATUS_INTERNAL_SERVER_ERROR = 500
+HTTP_STATUS_ERROR_SERVICE_UNAVAILABLE = 503
 HTTP_STATUS_SUCCESS = 200
+HTTP_STATUS_ACCEPTED = 202
 
 HTTP_STATUS_DETAIL_BAD_REQUEST = "Bad Request"
 HTTP_STATUS_DETAIL_BAD_CREDENTIALS = "Could not validate credentials"
@@ -28,6 +31,7 @@ HTTP_STATUS_DETAIL_INCORRECT_USERNAME_PASSWORD = "Incorrect Username or Password
 HTTP_STATUS_DETAIL_INTERNAL_SERVER_ERROR = "Internal Server Error"
 HTTP_STATUS_DETAIL_NO_ROLES_FOUND = "No role(s) found for this user. Please assign role(s) to this user first."
 HTTP_STATUS_DETAIL_NOT_FOUND = "Data Not Found"
+HTTP_STATUS_DETAIL_PAYLOAD_TOO_LARGE = "Request body is too large"
 HTTP_STATUS_DETAIL_NOT_ENOUGH_PRIVILEGES = "The current user does not have enough privileges."
 HTTP_STATUS_DETAIL_PERMISSION_NOT_FOUND = "The permission not found."
 HTTP_STATUS_DETAIL_ROLE_NAME_LENGTH_TOO_SHORT = "Role name is too short."
@@ -38,6 +42,11 @@ HTTP_STATUS_DETAIL_USER_NOT_FOUND = "User not found."
 
 # API Response Headers
 HEADERS_WWW_AUTHENTICATE = "WWW-Authenticate"
+HEADERS_CONTENT_DISPOSITION = "Content-Disposition"
+
+# File Reading
+FILE_READ_CHUNK_SIZE = 1024 * 1024
+FILE_SPOOL_MAX_MEMORY_SIZE = 1024 * 1024
 
 # OS Platform
 OS_WINDOWS = "Windows"
@@ -0,0 +1,62 @@
+CHUNKING_STRATEGY_RECURSIVE = "recursive"
+CHUNKING_STRATEGY_LEGAL_STRUCTURE = "legal_structure"
+
+# Streaming chunking
+STREAM_MAX_SENTENCE_BUFFER_SIZE = 1024 * 1024
+STREAM_RECURSIVE_WINDOW_CHUNKS = 16
+PARAGRAPH_SEPARATOR = "\n\n"
+LINE_SEPARATOR = "\n"
+
+# Legal structure chunking of Indonesian statutes, matched on stripped lines
+LEGAL_BAB_PATTERN = r"^BAB\s+[IVXLCDM]+\b"
+LEGAL_BAGIAN_PATTERN = r"^Bagian\s+Ke[a-z]+\b"
+LEGAL_PARAGRAF_PATTERN = r"^Paragraf\s+\d+\b"
+LEGAL_PASAL_PATTERN = r"^Pasal\s+\d+[A-Z]?$"
+LEGAL_AYAT_PATTERN = r"^\((\d+[a-z]?)\)"
+LEGAL_HURUF_PATTERN = r"^([a-z])\.\s"
+LEGAL_PENJELASAN_PATTERN = r"^PENJELASAN\b"
+LEGAL_TITLE_MAX_LENGTH = 200
+LEGAL_AYAT_LABEL = "ayat ({first})"
+LEGAL_AYAT_RANGE_LABEL = "ayat ({first})-({last})"
+LEGAL_HURUF_LABEL = "huruf {first}"
+LEGAL_HURUF_RANGE_LABEL = "huruf {first}-{last}"
+
+# Chunk records
+CHUNK_OFFSET_TYPECODE = "q"
+NO_PAGE_NUMBER = 0
+PAGE_SEPARATOR = "\n"
+
+# Sentence tokenizer
+SENTENCE_TOKENIZER_FALLBACK_LANGUAGE = "english"
+SENTENCE_TOKENIZER_NLTK_RESOURCE = "tokenizers/punkt_tab/{language}/"
+SENTENCE_TOKENIZER_BATCH_CHUNK_SIZE = 16
+# Punkt abbreviation types are lowercased and without the final period
+INDONESIAN_ABBREVIATIONS = (
+    "no", "nomor", "thn", "th", "tgl", "bln", "hlm", "hal", "psl", "ps", "ay", "jo", "lamp", "ket",
+    "dll", "dsb", "dst", "dkk", "tsb", "yth", "sdr", "bpk", "a.n", "u.p", "u.b", "ttd",
+    "kab", "kec", "kel", "prov", "jl", "rt", "rw", "pt", "cv", "tbk",
+    "dr", "drs", "dra", "ir", "prof", "h", "hj", "s.h", "m.h", "s.e", "m.m", "s.t", "s.kom", "nip", "nik",
+    "uu", "pp", "perpu", "perpres", "kepres", "permen", "kepmen", "permenaker", "kepmenaker", "stb", "ln", "tln",
+    "spt", "sbg", "krn", "dgn", "utk", "yg", "tdk", "thd",
+)
+
+# Token-budget chunking
+CHUNKING_STRATEGY_TOKEN = "token"
+TOKEN_DEFAULT_ENCODING = "cl100k_base"
+TOKEN_ENCODINGS_CACHE_SIZE = 8
+# Characters per token assumed to size the streaming buffer before it is encoded
+STREAM_TOKEN_CHARS_PER_TOKEN = 4
+STREAM_TOKEN_WINDOW_CHUNKS = 16
+
+# Semantic chunking
+SEMANTIC_THRESHOLD_PERCENTILE = "percentile"
+SEMANTIC_THRESHOLD_STANDARD_DEVIATION = "standard_deviation"
+SEMANTIC_THRESHOLD_INTERQUARTILE = "interquartile"
+SEMANTIC_THRESHOLD_GRADIENT = "gradient"
+SEMANTIC_THRESHOLD_DEFAULT_AMOUNTS = {
+    SEMANTIC_THRESHOLD_PERCENTILE: 95.,
+    SEMANTIC_THRESHOLD_STANDARD_DEVIATION: 3.,
+    SEMANTIC_THRESHOLD_INTERQUARTILE: 1.5,
+    SEMANTIC_THRESHOLD_GRADIENT: 95.,
+}
+SEMANTIC_SENTENCE_SEPARATOR = " "
@@ -1 +1,26 @@
-BERT_LARGE_EMBEDDING_DIM = 1024
+# Documents Listing
+DOCUMENTS_PAGE_MAX_LIMIT = 1000
+
+# Ingestion Jobs
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_PROCESSING = "processing"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUS_DEDUPLICATED = "deduplicated"
+ERR_ENQUEUE_INGESTION_JOB = "Failed to enqueue the ingestion job."
+ERR_CONTENT_INGESTION_FAILED = "The ingestion of the content of this document failed."
+
+# Document Contents
+CONTENT_STATUS_PENDING = "pending"
+CONTENT_STATUS_PROCESSING = "processing"
+CONTENT_STATUS_COMPLETED = "completed"
+CONTENT_STATUS_FAILED = "failed"
+ERR_CONTENT_NOT_FOUND = "The content of this document is not found."
+
+# Bulk Upload
+ERR_NO_MANIFEST_ENTRY = "No manifest entry for this file."
+ERR_BULK_DOCUMENT_TOO_LARGE = "The document exceeds the maximum upload size."
+ERR_BULK_DOCUMENT_UNREADABLE = "The document can not be read from the upload."
+ERR_BULK_ARCHIVE_UNREADABLE = "The archive is corrupted from this point, the following files are not uploaded."
+ERR_BULK_UPLOAD_FAILED = "Failed to upload the document."
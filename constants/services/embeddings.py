@@ -0,0 +1,22 @@
+# OpenAI embeddings API limits, per request
+OPENAI_EMBEDDING_MAX_BATCH_ITEMS = 2048
+OPENAI_EMBEDDING_MAX_BATCH_TOKENS = 300000
+OPENAI_EMBEDDING_MAX_INPUT_TOKENS = 8191
+
+# OpenAI embedding models: the text-embedding-3 models shorten their vectors to the dimensions
+# requested, the older models reject the dimensions parameter
+OPENAI_EMBEDDING_SHORTENABLE_MODEL_PREFIX = "text-embedding-3-"
+OPENAI_EMBEDDING_FIXED_DIMENSIONS = {"text-embedding-ada-002": 1536}
+
+# Retries of the OpenAI embeddings requests
+OPENAI_EMBEDDING_RETRY_STATUS_CODES = (408, 409, 429)
+OPENAI_EMBEDDING_BACKOFF_BASE_SECONDS = 0.5
+OPENAI_EMBEDDING_BACKOFF_MAX_SECONDS = 30.
+
+# Embedding cache
+EMBEDDING_CACHE_KEY_FORMAT = "{model}|{dimensions}|{text_hash}"
+EMBEDDING_CACHE_DTYPE = "float32"
+
+# Quantized embedding models
+QUANTIZED_MODEL_KEY_SUFFIX = ":int8"
+QUANTIZATION_PARITY_MIN_COSINE = 0.99
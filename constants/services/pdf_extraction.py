@@ -0,0 +1,21 @@
+EXTRACTION_METHOD_OCR = "ocr"
+EXTRACTION_METHOD_TEXT_LAYER = "text_layer"
+EXTRACTION_METHOD_OCR_CACHE = "ocr_cache"
+
+# OCR cache, every setting that changes the OCR output is part of the key
+OCR_CACHE_KEY_FORMAT = "{document_hash}:{page_number}:{dpi}:{grayscale}:{language}:{tesseract_config}"
+
+# OCR process pool, the API and the ingestion workers are threaded, a forked worker could inherit a held lock
+OCR_POOL_MP_CONTEXT = "spawn"
+
+# Streaming rasterization
+RASTER_IMAGE_FORMAT = "png"
+STREAMING_PDF_FILE_NAME = "document.pdf"
+STREAMING_WINDOW_PAGES_PER_WORKER = 2
+
+# Text layer quality thresholds, a page failing one of them falls back to OCR
+TEXT_LAYER_MIN_CHARS = 20
+TEXT_LAYER_MIN_ALPHANUMERIC_RATIO = 0.5
+TEXT_LAYER_MIN_PRINTABLE_RATIO = 0.9
+TEXT_LAYER_MAX_CID_RATIO = 0.01
+TEXT_LAYER_CID_PATTERN = r"\(cid:\d+\)"
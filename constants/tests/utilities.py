@@ -27,3 +27,9 @@ ASSERTED_MONTH_1 = 3
 ASSERTED_MONTH_2 = 1
 ASSERTED_YEAR_1 = 2025
 ASSERTED_YEAR_2 = 2023
+
+TEST_CURSOR_ID = 42
+
+TEST_FILE_CONTENT = b"AskEmploymentLaw" * 1024
+TEST_FILE_CHUNK_SIZE = 1000
+TEST_INVALID_CURSOR = "not-a-cursor"
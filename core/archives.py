@@ -0,0 +1,67 @@
+import os
+import tarfile
+from typing import BinaryIO, Iterator, Tuple
+import zipfile
+
+from constants.core import (
+    ARCHIVE_IGNORED_PREFIXES,
+    ARCHIVE_TAR_EXTENSIONS,
+    ARCHIVE_ZIP_EXTENSIONS,
+)
+
+def is_archive_file_name(file_name: str)->bool:
+    """
+    Function to check whether a file name is a supported zip or tar archive
+    :param file_name:
+    :return:
+    """
+    lowered_file_name = file_name.lower()
+    return lowered_file_name.endswith(ARCHIVE_ZIP_EXTENSIONS + ARCHIVE_TAR_EXTENSIONS)
+
+def is_ignored_member(member_name: str)->bool:
+    """
+    Function to check whether an archive member is OS metadata, e.g. __MACOSX/ or .DS_Store
+    :param member_name:
+    :return:
+    """
+    return any(
+        part.startswith(ARCHIVE_IGNORED_PREFIXES) for part in member_name.replace("\\", "/").split("/")
+    )
+
+def iter_archive_files(archive: BinaryIO, archive_name: str)->Iterator[Tuple[str, BinaryIO]]:
+    """
+    Function to iterate the regular files of a zip or tar archive as streams, nothing is
+    extracted to disk. Each stream must be consumed before the next file is requested.
+    :param archive: seekable file object of the archive
+    :param archive_name: file name of the archive, its extension selects the format
+    :return: iterator of (member name, file object of the member)
+    :raises ValueError: if the archive format is not supported or the archive is corrupted
+    """
+    lowered_archive_name = archive_name.lower()
+    if lowered_archive_name.endswith(ARCHIVE_ZIP_EXTENSIONS):
+        try:
+            zip_archive = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid zip archive: {e}") from e
+        with zip_archive:
+            for member in zip_archive.infolist():
+                if member.is_dir() or is_ignored_member(member.filename):
+                    continue
+                with zip_archive.open(member) as member_file:
+                    yield member.filename, member_file
+    elif lowered_archive_name.endswith(ARCHIVE_TAR_EXTENSIONS):
+        try:
+            tar_archive = tarfile.open(fileobj=archive, mode="r:*")
+        except tarfile.TarError as e:
+            raise ValueError(f"Invalid tar archive: {e}") from e
+        with tar_archive:
+            for member in tar_archive:
+                if not member.isfile() or is_ignored_member(member.name):
+                    continue
+                member_file = tar_archive.extractfile(member)
+                if member_file is None:
+                    continue
+                with member_file:
+                    yield member.name, member_file
+    else:
+        raise ValueError(f"Unsupported archive format: {os.path.basename(archive_name)}")
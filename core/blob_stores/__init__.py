@@ -0,0 +1 @@
+from core.blob_stores.blob_stores import *
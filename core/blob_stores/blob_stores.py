@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from typing import BinaryIO, Generator, Iterator, Literal
+from uuid import uuid4
+
+from constants.core import (
+    BLOB_STORE_LOCAL,
+    BLOB_STORE_S3,
+    BLOB_STORE_STREAM_CHUNK_SIZE,
+)
+from core.blob_stores.local_blob_store import LocalBlobStore
+from core.blob_stores.s3_blob_store import S3BlobStore
+from core.configs import settings
+from core.logger import logger
+
+class BlobStores:
+    """
+    A content-addressed store of the uploaded documents, blobs are keyed by their document_hash
+    """
+    def __init__(
+        self,
+        backend: Literal["local", "s3"] = BLOB_STORE_LOCAL,
+        **kwargs
+    ):
+        """
+        Init function
+
+        :param backend:
+        :param kwargs: local_dir for the local backend; bucket, endpoint_url, access_key,
+            secret_key, region and prefix for the S3 backend
+        """
+        self.backend = backend
+        if backend == BLOB_STORE_LOCAL:
+            self.store = LocalBlobStore(root_dir=kwargs["local_dir"])
+        elif backend == BLOB_STORE_S3:
+            if not kwargs.get("bucket"):
+                req_id = str(uuid4()).replace("-", "")
+                logger.error(f"BlobStores: init: {req_id} No bucket for the S3 blob store.")
+                raise ValueError(f"Error while connecting to the blob store. Request ID: {req_id}")
+            self.store = S3BlobStore(
+                bucket=kwargs["bucket"],
+                endpoint_url=kwargs.get("endpoint_url"),
+                access_key=kwargs.get("access_key"),
+                secret_key=kwargs.get("secret_key"),
+                region=kwargs.get("region"),
+                prefix=kwargs.get("prefix") or "",
+            )
+        else:
+            raise ValueError(f"Unknown blob store backend: {backend}")
+
+    def exists(self, key: str)->bool:
+        """
+        Check whether a blob exists
+        :param key:
+        :return:
+        """
+        return self.store.exists(key)
+
+    def put(self, key: str, file: BinaryIO)->str:
+        """
+        Stream a file into the store, an existing blob with the same key is kept
+        :param key:
+        :param file:
+        :return: the key of the blob
+        """
+        return self.store.put(key, file)
+
+    def open(self, key: str)->BinaryIO:
+        """
+        Open a blob for reading
+        :param key:
+        :return:
+        """
+        return self.store.open(key)
+
+    def iter_chunks(self, key: str, chunk_size: int = BLOB_STORE_STREAM_CHUNK_SIZE)->Iterator[bytes]:
+        """
+        Stream a blob in chunks
+        :param key:
+        :param chunk_size:
+        :return:
+        """
+        return self.store.iter_chunks(key, chunk_size)
+
+    @contextmanager
+    def local_path(self, key: str)->Generator[str, None, None]:
+        """
+        Get a local filesystem path of a blob
+        :param key:
+        :return:
+        """
+        with self.store.local_path(key) as path:
+            yield path
+
+    def delete(self, key: str):
+        """
+        Delete a blob
+        :param key:
+        :return:
+        """
+        self.store.delete(key)
+
+blob_store = BlobStores(
+    backend=settings.BLOB_STORE_BACKEND,
+    local_dir=settings.BLOB_STORE_LOCAL_DIR,
+    bucket=settings.BLOB_STORE_S3_BUCKET,
+    endpoint_url=settings.BLOB_STORE_S3_ENDPOINT_URL,
+    access_key=settings.BLOB_STORE_S3_ACCESS_KEY,
+    secret_key=settings.BLOB_STORE_S3_SECRET_KEY,
+    region=settings.BLOB_STORE_S3_REGION,
+    prefix=settings.BLOB_STORE_S3_PREFIX,
+)
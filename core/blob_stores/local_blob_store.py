@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Generator, Iterator
+
+from constants.core import (
+    BLOB_STORE_SHARD_LENGTH,
+    BLOB_STORE_STREAM_CHUNK_SIZE,
+    BLOB_STORE_TEMP_SUFFIX,
+)
+
+class LocalBlobStore:
+    """
+    Blob store on the local filesystem, blobs are sharded by the first characters of their key
+    """
+    def __init__(self, root_dir: str):
+        """
+        Initialization function
+        :param root_dir:
+        """
+        self.root_dir = os.path.abspath(root_dir)
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def get_path(self, key: str)->str:
+        """
+        Get the path of a blob
+        :param key:
+        :return:
+        """
+        return os.path.join(
+            self.root_dir,
+            key[:BLOB_STORE_SHARD_LENGTH],
+            key[BLOB_STORE_SHARD_LENGTH:2 * BLOB_STORE_SHARD_LENGTH],
+            key,
+        )
+
+    def exists(self, key: str)->bool:
+        """
+        Check whether a blob exists
+        :param key:
+        :return:
+        """
+        return os.path.isfile(self.get_path(key))
+
+    def put(self, key: str, file: BinaryIO)->str:
+        """
+        Stream a file into the store. The blob is written to a temporary file and renamed,
+        so a concurrent reader never sees a partial blob.
+        :param key:
+        :param file:
+        :return: the key of the blob
+        """
+        blob_path = self.get_path(key)
+        if os.path.isfile(blob_path):
+            return key
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(blob_path),
+            suffix=BLOB_STORE_TEMP_SUFFIX,
+            delete=False,
+        ) as temp_file:
+            shutil.copyfileobj(file, temp_file, BLOB_STORE_STREAM_CHUNK_SIZE)
+        os.replace(temp_file.name, blob_path)
+        return key
+
+    def open(self, key: str)->BinaryIO:
+        """
+        Open a blob for reading
+        :param key:
+        :return:
+        """
+        return open(self.get_path(key), "rb")
+
+    def iter_chunks(self, key: str, chunk_size: int = BLOB_STORE_STREAM_CHUNK_SIZE)->Iterator[bytes]:
+        """
+        Stream a blob in chunks
+        :param key:
+        :param chunk_size:
+        :return:
+        """
+        with self.open(key) as blob_file:
+            for chunk in iter(lambda: blob_file.read(chunk_size), b""):
+                yield chunk
+
+    @contextmanager
+    def local_path(self, key: str)->Generator[str, None, None]:
+        """
+        Get a local filesystem path of a blob, for tools that read files by path
+        :param key:
+        :return:
+        """
+        if not self.exists(key):
+            raise FileNotFoundError(key)
+        yield self.get_path(key)
+
+    def delete(self, key: str):
+        """
+        Delete a blob
+        :param key:
+        :return:
+        """
+        if self.exists(key):
+            os.remove(self.get_path(key))
@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+import os
+import tempfile
+from typing import BinaryIO, Generator, Iterator, Optional
+
+from constants.core import BLOB_STORE_STREAM_CHUNK_SIZE
+
+class S3BlobStore:
+    """
+    Blob store on an S3-compatible object storage, e.g. AWS S3 or a local MinIO
+    """
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        prefix: str = "",
+    ):
+        """
+        Initialization function
+        :param bucket:
+        :param endpoint_url: URL of an S3-compatible server, leave empty for AWS S3
+        :param access_key:
+        :param secret_key:
+        :param region:
+        :param prefix: prefix of the object keys
+        """
+        # boto3 is only needed when the S3 blob store is used
+        import boto3
+        from botocore.exceptions import ClientError
+
+        self.client_error = ClientError
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region,
+        )
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def get_object_key(self, key: str)->str:
+        """
+        Get the object key of a blob
+        :param key:
+        :return:
+        """
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str)->bool:
+        """
+        Check whether a blob exists
+        :param key:
+        :return:
+        """
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.get_object_key(key))
+            return True
+        except self.client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, key: str, file: BinaryIO)->str:
+        """
+        Stream a file into the store with a multipart upload
+        :param key:
+        :param file:
+        :return: the key of the blob
+        """
+        if not self.exists(key):
+            self.client.upload_fileobj(file, self.bucket, self.get_object_key(key))
+        return key
+
+    def open(self, key: str)->BinaryIO:
+        """
+        Open a blob for reading, the body is streamed from the object storage
+        :param key:
+        :return:
+        """
+        return self.client.get_object(Bucket=self.bucket, Key=self.get_object_key(key))["Body"]
+
+    def iter_chunks(self, key: str, chunk_size: int = BLOB_STORE_STREAM_CHUNK_SIZE)->Iterator[bytes]:
+        """
+        Stream a blob in chunks
+        :param key:
+        :param chunk_size:
+        :return:
+        """
+        body = self.open(key)
+        try:
+            for chunk in body.iter_chunks(chunk_size=chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    @contextmanager
+    def local_path(self, key: str)->Generator[str, None, None]:
+        """
+        Download a blob to a temporary file, for tools that read files by path
+        :param key:
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, key)
+            self.client.download_file(self.bucket, self.get_object_key(key), temp_path)
+            yield temp_path
+
+    def delete(self, key: str):
+        """
+        Delete a blob
+        :param key:
+        :return:
+        """
+        self.client.delete_object(Bucket=self.bucket, Key=self.get_object_key(key))
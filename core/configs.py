@@ -32,6 +32,23 @@ class Settings(BaseSettings):
 
     SECRET_KEY: str = None
 
+    # Upload config
+    MAX_UPLOAD_SIZE_BYTES: int = 100 * 1024 * 1024
+    MAX_REQUEST_BODY_SIZE_BYTES: int = 101 * 1024 * 1024
+    MAX_BULK_REQUEST_BODY_SIZE_BYTES: int = 4 * 1024 * 1024 * 1024
+    BULK_UPLOAD_MAX_FILES: int = 10000
+    BULK_UPLOAD_MAX_PARALLELISM: int = 8
+
+    # Blob Store config
+    BLOB_STORE_BACKEND: Literal['local', 's3'] = 'local'
+    BLOB_STORE_LOCAL_DIR: str = "blob_store"
+    BLOB_STORE_S3_BUCKET: Optional[str] = None
+    BLOB_STORE_S3_ENDPOINT_URL: Optional[str] = None
+    BLOB_STORE_S3_ACCESS_KEY: Optional[str] = None
+    BLOB_STORE_S3_SECRET_KEY: Optional[str] = None
+    BLOB_STORE_S3_REGION: Optional[str] = None
+    BLOB_STORE_S3_PREFIX: Optional[str] = "documents/"
+
     # Database config
     DATABASE_HOST: str
     DATABASE_PORT: str
@@ -67,6 +84,54 @@ class Settings(BaseSettings):
     FIRST_SUPERADMIN_NAME: str
     FIRST_SUPERADMIN_PASSWORD: str
 
+    # OCR config
+    OCR_PARALLEL: bool = True
+    OCR_MAX_WORKERS: Optional[int] = None
+    OCR_STREAMING: bool = True
+    OCR_STREAMING_WINDOW_SIZE: Optional[int] = None
+    OCR_DPI: int = 200
+    OCR_GRAYSCALE: bool = True
+    OCR_LANGUAGE: Optional[str] = None
+    OCR_TESSERACT_CONFIG: str = ""
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_DIR: str = "ocr_cache"
+    OCR_CACHE_MAX_SIZE_BYTES: int = 2 * 1024 * 1024 * 1024
+    PDF_TEXT_LAYER_FIRST: bool = True
+
+    # Chunking config
+    CHUNKING_STRATEGY: Literal['recursive', 'legal_structure', 'token'] = 'recursive'
+    LEGAL_CHUNK_MAX_SIZE: int = 2000
+    CHUNK_MAX_TOKENS: int = 512
+    CHUNK_OVERLAP_TOKENS: int = 64
+    CHUNK_TOKENIZER_MODEL: str = "text-embedding-3-large"
+    SENTENCE_TOKENIZER_MODEL_DIR: str = "sentence_tokenizer_model"
+
+    # Embedding config
+    EMBEDDING_MODEL: str = "text-embedding-3-large"
+    EMBEDDING_DIMENSIONS: int = 1024
+    EMBEDDING_VECTOR_PRECISION: Literal['float32', 'float16', 'bfloat16'] = 'float32'
+    EMBEDDING_MATRYOSHKA: bool = False
+    EMBEDDING_DEVICE: Optional[str] = None
+    EMBEDDING_TORCH_NUM_THREADS: Optional[int] = None
+    EMBEDDING_WARMUP_MODELS: List[str] = []
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_MAX_LENGTH: Optional[int] = None
+    EMBEDDING_POOLING: Literal['mean', 'cls'] = 'mean'
+    EMBEDDING_NORMALIZE: bool = True
+    EMBEDDING_QUANTIZED: bool = False
+    EMBEDDING_EXECUTOR_WORKERS: int = 1
+    EMBEDDING_EXECUTOR_MAX_QUEUE_SIZE: int = 64
+    EMBEDDING_REQUEST_MAX_TEXTS: int = 256
+    OPENAI_EMBEDDING_BATCH_SIZE: int = 512
+    OPENAI_EMBEDDING_BATCH_TOKENS: int = 100000
+    OPENAI_EMBEDDING_CONCURRENCY: int = 4
+    OPENAI_EMBEDDING_MAX_RETRIES: int = 5
+    OPENAI_EMBEDDING_TIMEOUT: float = 60.
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = "embedding_cache"
+    EMBEDDING_CACHE_MAX_SIZE_BYTES: int = 4 * 1024 * 1024 * 1024
+    EMBEDDING_CACHE_MEMORY_MAX_SIZE_BYTES: int = 256 * 1024 * 1024
+
     # Logging Directory
     LOG_DIR: str
 
@@ -78,6 +143,8 @@ class Settings(BaseSettings):
     RABBITMQ_PASSWORD: str
     RABBITMQ_CONNECTION_MAX_TRIES: int
     RABBITMQ_WAIT_SECONDS: int
+    RABBITMQ_INGESTION_QUEUE: str = "document_ingestion"
+    INGESTION_CLAIM_TIMEOUT_SECONDS: int = 3600
 
     # Unit Test
     TEST_LLM_SERVICE: bool = False
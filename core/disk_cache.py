@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional, Union
+
+from constants.core import DISK_CACHE_EVICTION_BATCH_SIZE, DISK_CACHE_FILE_NAME
+from core.logger import logger
+
+# Recency of an entry, computed by SQLite so it increases across the processes sharing the file
+NEXT_ACCESS_SQL = "(SELECT COALESCE(MAX(last_access), 0) + 1 FROM cache_entries)"
+
+class DiskLRUCache:
+    """
+    Persistent key-value cache on a SQLite file, bounded by the total size of its values.
+    The least recently used entries are evicted first. It is safe to share between threads,
+    and between processes on the same host thanks to the SQLite file locking. A write that
+    times out on the lock of another process is skipped, the cache is only an optimization.
+    """
+    def __init__(self, path: str, max_size_bytes: int, lock_timeout_seconds: float = 5.):
+        """
+        Initialization function
+        :param path: directory of the cache, the SQLite file is created in it
+        :param max_size_bytes: total size of the values kept in the cache
+        :param lock_timeout_seconds: wait for the lock of another process before a write is skipped
+        """
+        self.path = os.path.join(os.path.abspath(path), DISK_CACHE_FILE_NAME)
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=lock_timeout_seconds,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_last_access ON cache_entries (last_access)"
+        )
+
+    def get(self, key: str)->Optional[bytes]:
+        """
+        Get a value and mark it as recently used
+        :param key:
+        :return: the value, None on a miss
+        """
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT value FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"DiskLRUCache.get: Error reading {self.path}, counted as a miss: {e}")
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            try:
+                self._connection.execute(
+                    f"UPDATE cache_entries SET last_access = {NEXT_ACCESS_SQL} WHERE key = ?", (key,)
+                )
+            except sqlite3.OperationalError as e:
+                logger.warning(f"DiskLRUCache.get: Error marking an entry of {self.path} as used: {e}")
+            return row[0]
+
+    def set(self, key: str, value: Union[bytes, str]):
+        """
+        Set a value, evicting the least recently used entries when the cache is full.
+        A value larger than the whole cache is not stored.
+        :param key:
+        :param value:
+        :return:
+        """
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        if len(value) > self.max_size_bytes:
+            return
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, size, last_access) "
+                    f"VALUES (?, ?, ?, {NEXT_ACCESS_SQL})",
+                    (key, value, len(value)),
+                )
+                self._evict()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"DiskLRUCache.set: Error writing to {self.path}, the value is not cached: {e}")
+
+    def _evict(self):
+        """
+        Evict the least recently used entries until the cache fits max_size_bytes
+        :return:
+        """
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        while total_size > self.max_size_bytes:
+            oldest_entries = self._connection.execute(
+                "SELECT key, size FROM cache_entries ORDER BY last_access LIMIT ?",
+                (DISK_CACHE_EVICTION_BATCH_SIZE,),
+            ).fetchall()
+            if not oldest_entries:
+                break
+            evicted_keys = []
+            for key, size in oldest_entries:
+                evicted_keys.append((key,))
+                total_size -= size
+                if total_size <= self.max_size_bytes:
+                    break
+            self._connection.executemany("DELETE FROM cache_entries WHERE key = ?", evicted_keys)
+
+    def delete(self, key: str):
+        """
+        Delete a value
+        :param key:
+        :return:
+        """
+        with self._lock:
+            try:
+                self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            except sqlite3.OperationalError as e:
+                logger.warning(f"DiskLRUCache.delete: Error deleting from {self.path}: {e}")
+
+    def clear(self):
+        """
+        Delete all values and reset the statistics
+        :return:
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries")
+            self.hits = 0
+            self.misses = 0
+
+    def get_hit_rate(self)->float:
+        """
+        Get the ratio of hits to lookups since the cache was opened
+        :return:
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self)->Dict[str, Union[int, float]]:
+        """
+        Get the hits, misses, hit rate, number of entries and total size of the cache
+        :return:
+        """
+        with self._lock:
+            entries, size_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.get_hit_rate(),
+            "entries": entries,
+            "size_bytes": size_bytes,
+        }
@@ -0,0 +1,71 @@
+from typing import Dict, Optional
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from constants import general as general_constants
+
+class MaxBodySizeMiddleware:
+    """
+    ASGI middleware to reject request bodies larger than max_body_size, before they are parsed.
+    Requests are rejected by their Content-Length header, or as soon as the streamed body
+    passes the limit when there is no header.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int,
+        path_max_body_sizes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        :param app:
+        :param max_body_size: limit of every request body
+        :param path_max_body_sizes: limits of the request bodies whose path ends with the given suffix,
+            e.g. a larger limit for bulk uploads
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_max_body_sizes = path_max_body_sizes or {}
+
+    def get_max_body_size(self, path: str)->int:
+        """
+        Get the body size limit of a request path
+        :param path:
+        :return:
+        """
+        for path_suffix, max_body_size in self.path_max_body_sizes.items():
+            if path.rstrip("/").endswith(path_suffix):
+                return max_body_size
+        return self.max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.get_max_body_size(scope["path"])
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > max_body_size:
+            response = JSONResponse(
+                {"detail": general_constants.HTTP_STATUS_DETAIL_PAYLOAD_TOO_LARGE},
+                status_code=general_constants.HTTP_STATUS_ERROR_PAYLOAD_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+
+        received_size = 0
+
+        async def receive_limited()->Message:
+            nonlocal received_size
+            message = await receive()
+            if message["type"] == "http.request":
+                received_size += len(message.get("body", b""))
+                if received_size > max_body_size:
+                    raise HTTPException(
+                        general_constants.HTTP_STATUS_ERROR_PAYLOAD_TOO_LARGE,
+                        general_constants.HTTP_STATUS_DETAIL_PAYLOAD_TOO_LARGE,
+                    )
+            return message
+
+        await self.app(scope, receive_limited, send)
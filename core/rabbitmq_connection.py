@@ -0,0 +1,80 @@
+import json
+from typing import Any, Dict
+
+import pika
+
+from core.configs import settings
+
+class RabbitMQConnection:
+    """
+    A class to open connections and publish messages to RabbitMQ
+    """
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        use_credentials: bool,
+        username: str,
+        password: str,
+        heartbeat: int = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.use_credentials = use_credentials
+        self.username = username
+        self.password = password
+        self.heartbeat = heartbeat
+
+    def get_connection_parameters(self)->pika.ConnectionParameters:
+        """
+        Build the connection parameters of RabbitMQ
+        :return:
+        """
+        if self.use_credentials:
+            return pika.ConnectionParameters(
+                self.host,
+                int(self.port),
+                '/',
+                pika.PlainCredentials(self.username, self.password),
+                heartbeat=self.heartbeat,
+            )
+        return pika.ConnectionParameters(self.host, int(self.port), heartbeat=self.heartbeat)
+
+    def get_connection(self)->pika.BlockingConnection:
+        """
+        Open a new blocking connection to RabbitMQ
+        :return:
+        """
+        return pika.BlockingConnection(self.get_connection_parameters())
+
+    def publish(self, queue_name: str, message: Dict[str, Any]):
+        """
+        Publish a persistent JSON message to a durable queue.
+        A connection is opened per publish because BlockingConnection is not thread-safe.
+        :param queue_name:
+        :param message:
+        :return:
+        """
+        connection = self.get_connection()
+        try:
+            channel = connection.channel()
+            channel.queue_declare(queue=queue_name, durable=True)
+            channel.basic_publish(
+                exchange='',
+                routing_key=queue_name,
+                body=json.dumps(message).encode("utf-8"),
+                properties=pika.BasicProperties(
+                    content_type="application/json",
+                    delivery_mode=pika.DeliveryMode.Persistent,
+                ),
+            )
+        finally:
+            connection.close()
+
+rabbitmq = RabbitMQConnection(
+    host=settings.RABBITMQ_HOST,
+    port=settings.RABBITMQ_PORT,
+    use_credentials=settings.RABBITMQ_USE_CREDENTIALS,
+    username=settings.RABBITMQ_USERNAME,
+    password=settings.RABBITMQ_PASSWORD,
+)
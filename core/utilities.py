@@ -1,12 +1,17 @@
+import base64
+import binascii
 from datetime import datetime, date
 import hashlib
 import locale
 import platform
 import re
-from typing import Optional
+import tempfile
+from typing import BinaryIO, Optional, Tuple
 from urllib.parse import urlparse
 
 from constants.general import (
+    FILE_READ_CHUNK_SIZE,
+    FILE_SPOOL_MAX_MEMORY_SIZE,
     INDONESIAN_WINDOWS_LOCALE,
     INDONESIAN_LINUX_LOCALE,
     OS_WINDOWS,
@@ -47,6 +52,90 @@ def hash_a_file(file, algorithm: str = 'sha256'):
     file.seek(0)  # Reset file pointer after hashing
     return hash_func.hexdigest()
 
+def encode_keyset_cursor(sort_value: datetime, row_id: int)->str:
+    """
+    Function to encode the (sort value, id) of the last row of a page into an opaque cursor
+    :param sort_value:
+    :param row_id:
+    :return:
+    """
+    raw_cursor = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw_cursor.encode("utf-8")).decode("ascii")
+
+def decode_keyset_cursor(cursor: str)->Tuple[datetime, int]:
+    """
+    Function to decode a cursor made by encode_keyset_cursor
+    :param cursor:
+    :return: tuple of (sort value, id)
+    :raises ValueError: if the cursor is malformed
+    """
+    try:
+        raw_cursor = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        sort_value, row_id = raw_cursor.rsplit("|", 1)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+class FileTooLargeError(ValueError):
+    """Raised when a file exceeds its maximum size"""
+
+def hash_and_measure_a_file(
+    file: BinaryIO,
+    max_size_bytes: Optional[int] = None,
+    algorithm: str = 'sha256',
+    chunk_size: int = FILE_READ_CHUNK_SIZE,
+)->Tuple[str, int]:
+    """
+    Function to hash a file and measure its size in a single pass of bounded reads.
+    The file pointer is reset after hashing.
+    :param file:
+    :param max_size_bytes: stop reading and raise FileTooLargeError as soon as the file is larger
+    :param algorithm:
+    :param chunk_size:
+    :return: tuple of (hex digest, size in bytes)
+    """
+    hash_func = hashlib.new(algorithm)
+    file_size = 0
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        file_size += len(chunk)
+        if max_size_bytes is not None and file_size > max_size_bytes:
+            raise FileTooLargeError(f"File is larger than {max_size_bytes} bytes.")
+        hash_func.update(chunk)
+    file.seek(0)
+    return hash_func.hexdigest(), file_size
+
+def spool_and_hash_a_file(
+    file: BinaryIO,
+    max_size_bytes: Optional[int] = None,
+    algorithm: str = 'sha256',
+    chunk_size: int = FILE_READ_CHUNK_SIZE,
+)->Tuple[BinaryIO, str, int]:
+    """
+    Function to copy a non-seekable stream, e.g. an archive member, into a spooled temporary file
+    while hashing and measuring it in the same pass. The spool stays in memory up to
+    FILE_SPOOL_MAX_MEMORY_SIZE bytes and rolls over to disk beyond.
+    :param file:
+    :param max_size_bytes: stop reading and raise FileTooLargeError as soon as the file is larger
+    :param algorithm:
+    :param chunk_size:
+    :return: tuple of (spooled file rewound to its start, hex digest, size in bytes)
+    """
+    spooled_file = tempfile.SpooledTemporaryFile(max_size=FILE_SPOOL_MAX_MEMORY_SIZE)
+    hash_func = hashlib.new(algorithm)
+    file_size = 0
+    try:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            file_size += len(chunk)
+            if max_size_bytes is not None and file_size > max_size_bytes:
+                raise FileTooLargeError(f"File is larger than {max_size_bytes} bytes.")
+            hash_func.update(chunk)
+            spooled_file.write(chunk)
+    except BaseException:
+        spooled_file.close()
+        raise
+    spooled_file.seek(0)
+    return spooled_file, hash_func.hexdigest(), file_size
+
 def parse_indonesian_date(
     datestr: str,
     date_format: Optional[str] = "%d %B %Y",
@@ -0,0 +1,87 @@
+from typing import List, Union
+
+import numpy as np
+
+from constants.core import (
+    VECTOR_PRECISION_BFLOAT16,
+    VECTOR_PRECISION_BYTES,
+    VECTOR_PRECISION_FLOAT16,
+    VECTOR_PRECISION_FLOAT32,
+)
+
+def truncate_vectors(vectors: np.ndarray, dimensions: int, normalize: bool = True)->np.ndarray:
+    """
+    Function to keep the first dimensions of vectors, valid for Matryoshka-trained models whose
+    leading dimensions carry most of the meaning, and L2-normalize them again for the cosine metric
+    :param vectors: (n, dim)
+    :param dimensions: kept dimensions, at most dim
+    :param normalize:
+    :return: contiguous float32 (n, dimensions) matrix
+    """
+    if dimensions > vectors.shape[1]:
+        raise ValueError(f"Cannot truncate vectors of {vectors.shape[1]} dimensions to {dimensions}.")
+    truncated_vectors = np.array(vectors[:, :dimensions], dtype=np.float32)
+    if normalize:
+        norms = np.linalg.norm(truncated_vectors, axis=1, keepdims=True)
+        truncated_vectors /= np.maximum(norms, np.finfo(np.float32).tiny)
+    return truncated_vectors
+
+def to_bfloat16_bits(vectors: np.ndarray)->np.ndarray:
+    """
+    Function to round float32 vectors to bfloat16, the upper 16 bits of a float32, to nearest even
+    :param vectors: (n, dim)
+    :return: uint16 (n, dim) matrix of the bfloat16 bit patterns
+    """
+    bits = np.ascontiguousarray(vectors, dtype=np.float32).view(np.uint32)
+    rounding_bias = ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    return ((bits + rounding_bias) >> 16).astype(np.uint16)
+
+def from_bfloat16_bits(bfloat16_bits: np.ndarray)->np.ndarray:
+    """
+    Function to widen bfloat16 bit patterns to float32
+    :param bfloat16_bits: uint16 (n, dim)
+    :return: float32 (n, dim)
+    """
+    return (bfloat16_bits.astype(np.uint32) << 16).view(np.float32)
+
+def round_trip_vectors(vectors: np.ndarray, precision: str)->np.ndarray:
+    """
+    Function to get vectors as they are after being stored at a precision
+    :param vectors: (n, dim)
+    :param precision: VECTOR_PRECISION_*
+    :return: float32 (n, dim)
+    """
+    if precision == VECTOR_PRECISION_FLOAT16:
+        return np.asarray(vectors, dtype=np.float16).astype(np.float32)
+    if precision == VECTOR_PRECISION_BFLOAT16:
+        return from_bfloat16_bits(to_bfloat16_bits(vectors))
+    return np.asarray(vectors, dtype=np.float32)
+
+def to_vector_field_values(vectors: np.ndarray, precision: str)->List[Union[List[float], bytes]]:
+    """
+    Function to encode vectors as the values of a Milvus vector field of a precision:
+    lists of floats for FLOAT_VECTOR, little-endian half-precision bytes for FLOAT16_VECTOR
+    and BFLOAT16_VECTOR
+    :param vectors: (n, dim)
+    :param precision: VECTOR_PRECISION_*
+    :return: a value per vector
+    """
+    if precision == VECTOR_PRECISION_FLOAT32:
+        return np.asarray(vectors, dtype=np.float32).tolist()
+    if precision == VECTOR_PRECISION_FLOAT16:
+        half_vectors = np.asarray(vectors, dtype="<f2")
+    elif precision == VECTOR_PRECISION_BFLOAT16:
+        half_vectors = to_bfloat16_bits(vectors).astype("<u2")
+    else:
+        raise ValueError(f"Unsupported vector precision: {precision}")
+    return [half_vector.tobytes() for half_vector in half_vectors]
+
+def get_vector_memory_bytes(n_vectors: int, dimensions: int, precision: str)->int:
+    """
+    Function to get the raw memory of vectors, without the index overhead
+    :param n_vectors:
+    :param dimensions:
+    :param precision: VECTOR_PRECISION_*
+    :return:
+    """
+    return n_vectors * dimensions * VECTOR_PRECISION_BYTES[precision]
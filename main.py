@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from api.routes import api_router_v1
+from constants.controller import documents_management as documents_management_constants
 from core.configs import settings
+from core.middlewares import MaxBodySizeMiddleware
 
 main_app = FastAPI(
     openapi_url=f'{settings.API_STR}/openapi.json',
@@ -18,4 +20,12 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=['*'],
     )
 
+main_app.add_middleware(
+    MaxBodySizeMiddleware, # type: ignore
+    max_body_size=settings.MAX_REQUEST_BODY_SIZE_BYTES,
+    path_max_body_sizes={
+        documents_management_constants.BULK_UPLOAD_PATH: settings.MAX_BULK_REQUEST_BODY_SIZE_BYTES,
+    },
+)
+
 main_app.include_router(api_router_v1, prefix=settings.API_STR)
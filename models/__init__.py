@@ -1,6 +1,9 @@
 from models.base_class import Base
 
+from models.tbl_document_contents import TblDocumentContents
+from models.tbl_document_chunks import TblDocumentChunks
 from models.tbl_documents import TblDocuments
+from models.tbl_ingestion_jobs import TblIngestionJobs
 from models.tbl_permissions import TblPermissions
 from models.tbl_rolepermissions import TblRolePermissions
 from models.tbl_roles import TblRoles
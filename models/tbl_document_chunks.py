@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from models import Base
+from models.tbl_document_contents import TblDocumentContents
+
+class TblDocumentChunks(Base):
+    """
+    Tbl_Document_Chunks to store the chunks of a document content with their content hash
+    and the id of their vector in Milvus, so a re-ingestion only embeds the changed chunks
+    """
+    __table_args__ = (
+        Index('ix_Tbl_Document_Chunks_content_id_chunk_hash', 'content_id', 'chunk_hash'),
+        { 'extend_existing': True },
+    )
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    content_id = Column(Integer, ForeignKey(TblDocumentContents.id, ondelete="CASCADE"), index=True, nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    chunk_hash = Column(String, nullable=False)
+    vector_id = Column(BigInteger, nullable=True)
+    content = relationship("TblDocumentContents", back_populates="chunks")
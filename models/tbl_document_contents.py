@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from models import Base
+
+class TblDocumentContents(Base):
+    """
+    Tbl_Document_Contents to store the extraction results of a document content,
+    shared by every uploaded document with the same document_hash
+    """
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    document_hash = Column(String, unique=True, index=True, nullable=False)
+    status = Column(String, index=True, nullable=False)
+    extracted_text = Column(Text, nullable=True)
+    chunk_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    ingested_at = Column(DateTime, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    claimed_by_job_id = Column(String, nullable=True)
+    documents = relationship("TblDocuments", back_populates="content")
+    chunks = relationship("TblDocumentChunks", back_populates="content", passive_deletes=True)
@@ -1,13 +1,19 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from models import Base
+from models.tbl_document_contents import TblDocumentContents
 from models.tbl_users import TblUsers
 
 class TblDocuments(Base):
     """
     Tbl_Documents to store uploaded documents
     """
+    __table_args__ = (
+        Index('ix_Tbl_Documents_uploaded_at_id', 'uploaded_at', 'id'),
+        Index('ix_Tbl_Documents_uploader_id_uploaded_at_id', 'uploader_id', 'uploaded_at', 'id'),
+        { 'extend_existing': True },
+    )
     id = Column(Integer, primary_key=True, index=True, nullable=False)
     document_name = Column(String, nullable=True)
     document_description = Column(String)
@@ -15,6 +21,9 @@ class TblDocuments(Base):
     uploaded_at = Column(DateTime, index=True, nullable=False)
     is_uploaded = Column(Boolean, index=True)
     uploader_id = Column(Integer, ForeignKey(TblUsers.id), nullable=False)
-    the_document = Column(LargeBinary, nullable=True)
-    document_hash = Column(String, nullable=True)
+    blob_key = Column(String, nullable=True)
+    document_hash = Column(String, index=True, nullable=True)
+    content_id = Column(Integer, ForeignKey(TblDocumentContents.id), index=True, nullable=True)
     user = relationship("TblUsers", back_populates="documents")
+    content = relationship("TblDocumentContents", back_populates="documents")
+    ingestion_jobs = relationship("TblIngestionJobs", back_populates="document", passive_deletes=True)
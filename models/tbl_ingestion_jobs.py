@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from models import Base
+from models.tbl_document_contents import TblDocumentContents
+from models.tbl_documents import TblDocuments
+
+class TblIngestionJobs(Base):
+    """
+    Tbl_Ingestion_Jobs to track the background ingestion of uploaded documents
+    """
+    id = Column(Integer, primary_key=True, index=True, nullable=False)
+    job_id = Column(String, unique=True, index=True, nullable=False)
+    document_id = Column(Integer, ForeignKey(TblDocuments.id, ondelete="CASCADE"), index=True, nullable=False)
+    status = Column(String, index=True, nullable=False)
+    error_message = Column(String, nullable=True)
+    chunk_count = Column(Integer, nullable=True)
+    base_content_id = Column(Integer, ForeignKey(TblDocumentContents.id, ondelete="SET NULL"), nullable=True)
+    chunks_added = Column(Integer, nullable=True)
+    chunks_kept = Column(Integer, nullable=True)
+    chunks_deleted = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    document = relationship("TblDocuments", back_populates="ingestion_jobs")
@@ -1,6 +1,9 @@
 from repositories.crud_base import CRUDBase
 from repositories.milvus import *
+from repositories.crud_tbl_document_chunks import crud_tbl_document_chunks
+from repositories.crud_tbl_document_contents import crud_tbl_document_contents
 from repositories.crud_tbl_documents import crud_tbl_documents
+from repositories.crud_tbl_ingestion_jobs import crud_tbl_ingestion_jobs
 from repositories.crud_tbl_permissions import crud_tbl_permissions
 from repositories.crud_tbl_rolepermissions import crud_tbl_rolepermissions
 from repositories.crud_tbl_roles import crud_tbl_roles
@@ -0,0 +1,64 @@
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import TblDocumentChunks
+from repositories.crud_base import CRUDBase
+from schemas import DocumentChunksSchema, DocumentChunksUpdateSchema
+
+class CRUDDocumentChunks(CRUDBase[TblDocumentChunks, DocumentChunksSchema, DocumentChunksUpdateSchema]):
+    """
+    CRUD for TblDocumentChunks
+    """
+    def get_all_by_content_id(self, db: Session, content_id: int)->List[TblDocumentChunks]:
+        """
+        Get the chunks of a document content, in order
+        :param db:
+        :param content_id:
+        :return:
+        """
+        return db.query(self.model).filter(  # type: ignore
+            self.model.content_id == content_id
+        ).order_by(self.model.chunk_index, self.model.id).all()  # type: ignore
+
+    def apply_diff(
+        self,
+        db: Session,
+        content_id: int,
+        kept_chunks: List[Tuple[TblDocumentChunks, int]],
+        added_chunks: List[DocumentChunksSchema],
+        deleted_chunks: List[TblDocumentChunks],
+    )->None:
+        """
+        Apply the difference between the stored and the new chunks of a document content in one transaction
+        :param db:
+        :param content_id: content the kept chunks are moved to
+        :param kept_chunks: list of (stored chunk, its new chunk_index), with their vector_id
+        :param added_chunks:
+        :param deleted_chunks:
+        :return:
+        """
+        db.bulk_update_mappings(TblDocumentChunks, [  # type: ignore
+            {"id": chunk.id, "content_id": content_id, "chunk_index": chunk_index, "vector_id": chunk.vector_id}
+            for chunk, chunk_index in kept_chunks
+        ])
+        db.add_all([TblDocumentChunks(**chunk.model_dump()) for chunk in added_chunks])
+        if deleted_chunks:
+            db.query(self.model).filter(  # type: ignore
+                self.model.id.in_([chunk.id for chunk in deleted_chunks])
+            ).delete(synchronize_session=False)
+        db.commit()
+
+    def delete_all_by_content_id(self, db: Session, content_id: int)->List[TblDocumentChunks]:
+        """
+        Delete the chunks of a document content
+        :param db:
+        :param content_id:
+        :return: the deleted chunks
+        """
+        deleted_chunks = self.get_all_by_content_id(db, content_id)
+        db.query(self.model).filter(self.model.content_id == content_id).delete(synchronize_session=False)  # type: ignore
+        db.commit()
+        return deleted_chunks
+
+crud_tbl_document_chunks = CRUDDocumentChunks(TblDocumentChunks)
@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import TblDocumentContents
+from repositories.crud_base import CRUDBase
+from schemas import DocumentContentsSchema, DocumentContentsUpdateSchema
+
+class CRUDDocumentContents(
+    CRUDBase[TblDocumentContents, DocumentContentsSchema, DocumentContentsUpdateSchema]
+):
+    """
+    CRUD for TblDocumentContents
+    """
+    def get_by_hash(self, db: Session, document_hash: str)->Optional[TblDocumentContents]:
+        """
+        Get a document content by its document_hash
+        :param db:
+        :param document_hash:
+        :return:
+        """
+        return db.query(self.model).filter(self.model.document_hash == document_hash).first()  # type: ignore
+
+    def get_or_create_by_hash(
+        self,
+        db: Session,
+        document_hash: str,
+        status: str,
+    )->Tuple[TblDocumentContents, bool]:
+        """
+        Get a document content by its document_hash, or create it.
+        Safe for concurrent uploads of the same document, the unique index on document_hash
+        lets only one of them create the content.
+        :param db:
+        :param document_hash:
+        :param status: status of the content if it is created
+        :return: tuple of (document content, whether it is created by this call)
+        """
+        created_id = db.execute(
+            insert(self.model).values(
+                document_hash=document_hash,
+                status=status,
+                created_at=datetime.now(),
+            ).on_conflict_do_nothing(
+                index_elements=[self.model.document_hash]
+            ).returning(self.model.id)
+        ).scalar()
+        db.commit()
+        return self.get_by_hash(db, document_hash), created_id is not None  # type: ignore
+
+    def claim(
+        self,
+        db: Session,
+        content_id: int,
+        job_id: str,
+        from_statuses: List[str],
+        to_status: str,
+        stale_before: datetime,
+    )->bool:
+        """
+        Atomically move a document content from one of from_statuses to to_status for a job,
+        so only one ingestion worker processes a content. A content already in to_status is claimed
+        again by the job owning it, e.g. on a redelivery after its worker died, or by any job once
+        its claim is older than stale_before.
+        :param db:
+        :param content_id:
+        :param job_id:
+        :param from_statuses:
+        :param to_status:
+        :param stale_before: claims older than this are taken over
+        :return: whether the content is claimed by this call
+        """
+        updated_rows = db.query(self.model).filter(  # type: ignore
+            self.model.id == content_id,
+            or_(
+                self.model.status.in_(from_statuses),
+                (self.model.status == to_status) & or_(
+                    self.model.claimed_by_job_id == job_id,
+                    self.model.claimed_at.is_(None),
+                    self.model.claimed_at < stale_before,
+                ),
+            ),
+        ).update({
+            self.model.status: to_status,
+            self.model.claimed_at: datetime.now(),
+            self.model.claimed_by_job_id: job_id,
+        }, synchronize_session=False)
+        db.commit()
+        return updated_rows == 1
+
+    def is_claim_stale(self, db_obj: TblDocumentContents, stale_before: datetime)->bool:
+        """
+        Tell whether the claim of a content is older than stale_before, its worker likely died
+        :param db_obj:
+        :param stale_before:
+        :return:
+        """
+        return db_obj.claimed_at is None or db_obj.claimed_at < stale_before
+
+    def update_content(
+        self,
+        db: Session,
+        db_obj: TblDocumentContents,
+        obj_in: DocumentContentsUpdateSchema,
+    )->TblDocumentContents:
+        """
+        Update the extraction results of a document content
+        :param db:
+        :param db_obj:
+        :param obj_in:
+        :return:
+        """
+        for field, value in obj_in.model_dump(exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+crud_tbl_document_contents = CRUDDocumentContents(TblDocumentContents)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, tuple_
+from sqlalchemy.orm import Query, Session
 
 from models import TblDocuments
 from repositories.crud_base import CRUDBase
@@ -11,6 +12,18 @@ class CRUDDocuments(CRUDBase[TblDocuments, DocumentsSchema, DocumentsUpdateSchem
     """
     CRUD for TblDocuments
     """
+    # Metadata columns of a listing, the blob and content links are never selected
+    listing_columns = (
+        TblDocuments.id,
+        TblDocuments.document_name,
+        TblDocuments.document_description,
+        TblDocuments.document_type,
+        TblDocuments.document_hash,
+        TblDocuments.is_uploaded,
+        TblDocuments.uploader_id,
+        TblDocuments.uploaded_at,
+    )
+
     def create(self, db: Session, obj_in: DocumentsSchema)->TblDocuments:
         """
         Create a document
@@ -26,22 +39,73 @@ class CRUDDocuments(CRUDBase[TblDocuments, DocumentsSchema, DocumentsUpdateSchem
             is_uploaded=obj_in.is_uploaded,
             uploader_id=obj_in.uploader_id,
             uploaded_at=datetime.now(),
-            the_document=obj_in.the_document,
+            blob_key=obj_in.blob_key,
+            content_id=obj_in.content_id,
         )
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def get_all_limited(self, db: Session, limit: int, page: int)->List[TblDocuments]:
+    def get_all_limited(self, db: Session, limit: int, page: int)->List[Row]:
         """
-        Get all documents with limit and pagination
+        Get the metadata of all documents with limit and pagination
         :param db:
         :param limit:
         :param page:
         :return:
         """
-        return db.query(self.model).limit(limit).offset((page - 1) * limit).all()  # type: ignore
+        return db.query(*self.listing_columns).order_by(  # type: ignore
+            self.model.id
+        ).limit(limit).offset((page - 1) * limit).all()
+
+    def query_listing(self, db: Session, uploader_id: Optional[int] = None)->Query:
+        """
+        Query the metadata of all documents, or of the documents of an uploader
+        :param db:
+        :param uploader_id:
+        :return:
+        """
+        query = db.query(*self.listing_columns)
+        if uploader_id is not None:
+            query = query.filter(self.model.uploader_id == uploader_id)
+        return query
+
+    def get_listing_page(
+        self,
+        db: Session,
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        uploader_id: Optional[int] = None,
+    )->List[Row]:
+        """
+        Get a page of document metadata, newest first, with keyset pagination on (uploaded_at, id).
+        The page starts right after the cursor row, so a deep page is an index seek like the first one.
+        :param db:
+        :param limit:
+        :param cursor: (uploaded_at, id) of the last row of the previous page
+        :param uploader_id:
+        :return:
+        """
+        query = self.query_listing(db, uploader_id)
+        if cursor is not None:
+            query = query.filter(tuple_(self.model.uploaded_at, self.model.id) < tuple_(*cursor))
+        return query.order_by(  # type: ignore
+            self.model.uploaded_at.desc(),
+            self.model.id.desc(),
+        ).limit(limit).all()
+
+    def count_listing(self, db: Session, uploader_id: Optional[int] = None)->int:
+        """
+        Count all documents, or the documents of an uploader
+        :param db:
+        :param uploader_id:
+        :return:
+        """
+        query = db.query(func.count(self.model.id))
+        if uploader_id is not None:
+            query = query.filter(self.model.uploader_id == uploader_id)
+        return query.scalar() or 0
 
     def get_all_by_uploader_id(self, db: Session, uploader_id: int)->List[TblDocuments]:
         """
@@ -58,18 +122,18 @@ class CRUDDocuments(CRUDBase[TblDocuments, DocumentsSchema, DocumentsUpdateSchem
         uploader_id: int,
         limit: int,
         page: int
-    )->List[TblDocuments]:
+    )->List[Row]:
         """
-        Get all documents by uploader_id with limit and pagination
+        Get the metadata of all documents by uploader_id with limit and pagination
         :param db:
         :param uploader_id:
         :param limit:
         :param page:
         :return:
         """
-        return db.query(self.model).filter(  # type: ignore
-            self.model.uploader_id == uploader_id
-        ).limit(limit).offset((page - 1) * limit).all()  # type: ignore
+        return self.query_listing(db, uploader_id).order_by(  # type: ignore
+            self.model.id
+        ).limit(limit).offset((page - 1) * limit).all()
 
     def get_by_like_document_name(self, db: Session, document_name: str)->List[TblDocuments]:
         """
@@ -80,6 +144,24 @@ class CRUDDocuments(CRUDBase[TblDocuments, DocumentsSchema, DocumentsUpdateSchem
         """
         return db.query(self.model).filter(self.model.document_name.like(f'%{document_name}%')).all()  # type: ignore
 
+    def count_by_content_id(self, db: Session, content_id: int)->int:
+        """
+        Count the documents linked to a document content
+        :param db:
+        :param content_id:
+        :return:
+        """
+        return db.query(self.model).filter(self.model.content_id == content_id).count()  # type: ignore
+
+    def count_by_document_hash(self, db: Session, document_hash: str)->int:
+        """
+        Count the documents of a hash, they share one blob
+        :param db:
+        :param document_hash:
+        :return:
+        """
+        return db.query(self.model).filter(self.model.document_hash == document_hash).count()  # type: ignore
+
     def delete_by_id(self, db: Session, document_id: int)->Optional[TblDocuments]:
         """
         Delete a document by document_id
@@ -100,7 +182,9 @@ class CRUDDocuments(CRUDBase[TblDocuments, DocumentsSchema, DocumentsUpdateSchem
         :param document_ids:
         """
         response = db.query(self.model).filter(self.model.id.in_(document_ids)).all()
-        db.query(self.model).filter(self.model.id.in_(document_ids)).delete(synchronize_session=False)
+        for document in response:
+            db.delete(document)
+        db.commit()
         return response  # type: ignore
 
 crud_tbl_documents = CRUDDocuments(TblDocuments)
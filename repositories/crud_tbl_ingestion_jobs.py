@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from models import TblDocuments, TblIngestionJobs
+from repositories.crud_base import CRUDBase
+from schemas import IngestionJobsSchema, IngestionJobsUpdateSchema
+
+class CRUDIngestionJobs(CRUDBase[TblIngestionJobs, IngestionJobsSchema, IngestionJobsUpdateSchema]):
+    """
+    CRUD for TblIngestionJobs
+    """
+    def create(self, db: Session, obj_in: IngestionJobsSchema)->TblIngestionJobs:
+        """
+        Create an ingestion job
+        :param db:
+        :param obj_in:
+        :return:
+        """
+        db_obj = TblIngestionJobs(
+            job_id=obj_in.job_id,
+            document_id=obj_in.document_id,
+            status=obj_in.status,
+            error_message=obj_in.error_message,
+            chunk_count=obj_in.chunk_count,
+            base_content_id=obj_in.base_content_id,
+            created_at=obj_in.created_at or datetime.now(),
+            started_at=obj_in.started_at,
+            finished_at=obj_in.finished_at,
+        )
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def get_by_job_id(self, db: Session, job_id: str)->Optional[TblIngestionJobs]:
+        """
+        Get an ingestion job by its job_id
+        :param db:
+        :param job_id:
+        :return:
+        """
+        return db.query(self.model).filter(self.model.job_id == job_id).first()  # type: ignore
+
+    def get_all_by_document_id(self, db: Session, document_id: int)->List[TblIngestionJobs]:
+        """
+        Get all ingestion jobs of a document
+        :param db:
+        :param document_id:
+        :return:
+        """
+        return db.query(self.model).filter(  # type: ignore
+            self.model.document_id == document_id
+        ).order_by(self.model.created_at.desc()).all()  # type: ignore
+
+    def get_all_by_content_id(self, db: Session, content_id: int, status: str)->List[TblIngestionJobs]:
+        """
+        Get the ingestion jobs of a status of the documents linked to a document content
+        :param db:
+        :param content_id:
+        :param status:
+        :return:
+        """
+        return db.query(self.model).join(  # type: ignore
+            TblDocuments, TblDocuments.id == self.model.document_id
+        ).filter(
+            TblDocuments.content_id == content_id,
+            self.model.status == status,
+        ).order_by(self.model.created_at).all()  # type: ignore
+
+    def update_status(
+        self,
+        db: Session,
+        db_obj: TblIngestionJobs,
+        obj_in: IngestionJobsUpdateSchema,
+    )->TblIngestionJobs:
+        """
+        Update the status fields of an ingestion job
+        :param db:
+        :param db_obj:
+        :param obj_in:
+        :return:
+        """
+        for field, value in obj_in.model_dump(exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+crud_tbl_ingestion_jobs = CRUDIngestionJobs(TblIngestionJobs)
@@ -1,17 +1,29 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import numpy as np
 from pymilvus import (
     Collection,
     DataType,
     FieldSchema,
     Function,
-    FunctionType
+    FunctionType,
+    utility,
 )
 
+from constants.core import VECTOR_PRECISION_BFLOAT16, VECTOR_PRECISION_FLOAT16, VECTOR_PRECISION_FLOAT32
 from core.configs import settings
+from core.logger import logger
+from core.vector_storage import to_vector_field_values
 from repositories.milvus.crud_base_milvus import MilvusCRUD
 from schemas import MilvusDocumentsSchema
 
+# Vector precision -> Milvus data type of the dense_embedding field
+DENSE_EMBEDDING_DATA_TYPES = {
+    VECTOR_PRECISION_FLOAT32: DataType.FLOAT_VECTOR,
+    VECTOR_PRECISION_FLOAT16: DataType.FLOAT16_VECTOR,
+    VECTOR_PRECISION_BFLOAT16: DataType.BFLOAT16_VECTOR,
+}
+
 class CRUDDocuments(MilvusCRUD):
     """
     CRUD for Documents collection on Milvus
@@ -22,10 +34,33 @@ class CRUDDocuments(MilvusCRUD):
         port: str,
         username: str,
         password: str,
-        delete_insert_collection: bool = False
+        delete_insert_collection: bool = False,
+        dimensions: int = 1024,
+        vector_precision: str = VECTOR_PRECISION_FLOAT32,
     ):
+        """
+        :param host:
+        :param port:
+        :param username:
+        :param password:
+        :param delete_insert_collection: recreate the collection, it drops every vector, see recreate_collection
+        :param dimensions: dimensions of the dense embeddings
+        :param vector_precision: VECTOR_PRECISION_*, the half precisions halve the vector memory
+        """
+        if vector_precision not in DENSE_EMBEDDING_DATA_TYPES:
+            raise ValueError(f"Unsupported vector precision: {vector_precision}")
         super().__init__(host, port, username, password)
         self.collection_name = "documents"
+        self.dimensions = dimensions
+        self.vector_precision = vector_precision
+        self.create_documents_collection(delete_insert_collection)
+
+    def create_documents_collection(self, delete_insert_collection: bool = False):
+        """
+        Function to create the collection with the dimensions and the vector precision, if it does not exist
+        :param delete_insert_collection: drop the collection and its vectors first
+        :return:
+        """
         analyzer_params = {
             "tokenizer": "standard",
         }
@@ -37,7 +72,7 @@ class CRUDDocuments(MilvusCRUD):
                 auto_id=True
             ),
             FieldSchema(
-                name="uploaded_document_id",
+                name="content_id",
                 dtype=DataType.INT32,
             ),
             FieldSchema(
@@ -49,8 +84,8 @@ class CRUDDocuments(MilvusCRUD):
             ),
             FieldSchema(
                 name="dense_embedding",
-                dtype=DataType.FLOAT_VECTOR,
-                dim=1024
+                dtype=DENSE_EMBEDDING_DATA_TYPES[self.vector_precision],
+                dim=self.dimensions
             ),
             FieldSchema(
                 name="sparse_embedding",
@@ -81,6 +116,14 @@ class CRUDDocuments(MilvusCRUD):
         ]
         if delete_insert_collection:
             self.delete_collection(self.collection_name)
+        elif utility.has_collection(self.collection_name):
+            field_names = {field.name for field in Collection(self.collection_name).schema.fields}
+            if "content_id" not in field_names:
+                # The vectors of a collection created before content_id map to the uploaded documents
+                logger.warning(
+                    f"CRUDDocuments.create_documents_collection: Collection {self.collection_name} has no content_id "
+                    f"field, run python services/recreate_vector_collection.py to migrate it."
+                )
         self.create_collection(
             collection_name=self.collection_name,
             fields=document_fields,
@@ -88,6 +131,15 @@ class CRUDDocuments(MilvusCRUD):
             added_functions=[text_to_bm_25],
         )
 
+    def recreate_collection(self):
+        """
+        Function to drop the collection and create it again, e.g. after a change of the dimensions or of
+        the vector precision, or to migrate a collection without content_id. Every vector is dropped,
+        the documents have to be ingested again.
+        :return:
+        """
+        self.create_documents_collection(delete_insert_collection=True)
+
     def insert_vector(
         self,
         inserted_document: MilvusDocumentsSchema
@@ -99,9 +151,9 @@ class CRUDDocuments(MilvusCRUD):
         """
         collection = Collection(self.collection_name)
         result = collection.insert([
-            inserted_document.uploaded_document_id,
+            inserted_document.content_id,
             inserted_document.text,
-            inserted_document.dense_embedding,
+            to_vector_field_values(np.asarray([inserted_document.dense_embedding]), self.vector_precision)[0],
             inserted_document.sparse_embedding
         ])
         return result.primary_keys[0] if len(result.primary_keys) > 0 else None
@@ -116,16 +168,58 @@ class CRUDDocuments(MilvusCRUD):
         :return:
         """
         collection = Collection(self.collection_name)
-        results = collection.insert(
-            data=[doc.model_dump(mode='json') for doc in inserted_documents]
+        if not inserted_documents:
+            return []
+        # The sparse embedding is the output of the BM25 function, Milvus computes it
+        data = [doc.model_dump(mode='json', exclude={'sparse_embedding'}) for doc in inserted_documents]
+        dense_embeddings = to_vector_field_values(
+            np.asarray([doc.dense_embedding for doc in inserted_documents]),
+            self.vector_precision,
         )
+        for document_data, dense_embedding in zip(data, dense_embeddings):
+            document_data["dense_embedding"] = dense_embedding
+        results = collection.insert(data=data)
         return results.primary_keys
 
+    def copy_vectors(self, ids: List[int], content_id: int)->Dict[int, int]:
+        """
+        Function to copy vectors to another document content, without embedding their texts again.
+        Milvus does not update a field in place, so moving a vector is copying it then deleting it.
+        :param ids: primary IDs of the vectors
+        :param content_id:
+        :return: primary ID of each copied vector -> the primary ID of its copy
+        """
+        if not ids:
+            return {}
+        collection = Collection(self.collection_name)
+        rows = collection.query(expr=f"id in {list(ids)}", output_fields=["text", "dense_embedding"])
+        if not rows:
+            return {}
+        data = []
+        for row in rows:
+            dense_embedding = row["dense_embedding"]
+            # The half precision vectors are queried as [bytes]
+            if isinstance(dense_embedding, list) and len(dense_embedding) == 1 and isinstance(dense_embedding[0], bytes):
+                dense_embedding = dense_embedding[0]
+            data.append({"content_id": content_id, "text": row["text"], "dense_embedding": dense_embedding})
+        results = collection.insert(data=data)
+        return dict(zip([row["id"] for row in rows], results.primary_keys))
+
+    def delete_vectors(self, ids: List[int]):
+        """
+        Function to delete documents from the collection by their primary IDs
+        :param ids:
+        :return:
+        """
+        self.delete_by_id(self.collection_name, ids)
+
 
 crud_documents_milvus = CRUDDocuments(
     host=settings.VECTOR_DB_HOST,
     port=settings.VECTOR_DB_PORT,
     username=settings.VECTOR_DB_USERNAME,
     password=settings.VECTOR_DB_PASSWORD,
-    delete_insert_collection=True,
+    delete_insert_collection=False,
+    dimensions=settings.EMBEDDING_DIMENSIONS,
+    vector_precision=settings.EMBEDDING_VECTOR_PRECISION,
 )
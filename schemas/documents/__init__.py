@@ -1,7 +1,18 @@
+from schemas.documents.chunking_schema import LegalChunk
 from schemas.documents.documents_domain_schema import (
+    DocumentChunksSchema,
+    DocumentChunksUpdateSchema,
+    DocumentContentsSchema,
+    DocumentContentsUpdateSchema,
     DocumentsSchema,
     DocumentsInDB,
     DocumentsUpdateSchema,
+    IngestionJobsSchema,
+    IngestionJobsUpdateSchema,
     MilvusDocumentsSchema,
     MilvusDocumentsInDB,
 )
+from schemas.documents.extraction_schema import (
+    DocumentExtractionResult,
+    PageExtractionResult,
+)
@@ -0,0 +1,33 @@
+from typing import List
+
+from pydantic import BaseModel
+
+class LegalChunk(BaseModel):
+    """Schema for a chunk of an Indonesian statute with its place in the statute hierarchy."""
+    text: str
+    hierarchy: List[str]
+
+    def get_hierarchy_path(self, separator: str = " > ")->str:
+        """
+        Join the hierarchy, e.g. "BAB IV KESEMPATAN DAN PERLAKUAN YANG SAMA > Pasal 5"
+        :param separator:
+        :return:
+        """
+        return separator.join(self.hierarchy)
+
+    def get_hierarchy_prefix(self)->str:
+        """
+        Get the hierarchy path the text is prefixed with, without the heading the text already starts
+        with, e.g. "Pasal 5"
+        :return: the path and a line break, empty without hierarchy
+        """
+        first_line = self.text.split("\n", 1)[0].strip()
+        hierarchy = [level for level in self.hierarchy if level != first_line]
+        return f"{' > '.join(hierarchy)}\n" if hierarchy else ""
+
+    def get_text_with_hierarchy(self)->str:
+        """
+        Prefix the text with its hierarchy path, so an embedded chunk keeps its context
+        :return:
+        """
+        return self.get_hierarchy_prefix() + self.text
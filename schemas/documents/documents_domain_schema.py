@@ -5,7 +5,7 @@ from pydantic import BaseModel
 
 class MilvusDocumentsSchema(BaseModel):
     """Schema for documents domain in Milvus."""
-    uploaded_document_id: int
+    content_id: int
     text: str
     dense_embedding: List[float]
     sparse_embedding: Optional[List[float]] = None
@@ -26,7 +26,8 @@ class DocumentsSchema(BaseModel):
     is_uploaded: bool
     uploader_id: int
     uploaded_at: Optional[datetime] = None
-    the_document: bytes
+    blob_key: str
+    content_id: Optional[int] = None
 
 class DocumentsInDB(DocumentsSchema):
     """Schema for documents domain in database."""
@@ -43,5 +44,59 @@ class DocumentsUpdateSchema(BaseModel):
     document_hash: Optional[str] = None
     is_uploaded: Optional[bool] = False
     uploader_id: Optional[int] = None
-    the_document: Optional[bytes] = None
+    blob_key: Optional[str] = None
     uploaded_at: Optional[datetime] = None
+    content_id: Optional[int] = None
+
+class IngestionJobsSchema(BaseModel):
+    """Schema for document ingestion jobs."""
+    job_id: str
+    document_id: int
+    status: str
+    error_message: Optional[str] = None
+    chunk_count: Optional[int] = None
+    base_content_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class IngestionJobsUpdateSchema(BaseModel):
+    """Schema for updating document ingestion jobs."""
+    status: Optional[str] = None
+    error_message: Optional[str] = None
+    chunk_count: Optional[int] = None
+    chunks_added: Optional[int] = None
+    chunks_kept: Optional[int] = None
+    chunks_deleted: Optional[int] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class DocumentContentsSchema(BaseModel):
+    """Schema for the extraction results of a document content."""
+    document_hash: str
+    status: str
+    extracted_text: Optional[str] = None
+    chunk_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    ingested_at: Optional[datetime] = None
+
+class DocumentContentsUpdateSchema(BaseModel):
+    """Schema for updating the extraction results of a document content."""
+    status: Optional[str] = None
+    extracted_text: Optional[str] = None
+    chunk_count: Optional[int] = None
+    ingested_at: Optional[datetime] = None
+    claimed_at: Optional[datetime] = None
+    claimed_by_job_id: Optional[str] = None
+
+class DocumentChunksSchema(BaseModel):
+    """Schema for the chunks of a document content."""
+    content_id: int
+    chunk_index: int
+    chunk_hash: str
+    vector_id: Optional[int] = None
+
+class DocumentChunksUpdateSchema(BaseModel):
+    """Schema for updating the chunks of a document content."""
+    content_id: Optional[int] = None
+    chunk_index: Optional[int] = None
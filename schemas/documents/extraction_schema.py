@@ -0,0 +1,22 @@
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+class PageExtractionResult(BaseModel):
+    """Schema for the extracted text of a single PDF page."""
+    page_number: int
+    text: str
+    method: Literal["text_layer", "ocr", "ocr_cache"] = "ocr"
+    elapsed_seconds: float
+
+class DocumentExtractionResult(BaseModel):
+    """Schema for the extracted text of a whole PDF document, ordered by page number."""
+    pages: List[PageExtractionResult]
+    elapsed_seconds: float
+
+    def get_full_text(self)->str:
+        """
+        Join the text of all pages
+        :return:
+        """
+        return "\n".join(page.text for page in self.pages).strip()
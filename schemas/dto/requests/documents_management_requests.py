@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel
 
 class DocumentUploadRequest(BaseModel):
@@ -6,6 +8,18 @@ class DocumentUploadRequest(BaseModel):
     document_description: str
     document_type: str
 
+class DocumentBulkUploadItem(DocumentUploadRequest):
+    """Schema for the metadata of a file of a bulk upload, matched by its file name or archive path"""
+    file_name: str
+
+class DocumentBulkUploadManifest(BaseModel):
+    """Schema for the manifest of a bulk upload"""
+    documents: List[DocumentBulkUploadItem]
+
 class DocumentDeleteRequest(BaseModel):
     """Schema for document delete request"""
     document_id: int
+
+class EmbeddingRequest(BaseModel):
+    """Schema for the texts to embed with the embedding model"""
+    texts: List[str]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -9,6 +9,24 @@ class DocumentUploadResponse(BaseModel):
     document_size: int
     document_hash: str
     document_id: int
+    job_id: str
+    job_status: str
+
+class DocumentBulkUploadResult(BaseModel):
+    """Schema for the result of a single file of a bulk upload"""
+    file_name: str
+    document_hash: Optional[str] = None
+    document_size: Optional[int] = None
+    document_id: Optional[int] = None
+    job_id: Optional[str] = None
+    job_status: Optional[str] = None
+    error: Optional[str] = None
+
+class DocumentBulkUploadResponse(BaseModel):
+    """Schema for bulk document upload response, with a result per file in upload order"""
+    results: List[DocumentBulkUploadResult]
+    uploaded_count: int
+    failed_count: int
 
 class AllDocumentsResponse(BaseModel):
     """Schema for all documents response"""
@@ -24,3 +42,70 @@ class AllDocumentsResponse(BaseModel):
     class Config:
         """Config for AllDocumentsResponse"""
         from_attributes = True
+
+class DocumentsPageResponse(BaseModel):
+    """Schema for a keyset-paginated page of documents response"""
+    items: List[AllDocumentsResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+class IngestionJobResponse(BaseModel):
+    """Schema for document ingestion job status response"""
+    job_id: str
+    document_id: int
+    status: str
+    error_message: Optional[str] = None
+    chunk_count: Optional[int] = None
+    chunks_added: Optional[int] = None
+    chunks_kept: Optional[int] = None
+    chunks_deleted: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        """Config for IngestionJobResponse"""
+        from_attributes = True
+
+class EmbeddingModelResponse(BaseModel):
+    """Schema for a loaded embedding model response"""
+    model_name: str
+    quantized: bool = False
+    device: str
+    memory_bytes: int
+    load_seconds: float
+    loaded_at: datetime
+
+    class Config:
+        """Config for EmbeddingModelResponse"""
+        protected_namespaces = ()
+
+class EmbeddingCacheStatsResponse(BaseModel):
+    """Schema for the embedding cache statistics response"""
+    memory_hits: int
+    memory_misses: int
+    memory_entries: int
+    memory_size_bytes: int
+    disk_hits: int
+    disk_misses: int
+    disk_entries: int
+    disk_size_bytes: int
+    hit_rate: float
+
+class EmbeddingResponse(BaseModel):
+    """Schema for the embeddings of texts response"""
+    embedding_model: str
+    embeddings: List[List[float]]
+
+class EmbeddingQueueStatsResponse(BaseModel):
+    """Schema for the embedding executor queue statistics response"""
+    max_workers: int
+    max_queue_size: int
+    queue_depth: int
+    max_queue_depth: int
+    running: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    mean_wait_seconds: float
@@ -0,0 +1,106 @@
+import functools
+import json
+import threading
+import time
+
+import pika
+import pika.exceptions
+from pika.adapters.blocking_connection import BlockingChannel
+
+from core.configs import settings
+from core.db_connection import database
+from core.logger import logger
+from core.rabbitmq_connection import rabbitmq
+from services.document_management_service import document_management_service
+from services.embeddings import embedding_model_registry
+
+class DocumentIngestionWorker:
+    """
+    Worker to consume the document ingestion queue.
+    Run more processes of this worker to scale the ingestion throughput.
+    """
+    def __init__(self, queue_name: str = settings.RABBITMQ_INGESTION_QUEUE, prefetch_count: int = 1):
+        self.queue_name = queue_name
+        self.prefetch_count = prefetch_count
+
+    def run_job(self, job_id: str):
+        """
+        Run an ingestion job with its own DB session
+        :param job_id:
+        :return:
+        """
+        db = database.SessionLocal()
+        try:
+            document_management_service.process_ingestion_job(db, job_id)
+        finally:
+            db.close()
+
+    def handle_message(
+        self,
+        connection: pika.BlockingConnection,
+        channel: BlockingChannel,
+        delivery_tag: int,
+        body: bytes,
+    ):
+        """
+        Handle a single message on a separate thread, so the connection heartbeat keeps
+        running while a long document is being extracted
+        :param connection:
+        :param channel:
+        :param delivery_tag:
+        :param body:
+        :return:
+        """
+        try:
+            job_id = json.loads(body).get("job_id")
+            if job_id:
+                self.run_job(job_id)
+            else:
+                logger.warning(f"DocumentIngestionWorker: Message without job_id is dropped: {body!r}")
+        except Exception as e:
+            # The failure is recorded on the job itself, the message is not requeued to avoid poison loops
+            logger.error(f"DocumentIngestionWorker: Error handling message: {e}", exc_info=True)
+        finally:
+            connection.add_callback_threadsafe(functools.partial(channel.basic_ack, delivery_tag))
+
+    def consume(self):
+        """
+        Consume the ingestion queue until the connection is closed
+        :return:
+        """
+        connection = rabbitmq.get_connection()
+        channel = connection.channel()
+        channel.queue_declare(queue=self.queue_name, durable=True)
+        channel.basic_qos(prefetch_count=self.prefetch_count)
+
+        def on_message(ch, method, _properties, body):
+            threading.Thread(
+                target=self.handle_message,
+                args=(connection, ch, method.delivery_tag, body),
+                daemon=True,
+            ).start()
+
+        channel.basic_consume(queue=self.queue_name, on_message_callback=on_message)
+        logger.info(f"DocumentIngestionWorker: Consuming queue {self.queue_name}.")
+        try:
+            channel.start_consuming()
+        finally:
+            if connection.is_open:
+                connection.close()
+
+    def run_forever(self):
+        """
+        Consume the ingestion queue and reconnect if the connection is lost
+        :return:
+        """
+        while True:
+            try:
+                self.consume()
+            except pika.exceptions.AMQPConnectionError as e:
+                logger.error(f"DocumentIngestionWorker: Connection lost: {e}, reconnecting.", exc_info=True)
+                time.sleep(settings.RABBITMQ_WAIT_SECONDS)
+
+if __name__ == '__main__':
+    # Load the embedding models before the first job, so no job pays for the loading
+    embedding_model_registry.warmup(settings.EMBEDDING_WARMUP_MODELS, settings.EMBEDDING_QUANTIZED)
+    DocumentIngestionWorker().run_forever()
@@ -1,23 +1,65 @@
-from datetime import datetime
-from typing import List, Literal, Optional
+import asyncio
+from datetime import datetime, timedelta
+import os
+import tarfile
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+from uuid import uuid4
+import zipfile
+import zlib
 
-from openai import OpenAI
-from pdf2image import convert_from_bytes
-import pytesseract
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pika.exceptions import AMQPError
 from sqlalchemy.orm import Session
-import torch
-from tqdm import tqdm
-from transformers import BertModel, BertTokenizer
+import numpy as np
 
+from constants import general as general_constants
+from constants.services import chunking as chunking_constants
 from constants.services import document_management as document_management_constants
+from constants.services import embeddings as embeddings_constants
+from core.blob_stores import blob_store
+from core.configs import settings
+from core.db_connection import database
 from core.logger import logger
-from models import TblDocuments
-from repositories import crud_tbl_documents
+from core.rabbitmq_connection import rabbitmq
+from core.utilities import (
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    FileTooLargeError,
+    hash_and_measure_a_file,
+    spool_and_hash_a_file,
+)
+from models import TblDocumentContents, TblDocuments, TblIngestionJobs
+from repositories import (
+    crud_documents_milvus,
+    crud_tbl_document_chunks,
+    crud_tbl_document_contents,
+    crud_tbl_documents,
+    crud_tbl_ingestion_jobs,
+)
 from schemas import (
     AllDocumentsResponse,
+    DocumentBulkUploadItem,
+    DocumentBulkUploadResult,
+    DocumentChunksSchema,
+    DocumentContentsUpdateSchema,
+    DocumentExtractionResult,
+    DocumentsPageResponse,
     DocumentsSchema,
+    IngestionJobResponse,
+    IngestionJobsSchema,
+    IngestionJobsUpdateSchema,
+    MilvusDocumentsSchema,
+)
+from services.embeddings import (
+    BertEncoder,
+    embedding_cache,
+    embedding_executor,
+    get_model_key,
+    get_openai_embedder,
 )
-from services.rag import Chunking
+from services.extraction import pdf_extraction_service
+from services.rag import ChunkDiff, Chunking, diff_chunk_hashes, get_content_hash
 
 class DocumentManagementService:
     """
@@ -38,16 +80,7 @@ class DocumentManagementService:
             responses_from_crud = crud_tbl_documents.get_all()
         elif limit > 0 and page > 0:
             responses_from_crud = crud_tbl_documents.get_all_limited(db, limit, page)
-        responses = [AllDocumentsResponse(
-            id=resp.id,
-            document_name=resp.document_name,
-            document_type=resp.document_type,
-            document_description=resp.document_description,
-            document_hash=resp.document_hash,
-            is_uploaded=resp.is_uploaded,
-            uploader_id=resp.uploader_id,
-            uploaded_at=resp.uploaded_at,
-        ) for resp in responses_from_crud]
+        responses = [AllDocumentsResponse.model_validate(resp) for resp in responses_from_crud]
         return responses
 
     def get_uploaded_documents_by_uploader(
@@ -67,19 +100,48 @@ class DocumentManagementService:
         elif limit > 0 and page > 0:
             responses_from_crud = crud_tbl_documents.get_all_limited_by_uploader_id(db, uploader_id, limit, page)
 
-        responses = [AllDocumentsResponse(
-            id=resp.id,
-            document_name=resp.document_name,
-            document_type=resp.document_type,
-            document_description=resp.document_description,
-            document_hash=resp.document_hash,
-            is_uploaded=resp.is_uploaded,
-            uploader_id=resp.uploader_id,
-            uploaded_at=resp.uploaded_at,
-        ) for resp in responses_from_crud]
+        responses = [AllDocumentsResponse.model_validate(resp) for resp in responses_from_crud]
 
         return responses
 
+    def get_documents_page(
+        self,
+        db: Session,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        uploader_id: Optional[int] = None,
+    )->DocumentsPageResponse:
+        """
+        Function to get a page of documents, newest first, with keyset pagination
+        :param db:
+        :param limit:
+        :param cursor: next_cursor of the previous page, None for the first page
+        :param with_total: also count all the documents, it costs an extra query
+        :param uploader_id: only the documents of this uploader if given
+        :return:
+        :raises ValueError: if the cursor is malformed
+        """
+        limit = max(1, min(limit, document_management_constants.DOCUMENTS_PAGE_MAX_LIMIT))
+        decoded_cursor = decode_keyset_cursor(cursor) if cursor else None
+        # One extra row tells whether there is a next page
+        rows = crud_tbl_documents.get_listing_page(
+            db,
+            limit + 1,
+            cursor=decoded_cursor,
+            uploader_id=uploader_id,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_keyset_cursor(rows[-1].uploaded_at, rows[-1].id)
+
+        return DocumentsPageResponse(
+            items=[AllDocumentsResponse.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+            total=crud_tbl_documents.count_listing(db, uploader_id) if with_total else None,
+        )
+
     def upload_source_document(
         self,
         db: Session,
@@ -88,11 +150,14 @@ class DocumentManagementService:
         document_type: str,
         document_hash: str,
         uploader_id: int,
-        the_document: bytes,
-    )->TblDocuments:
+        the_document: BinaryIO,
+    )->Tuple[TblDocuments, TblIngestionJobs]:
         """
-        Function to upload a source document
-        :param the_document:
+        Function to upload a source document.
+        The document is persisted and an ingestion job is enqueued, the extraction
+        and chunking are done by the ingestion worker. A document whose content is
+        already ingested or being ingested is linked to that content instead.
+        :param the_document: file object of the document, streamed into the blob store
         :param uploader_id:
         :param document_hash:
         :param document_type:
@@ -101,6 +166,12 @@ class DocumentManagementService:
         :param db:
         :return:
         """
+        blob_key = blob_store.put(document_hash, the_document)
+        document_content, is_new_content = crud_tbl_document_contents.get_or_create_by_hash(
+            db,
+            document_hash,
+            status=document_management_constants.CONTENT_STATUS_PENDING,
+        )
         # Insert the document to the database
         inserted_document = DocumentsSchema(
             document_name=document_name,
@@ -110,21 +181,736 @@ class DocumentManagementService:
             is_uploaded=True,
             uploader_id=uploader_id,
             uploaded_at=datetime.now(),
-            the_document=the_document
+            blob_key=blob_key,
+            content_id=document_content.id,
         )
         uploaded_document = crud_tbl_documents.create(db, inserted_document)
+        ingestion_job = self.schedule_ingestion(db, uploaded_document.id, document_content, is_new_content)
+
+        return uploaded_document, ingestion_job
+
+    def replace_source_document(
+        self,
+        db: Session,
+        document_id: int,
+        document_hash: str,
+        the_document: BinaryIO,
+    )->Optional[Tuple[TblDocuments, TblIngestionJobs]]:
+        """
+        Function to replace the file of a document, e.g. a corrected regulation.
+        The ingestion job of the new content is diffed against the chunks of the replaced
+        content, so only the changed chunks are embedded.
+        :param db:
+        :param document_id:
+        :param document_hash:
+        :param the_document: file object of the new document, streamed into the blob store
+        :return: None if the document is not found
+        """
+        uploaded_document = crud_tbl_documents.get_by_id(db, document_id)
+        if not uploaded_document:
+            return None
+        base_content_id = uploaded_document.content_id
+        base_document_hash, base_blob_key = uploaded_document.document_hash, uploaded_document.blob_key
+
+        blob_key = blob_store.put(document_hash, the_document)
+        document_content, is_new_content = crud_tbl_document_contents.get_or_create_by_hash(
+            db,
+            document_hash,
+            status=document_management_constants.CONTENT_STATUS_PENDING,
+        )
+        uploaded_document = crud_tbl_documents.update(db, uploaded_document, {
+            "document_hash": document_hash,
+            "blob_key": blob_key,
+            "content_id": document_content.id,
+            "uploaded_at": datetime.now(),
+        })
+        self.release_unlinked_blob(db, base_document_hash, base_blob_key)
+        ingestion_job = self.schedule_ingestion(
+            db,
+            uploaded_document.id,
+            document_content,
+            is_new_content,
+            base_content_id=base_content_id,
+        )
+        if ingestion_job.status == document_management_constants.JOB_STATUS_DEDUPLICATED:
+            self.release_base_content(db, ingestion_job, document_content.id)
+
+        return uploaded_document, ingestion_job
+
+    def release_base_content(self, db: Session, ingestion_job: TblIngestionJobs, content_id: int):
+        """
+        Function to release the content replaced by a deduplicated ingestion job, no job diffs
+        against it, so its vectors are not used anymore once no document is linked to it
+        :param db:
+        :param ingestion_job:
+        :param content_id: content of the document of the job
+        :return:
+        """
+        if ingestion_job.base_content_id != content_id:
+            self.release_unlinked_content(db, ingestion_job.base_content_id)
+
+    def release_unlinked_content(self, db: Session, content_id: Optional[int]):
+        """
+        Function to delete the chunks and the vectors of a document content once no document is linked to it
+        :param db:
+        :param content_id:
+        :return:
+        """
+        if content_id is not None and not crud_tbl_documents.count_by_content_id(db, content_id):
+            self.release_content_chunks(db, content_id)
+
+    def release_unlinked_blob(self, db: Session, document_hash: Optional[str], blob_key: Optional[str]):
+        """
+        Function to delete the blob of a document hash once no document has that hash,
+        the deduplicated documents share one blob
+        :param db:
+        :param document_hash:
+        :param blob_key:
+        :return:
+        """
+        if document_hash and blob_key and not crud_tbl_documents.count_by_document_hash(db, document_hash):
+            blob_store.delete(blob_key)
+
+    def schedule_ingestion(
+        self,
+        db: Session,
+        document_id: int,
+        document_content: TblDocumentContents,
+        is_new_content: bool,
+        base_content_id: Optional[int] = None,
+    )->TblIngestionJobs:
+        """
+        Function to enqueue the ingestion of a document, or to record it as deduplicated when
+        its content is already ingested. While its content is being ingested by another job,
+        the job is pending until that job finishes.
+        :param db:
+        :param document_id:
+        :param document_content:
+        :param is_new_content: whether the content is created by this upload
+        :param base_content_id: content replaced by this upload, the new chunks are diffed against its chunks
+        :return:
+        """
+        is_content_abandoned = (
+            document_content.status == document_management_constants.CONTENT_STATUS_PROCESSING
+            and crud_tbl_document_contents.is_claim_stale(document_content, self.get_claim_stale_before())
+        )
+        if is_new_content or is_content_abandoned or document_content.status in [
+            document_management_constants.CONTENT_STATUS_PENDING,
+            document_management_constants.CONTENT_STATUS_FAILED,
+        ]:
+            return self.enqueue_ingestion_job(db, document_id, base_content_id=base_content_id)
+
+        if document_content.status == document_management_constants.CONTENT_STATUS_PROCESSING:
+            logger.info(
+                f"schedule_ingestion: Document {document_id} is linked to the content "
+                f"{document_content.id} being ingested, the job waits for it."
+            )
+            ingestion_job = crud_tbl_ingestion_jobs.create(db, IngestionJobsSchema(
+                job_id=uuid4().hex,
+                document_id=document_id,
+                status=document_management_constants.JOB_STATUS_PENDING,
+                base_content_id=base_content_id,
+                created_at=datetime.now(),
+            ))
+            return self.wait_for_content(db, ingestion_job, document_content)
+
+        logger.info(
+            f"schedule_ingestion: Document {document_id} is linked to the "
+            f"{document_content.status} content {document_content.id}, ingestion skipped."
+        )
+        return crud_tbl_ingestion_jobs.create(db, IngestionJobsSchema(
+            job_id=uuid4().hex,
+            document_id=document_id,
+            status=document_management_constants.JOB_STATUS_DEDUPLICATED,
+            chunk_count=document_content.chunk_count,
+            base_content_id=base_content_id,
+            created_at=datetime.now(),
+            finished_at=datetime.now(),
+        ))
+
+    def get_claim_stale_before(self)->datetime:
+        """
+        Function to get the time before which the claim of a processing content is abandoned
+        :return:
+        """
+        return datetime.now() - timedelta(seconds=settings.INGESTION_CLAIM_TIMEOUT_SECONDS)
+
+    def upload_bulk_document(
+        self,
+        uploader_id: int,
+        file_name: str,
+        document_metadata: DocumentBulkUploadItem,
+        the_document: BinaryIO,
+        document_hash: str,
+        document_size: int,
+    )->DocumentBulkUploadResult:
+        """
+        Function to upload a single file of a bulk upload with its own DB session,
+        so the files of a bulk upload can be uploaded concurrently
+        :param uploader_id:
+        :param file_name:
+        :param document_metadata:
+        :param the_document:
+        :param document_hash:
+        :param document_size:
+        :return:
+        """
+        db = database.SessionLocal()
+        try:
+            uploaded_document, ingestion_job = self.upload_source_document(
+                db=db,
+                document_name=document_metadata.document_name,
+                document_description=document_metadata.document_description,
+                document_type=document_metadata.document_type,
+                document_hash=document_hash,
+                uploader_id=uploader_id,
+                the_document=the_document,
+            )
+            return DocumentBulkUploadResult(
+                file_name=file_name,
+                document_hash=document_hash,
+                document_size=document_size,
+                document_id=uploaded_document.id,
+                job_id=ingestion_job.job_id,
+                job_status=ingestion_job.status,
+            )
+        except Exception as e:
+            logger.error(f"upload_bulk_document: Error uploading {file_name}: {e}", exc_info=True)
+            db.rollback()
+            return DocumentBulkUploadResult(
+                file_name=file_name,
+                document_hash=document_hash,
+                document_size=document_size,
+                error=document_management_constants.ERR_BULK_UPLOAD_FAILED,
+            )
+        finally:
+            db.close()
+
+    def read_bulk_document(
+        self,
+        document_files: Iterator[Tuple[str, BinaryIO]],
+        is_spooled: bool,
+        archive_name: Optional[str] = None,
+    )->Optional[Tuple[str, Optional[BinaryIO], Optional[str], Optional[int], Optional[str]]]:
+        """
+        Function to read the next file of a bulk upload, hashing and measuring it in one pass.
+        Streams, e.g. archive members, are spooled while they are hashed.
+        :param document_files: iterator of (file name, file object)
+        :param is_spooled: the file objects are already spooled and seekable, e.g. UploadFile
+        :param archive_name: file name of the archive the files are read from, if any
+        :return: tuple of (file name, file, hash, size, error), None when there is no file left
+        """
+        try:
+            next_document_file = next(document_files, None)
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile, zlib.error) as e:
+            # A generator is exhausted once it raises, the next read ends the bulk upload
+            logger.error(f"read_bulk_document: Error reading the archive {archive_name}: {e}")
+            return archive_name or "", None, None, None, document_management_constants.ERR_BULK_ARCHIVE_UNREADABLE
+        if next_document_file is None:
+            return None
+        file_name, document_file = next_document_file
+        try:
+            if is_spooled:
+                document_hash, document_size = hash_and_measure_a_file(
+                    document_file,
+                    settings.MAX_UPLOAD_SIZE_BYTES,
+                )
+            else:
+                document_file, document_hash, document_size = spool_and_hash_a_file(
+                    document_file,
+                    settings.MAX_UPLOAD_SIZE_BYTES,
+                )
+        except FileTooLargeError:
+            return file_name, None, None, None, document_management_constants.ERR_BULK_DOCUMENT_TOO_LARGE
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile, zlib.error) as e:
+            logger.error(f"read_bulk_document: Error reading {file_name}: {e}")
+            return file_name, None, None, None, document_management_constants.ERR_BULK_DOCUMENT_UNREADABLE
+        return file_name, document_file, document_hash, document_size, None
+
+    async def bulk_upload_source_documents(
+        self,
+        uploader_id: int,
+        manifest: Dict[str, DocumentBulkUploadItem],
+        document_files: Iterable[Tuple[str, BinaryIO]],
+        is_spooled: bool = True,
+        max_parallelism: int = settings.BULK_UPLOAD_MAX_PARALLELISM,
+        archive_name: Optional[str] = None,
+    )->List[DocumentBulkUploadResult]:
+        """
+        Function to upload many documents concurrently, at most max_parallelism at a time.
+        The files are read one by one, as archive members must be, and each one is uploaded
+        on the threadpool while the next one is read.
+        :param uploader_id:
+        :param manifest: metadata of the documents keyed by file name, archive members are matched
+            by their path in the archive or by their base name
+        :param document_files: iterable of (file name, file object)
+        :param is_spooled: the file objects are already spooled and seekable, e.g. UploadFile
+        :param max_parallelism:
+        :param archive_name: file name of the archive the files are read from, if any
+        :return: a result per file, in the order of document_files
+        """
+        semaphore = asyncio.Semaphore(max_parallelism)
+        results: List[Union[DocumentBulkUploadResult, asyncio.Task]] = []
+        document_files_iterator = iter(document_files)
+
+        async def upload_and_release(*upload_args)->DocumentBulkUploadResult:
+            try:
+                return await run_in_threadpool(self.upload_bulk_document, *upload_args)
+            finally:
+                semaphore.release()
+                if not is_spooled:
+                    upload_args[3].close()
+
+        try:
+            while True:
+                await semaphore.acquire()
+                bulk_document = await run_in_threadpool(
+                    self.read_bulk_document,
+                    document_files_iterator,
+                    is_spooled,
+                    archive_name,
+                )
+                if bulk_document is None:
+                    semaphore.release()
+                    break
+                file_name, document_file, document_hash, document_size, error = bulk_document
+                document_metadata = manifest.get(file_name) or manifest.get(os.path.basename(file_name))
+                if error is None and document_metadata is None:
+                    error = document_management_constants.ERR_NO_MANIFEST_ENTRY
+                if error is not None:
+                    semaphore.release()
+                    if document_file is not None and not is_spooled:
+                        document_file.close()
+                    results.append(DocumentBulkUploadResult(
+                        file_name=file_name,
+                        document_hash=document_hash,
+                        document_size=document_size,
+                        error=error,
+                    ))
+                    continue
+                results.append(asyncio.create_task(upload_and_release(
+                    uploader_id,
+                    file_name,
+                    document_metadata,
+                    document_file,
+                    document_hash,
+                    document_size,
+                )))
+        finally:
+            # The uploads already started are finished even if reading the next file fails
+            await asyncio.gather(
+                *(result for result in results if isinstance(result, asyncio.Task)),
+                return_exceptions=True,
+            )
+
+        return [result.result() if isinstance(result, asyncio.Task) else result for result in results]
+
+    def enqueue_ingestion_job(
+        self,
+        db: Session,
+        document_id: int,
+        base_content_id: Optional[int] = None,
+    )->TblIngestionJobs:
+        """
+        Function to create an ingestion job and publish it to the ingestion queue
+        :param db:
+        :param document_id:
+        :param base_content_id: content replaced by the document, the new chunks are diffed against its chunks
+        :return:
+        """
+        ingestion_job = crud_tbl_ingestion_jobs.create(db, IngestionJobsSchema(
+            job_id=uuid4().hex,
+            document_id=document_id,
+            status=document_management_constants.JOB_STATUS_QUEUED,
+            base_content_id=base_content_id,
+            created_at=datetime.now(),
+        ))
+        try:
+            rabbitmq.publish(
+                settings.RABBITMQ_INGESTION_QUEUE,
+                {"job_id": ingestion_job.job_id},
+            )
+        except AMQPError as e:
+            logger.error(
+                f"enqueue_ingestion_job: [JobId: {ingestion_job.job_id}] Error publishing the job: {e}",
+                exc_info=True
+            )
+            crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+                status=document_management_constants.JOB_STATUS_FAILED,
+                error_message=document_management_constants.ERR_ENQUEUE_INGESTION_JOB,
+                finished_at=datetime.now(),
+            ))
+            raise HTTPException(
+                status_code=general_constants.HTTP_STATUS_INTERNAL_SERVER_ERROR,
+                detail=document_management_constants.ERR_ENQUEUE_INGESTION_JOB,
+            )
+        return ingestion_job
+
+    def get_ingestion_job(self, db: Session, job_id: str)->Optional[IngestionJobResponse]:
+        """
+        Function to get the status of an ingestion job
+        :param db:
+        :param job_id:
+        :return:
+        """
+        ingestion_job = crud_tbl_ingestion_jobs.get_by_job_id(db, job_id)
+        if ingestion_job:
+            return IngestionJobResponse.model_validate(ingestion_job)
 
-        extracted_text = self.pdf_extractor(the_document)
+    def process_ingestion_job(self, db: Session, job_id: str)->Optional[TblIngestionJobs]:
+        """
+        Function to run an ingestion job, called by the ingestion worker
+        :param db:
+        :param job_id:
+        :return:
+        """
+        ingestion_job = crud_tbl_ingestion_jobs.get_by_job_id(db, job_id)
+        if not ingestion_job:
+            logger.warning(f"process_ingestion_job: [JobId: {job_id}] Job not found, skipped.")
+            return None
+        if ingestion_job.status == document_management_constants.JOB_STATUS_COMPLETED:
+            logger.info(f"process_ingestion_job: [JobId: {job_id}] Job already completed, skipped.")
+            return ingestion_job
+
+        uploaded_document = crud_tbl_documents.get_by_id(db, ingestion_job.document_id)
+        document_content = uploaded_document.content if uploaded_document else None
+        if not document_content:
+            logger.error(f"process_ingestion_job: [JobId: {job_id}] Document or its content is not found.")
+            return crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+                status=document_management_constants.JOB_STATUS_FAILED,
+                error_message=document_management_constants.ERR_CONTENT_NOT_FOUND,
+                finished_at=datetime.now(),
+            ))
+
+        # Only one worker ingests a content, the other jobs of the same content wait for it
+        is_claimed = crud_tbl_document_contents.claim(
+            db,
+            document_content.id,
+            job_id,
+            from_statuses=[
+                document_management_constants.CONTENT_STATUS_PENDING,
+                document_management_constants.CONTENT_STATUS_FAILED,
+            ],
+            to_status=document_management_constants.CONTENT_STATUS_PROCESSING,
+            stale_before=self.get_claim_stale_before(),
+        )
+        if not is_claimed:
+            db.refresh(document_content)
+            if document_content.status != document_management_constants.CONTENT_STATUS_COMPLETED:
+                logger.info(
+                    f"process_ingestion_job: [JobId: {job_id}] Content {document_content.id} is "
+                    f"{document_content.status}, the job waits for it."
+                )
+                ingestion_job = crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+                    status=document_management_constants.JOB_STATUS_PENDING,
+                ))
+                return self.wait_for_content(db, ingestion_job, document_content)
+            logger.info(
+                f"process_ingestion_job: [JobId: {job_id}] Content {document_content.id} is "
+                f"{document_content.status}, ingestion skipped."
+            )
+            ingestion_job = crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+                status=document_management_constants.JOB_STATUS_DEDUPLICATED,
+                chunk_count=document_content.chunk_count,
+                finished_at=datetime.now(),
+            ))
+            self.release_base_content(db, ingestion_job, document_content.id)
+            return ingestion_job
+
+        crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+            status=document_management_constants.JOB_STATUS_PROCESSING,
+            error_message=None,
+            started_at=datetime.now(),
+        ))
+        try:
+            with blob_store.local_path(uploaded_document.blob_key) as document_path:
+                extracted_text, text_chunks = self.ingest_document(
+                    document_path,
+                    document_hash=uploaded_document.document_hash,
+                )
+            chunk_diff = self.index_content_chunks(
+                db,
+                document_content,
+                text_chunks,
+                base_content_id=ingestion_job.base_content_id,
+            )
+        except Exception as e:
+            logger.error(f"process_ingestion_job: [JobId: {job_id}] Error: {e}", exc_info=True)
+            db.rollback()
+            crud_tbl_document_contents.update_content(db, document_content, DocumentContentsUpdateSchema(
+                status=document_management_constants.CONTENT_STATUS_FAILED,
+            ))
+            self.finish_pending_jobs(db, document_content)
+            return crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+                status=document_management_constants.JOB_STATUS_FAILED,
+                error_message=str(e),
+                finished_at=datetime.now(),
+            ))
+
+        crud_tbl_document_contents.update_content(db, document_content, DocumentContentsUpdateSchema(
+            status=document_management_constants.CONTENT_STATUS_COMPLETED,
+            extracted_text=extracted_text,
+            chunk_count=len(text_chunks),
+            ingested_at=datetime.now(),
+        ))
+        self.finish_pending_jobs(db, document_content)
+        return crud_tbl_ingestion_jobs.update_status(db, ingestion_job, IngestionJobsUpdateSchema(
+            status=document_management_constants.JOB_STATUS_COMPLETED,
+            chunk_count=len(text_chunks),
+            chunks_added=len(chunk_diff.added),
+            chunks_kept=len(chunk_diff.kept),
+            chunks_deleted=len(chunk_diff.deleted),
+            finished_at=datetime.now(),
+        ))
+
+    def wait_for_content(
+        self,
+        db: Session,
+        ingestion_job: TblIngestionJobs,
+        document_content: TblDocumentContents,
+    )->TblIngestionJobs:
+        """
+        Function to leave a pending job to the job ingesting its content, or to finish it at once
+        when that job finished before the pending job was recorded
+        :param db:
+        :param ingestion_job: pending job
+        :param document_content:
+        :return:
+        """
+        db.refresh(document_content)
+        if document_content.status != document_management_constants.CONTENT_STATUS_PROCESSING:
+            self.finish_pending_jobs(db, document_content)
+            db.refresh(ingestion_job)
+        return ingestion_job
+
+    def finish_pending_jobs(self, db: Session, document_content: TblDocumentContents):
+        """
+        Function to finish the jobs waiting for the ingestion of a content, once it is completed
+        or failed: deduplicated when it is completed, failed otherwise
+        :param db:
+        :param document_content:
+        :return:
+        """
+        is_completed = document_content.status == document_management_constants.CONTENT_STATUS_COMPLETED
+        pending_jobs = crud_tbl_ingestion_jobs.get_all_by_content_id(
+            db,
+            document_content.id,
+            status=document_management_constants.JOB_STATUS_PENDING,
+        )
+        for pending_job in pending_jobs:
+            if is_completed:
+                pending_job = crud_tbl_ingestion_jobs.update_status(db, pending_job, IngestionJobsUpdateSchema(
+                    status=document_management_constants.JOB_STATUS_DEDUPLICATED,
+                    chunk_count=document_content.chunk_count,
+                    finished_at=datetime.now(),
+                ))
+                self.release_base_content(db, pending_job, document_content.id)
+            else:
+                crud_tbl_ingestion_jobs.update_status(db, pending_job, IngestionJobsUpdateSchema(
+                    status=document_management_constants.JOB_STATUS_FAILED,
+                    error_message=document_management_constants.ERR_CONTENT_INGESTION_FAILED,
+                    finished_at=datetime.now(),
+                ))
+        if pending_jobs:
+            logger.info(
+                f"finish_pending_jobs: Content {document_content.id} is {document_content.status}, "
+                f"{len(pending_jobs)} waiting jobs finished."
+            )
+
+    def index_content_chunks(
+        self,
+        db: Session,
+        document_content: TblDocumentContents,
+        text_chunks: List[str],
+        base_content_id: Optional[int] = None,
+    )->ChunkDiff:
+        """
+        Function to index the chunks of a document content in Milvus, diffed by content hash
+        against its stored chunks, and against the chunks of the content it replaces when no
+        other document is linked to that one. Only the added chunks are embedded and inserted,
+        only the vanished chunks are deleted, the kept chunks keep their vectors.
+        :param db:
+        :param document_content:
+        :param text_chunks:
+        :param base_content_id: content replaced by the document
+        :return: the difference between the stored and the new chunks
+        """
+        stored_chunks = crud_tbl_document_chunks.get_all_by_content_id(db, document_content.id)
+        is_base_content_moved = (
+            base_content_id is not None
+            and base_content_id != document_content.id
+            and not crud_tbl_documents.count_by_content_id(db, base_content_id)
+        )
+        if is_base_content_moved:
+            stored_chunks += crud_tbl_document_chunks.get_all_by_content_id(db, base_content_id)
+        chunk_hashes = [get_content_hash(text_chunk) for text_chunk in text_chunks]
+        chunk_diff = diff_chunk_hashes([stored_chunk.chunk_hash for stored_chunk in stored_chunks], chunk_hashes)
+
+        # Insert before deleting, a failure leaves unused vectors rather than missing ones
+        vector_ids: List[int] = []
+        if chunk_diff.added:
+            added_texts = [text_chunks[new_index] for new_index in chunk_diff.added]
+            vector_ids = crud_documents_milvus.bulk_insert_vector([
+                MilvusDocumentsSchema(
+                    content_id=document_content.id,
+                    text=added_text,
+                    dense_embedding=dense_embedding.tolist(),
+                )
+                for added_text, dense_embedding in zip(added_texts, self.embed_texts(added_texts))
+            ])
+        kept_chunks = [(stored_chunks[stored_index], new_index) for stored_index, new_index in chunk_diff.kept]
+        moved_vector_ids: Dict[int, int] = {}
+        if is_base_content_moved:
+            # The vectors of the kept chunks of the replaced content map to that content in Milvus
+            moved_vector_ids = crud_documents_milvus.copy_vectors([
+                stored_chunk.vector_id for stored_chunk, _ in kept_chunks
+                if stored_chunk.content_id == base_content_id and stored_chunk.vector_id is not None
+            ], document_content.id)
+            for stored_chunk, _ in kept_chunks:
+                stored_chunk.vector_id = moved_vector_ids.get(stored_chunk.vector_id, stored_chunk.vector_id)
+        deleted_chunks = [stored_chunks[stored_index] for stored_index in chunk_diff.deleted]
+        crud_tbl_document_chunks.apply_diff(
+            db,
+            document_content.id,
+            kept_chunks=kept_chunks,
+            added_chunks=[
+                DocumentChunksSchema(
+                    content_id=document_content.id,
+                    chunk_index=new_index,
+                    chunk_hash=chunk_hashes[new_index],
+                    vector_id=vector_id,
+                )
+                for new_index, vector_id in zip(chunk_diff.added, vector_ids)
+            ],
+            deleted_chunks=deleted_chunks,
+        )
+        deleted_vector_ids = [chunk.vector_id for chunk in deleted_chunks if chunk.vector_id is not None]
+        deleted_vector_ids += list(moved_vector_ids)
+        if deleted_vector_ids:
+            crud_documents_milvus.delete_vectors(deleted_vector_ids)
+        if is_base_content_moved:
+            # The chunks of the replaced content are moved, it is ingested again if it is uploaded again
+            self.reset_content(db, base_content_id)
+
+        logger.info(
+            f"index_content_chunks: Content {document_content.id}: {len(chunk_diff.added)} chunks added, "
+            f"{len(chunk_diff.kept)} kept, {len(chunk_diff.deleted)} deleted."
+        )
+        return chunk_diff
+
+    def recreate_vector_collection(self, db: Session)->List[TblIngestionJobs]:
+        """
+        Function to recreate the Milvus collection with the EMBEDDING_DIMENSIONS and the
+        EMBEDDING_VECTOR_PRECISION, e.g. after changing them, and to ingest every content again
+        :param db:
+        :return: the ingestion jobs enqueued, one per content
+        """
+        crud_documents_milvus.recreate_collection()
+        documents_by_content_id: Dict[int, TblDocuments] = {}
+        for uploaded_document in crud_tbl_documents.get_all(db):
+            if uploaded_document.content_id is not None:
+                documents_by_content_id.setdefault(uploaded_document.content_id, uploaded_document)
+        for document_content in crud_tbl_document_contents.get_all(db):
+            # The vectors of the chunks are dropped with the collection
+            crud_tbl_document_chunks.delete_all_by_content_id(db, document_content.id)
+            self.reset_content(db, document_content.id)
+
+        ingestion_jobs = [
+            self.enqueue_ingestion_job(db, uploaded_document.id)
+            for uploaded_document in documents_by_content_id.values()
+        ]
+        logger.info(
+            f"recreate_vector_collection: Collection {crud_documents_milvus.collection_name} recreated with "
+            f"{settings.EMBEDDING_DIMENSIONS} {settings.EMBEDDING_VECTOR_PRECISION} dimensions, "
+            f"{len(ingestion_jobs)} ingestion jobs enqueued."
+        )
+        return ingestion_jobs
+
+    def release_content_chunks(self, db: Session, content_id: int):
+        """
+        Function to delete the chunks and the vectors of a document content no document is linked to
+        :param db:
+        :param content_id:
+        :return:
+        """
+        deleted_chunks = crud_tbl_document_chunks.delete_all_by_content_id(db, content_id)
+        deleted_vector_ids = [chunk.vector_id for chunk in deleted_chunks if chunk.vector_id is not None]
+        if deleted_vector_ids:
+            crud_documents_milvus.delete_vectors(deleted_vector_ids)
+        self.reset_content(db, content_id)
+
+    def reset_content(self, db: Session, content_id: int):
+        """
+        Function to mark a document content without chunks as pending
+        :param db:
+        :param content_id:
+        :return:
+        """
+        document_content = crud_tbl_document_contents.get_by_id(db, content_id)
+        if document_content:
+            crud_tbl_document_contents.update_content(db, document_content, DocumentContentsUpdateSchema(
+                status=document_management_constants.CONTENT_STATUS_PENDING,
+                chunk_count=None,
+            ))
+
+    def embed_texts(self, texts: List[str])->np.ndarray:
+        """
+        Function to embed the texts of chunks with the EMBEDDING_MODEL
+        :param texts:
+        :return: float32 (n_texts, dim) matrix
+        """
+        return self.get_dense_vectors_from_texts(
+            texts,
+            settings.EMBEDDING_MODEL,  # type: ignore
+            settings.OPENAI_API_KEY,
+        )
+
+    def ingest_document(
+        self,
+        the_document: Union[bytes, str],
+        document_hash: Optional[str] = None,
+    )->Tuple[str, List[str]]:
+        """
+        Function to extract and chunk a source document
+        :param the_document: bytes or path of the document
+        :param document_hash: SHA-256 of the document, the key of its OCR cache entries
+        :return: tuple of (extracted text, text chunks)
+        """
+        extracted_text = self.pdf_extractor_pages(
+            the_document,
+            parallel=settings.OCR_PARALLEL,
+            text_layer_first=settings.PDF_TEXT_LAYER_FIRST,
+            streaming=settings.OCR_STREAMING,
+            document_hash=document_hash,
+        ).get_full_text()
         # Optionally, you can use Chunking to split the text into smaller parts
         chunker = Chunking(extracted_text)
-        text_chunks = chunker.recursive_chunking(
-            chunk_size=1000,
-            chunk_overlap=200,
-        )
+        if settings.CHUNKING_STRATEGY == chunking_constants.CHUNKING_STRATEGY_LEGAL_STRUCTURE:
+            # The hierarchy path is kept in the chunk text, so the chunk keeps its context when retrieved
+            text_chunks = [
+                legal_chunk.get_text_with_hierarchy()
+                for legal_chunk in chunker.iter_legal_structure_based(
+                    max_chunk_size=settings.LEGAL_CHUNK_MAX_SIZE,
+                    with_hierarchy=True,
+                )
+            ]
+        elif settings.CHUNKING_STRATEGY == chunking_constants.CHUNKING_STRATEGY_TOKEN:
+            text_chunks = chunker.token_based(
+                max_tokens=settings.CHUNK_MAX_TOKENS,
+                overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+                model_name=settings.CHUNK_TOKENIZER_MODEL,
+            )
+        elif settings.CHUNKING_STRATEGY == chunking_constants.CHUNKING_STRATEGY_RECURSIVE:
+            text_chunks = chunker.recursive_chunking(
+                chunk_size=1000,
+                chunk_overlap=200,
+            )
+        else:
+            raise ValueError(f"Unsupported chunking strategy: {settings.CHUNKING_STRATEGY}")
         logger.info(f"Number of text chunks: {len(text_chunks)}")
         logger.info(f"Text chunks: {text_chunks}")
 
-        return uploaded_document
+        return extracted_text, text_chunks
 
     def delete_document(self, db: Session, document_id: int)->Optional[AllDocumentsResponse]:
         """
@@ -135,6 +921,8 @@ class DocumentManagementService:
         """
         response_in_db = crud_tbl_documents.delete_by_id(db, document_id)
         if response_in_db:
+            self.release_unlinked_content(db, response_in_db.content_id)
+            self.release_unlinked_blob(db, response_in_db.document_hash, response_in_db.blob_key)
             return AllDocumentsResponse(
                 id=response_in_db.id,
                 document_name=response_in_db.document_name,
@@ -146,6 +934,25 @@ class DocumentManagementService:
                 uploaded_at=response_in_db.uploaded_at,
             )
 
+    def get_document_download(
+        self,
+        db: Session,
+        document_id: int,
+    )->Optional[Tuple[TblDocuments, Iterator[bytes]]]:
+        """
+        Function to stream a document from the blob store
+        :param db:
+        :param document_id:
+        :return: tuple of (document, iterator of the document chunks)
+        """
+        uploaded_document = crud_tbl_documents.get_by_id(db, document_id)
+        if not uploaded_document or not uploaded_document.blob_key:
+            return None
+        if not blob_store.exists(uploaded_document.blob_key):
+            logger.error(f"get_document_download: Blob {uploaded_document.blob_key} of document {document_id} is missing.")
+            return None
+        return uploaded_document, blob_store.iter_chunks(uploaded_document.blob_key)
+
     def bulk_delete_document(self, db: Session, document_ids: List[int])->List[AllDocumentsResponse]:
         """
         Function to bulk delete documents
@@ -154,6 +961,10 @@ class DocumentManagementService:
         :return:
         """
         response_in_db = crud_tbl_documents.bulk_delete(db, document_ids)
+        for content_id in {resp.content_id for resp in response_in_db}:
+            self.release_unlinked_content(db, content_id)
+        for document_hash, blob_key in {(resp.document_hash, resp.blob_key) for resp in response_in_db}:
+            self.release_unlinked_blob(db, document_hash, blob_key)
         responses = [AllDocumentsResponse(
             id=resp.id,
             document_name=resp.document_name,
@@ -166,33 +977,69 @@ class DocumentManagementService:
         ) for resp in response_in_db]
         return responses
 
-    def pdf_extractor(self, the_document: bytes)->str:
+    def pdf_extractor(
+        self,
+        the_document: Union[bytes, str],
+        parallel: bool = False,
+        text_layer_first: bool = True,
+        streaming: bool = True,
+    )->str:
         """
         Function to extract text from a PDF document
-        :param the_document:
+        :param the_document: bytes or path of the PDF document
+        :param parallel: OCR the pages on a process pool sized to the host
+        :param text_layer_first: use the embedded text layer, OCR only the pages without a usable one
+        :param streaming: rasterize the OCR pages in bounded windows instead of all at once
         :return:
         """
         try:
-            # Convert PDF to a list of PIL images for each page
-            # Because not all PDFs are text-based, we need to convert them to images
-            images = convert_from_bytes(the_document)
-
-            # Use pytesseract to extract text from each image
-            extracted_text = ""
-            page_number = 1
-            image_processor_pgb = tqdm(images)
-            for image in image_processor_pgb:
-                text = pytesseract.image_to_string(image)
-                extracted_text += text + "\n"  # Append the text with a new line
-                image_processor_pgb.set_description(f"Processing page {page_number}")
-                page_number += 1
-
-            return extracted_text.strip()  # Return the full extracted text
+            extraction_result = self.pdf_extractor_pages(
+                the_document,
+                parallel=parallel,
+                text_layer_first=text_layer_first,
+                streaming=streaming,
+            )
+            return extraction_result.get_full_text()  # Return the full extracted text
         except Exception as e:
             # Handle exceptions (e.g., logging, custom exceptions, etc.)
             print(f"Error during PDF processing: {e}")
             return ""
 
+    def pdf_extractor_pages(
+        self,
+        the_document: Union[bytes, str],
+        parallel: bool = False,
+        text_layer_first: bool = True,
+        streaming: bool = True,
+        document_hash: Optional[str] = None,
+    )->DocumentExtractionResult:
+        """
+        Function to extract text from a PDF document, with the text, extraction method and timing of every page
+        :param the_document: bytes or path of the PDF document
+        :param parallel: OCR the pages on a process pool sized to the host
+        :param text_layer_first: use the embedded text layer, OCR only the pages without a usable one
+        :param streaming: rasterize the OCR pages in bounded windows instead of all at once
+        :param document_hash: SHA-256 of the PDF document for the OCR cache, computed if None
+        :return:
+        """
+        extraction_result = pdf_extraction_service.extract_pages(
+            the_document,
+            parallel=parallel,
+            text_layer_first=text_layer_first,
+            streaming=streaming,
+            document_hash=document_hash,
+        )
+        for page in extraction_result.pages:
+            logger.info(
+                f"pdf_extractor_pages: Page {page.page_number} extracted by {page.method} "
+                f"in {page.elapsed_seconds:.3f}s"
+            )
+        logger.info(
+            f"pdf_extractor_pages: {len(extraction_result.pages)} pages extracted "
+            f"in {extraction_result.elapsed_seconds:.3f}s"
+        )
+        return extraction_result
+
     def bert_encode(
         self,
         text: str,
@@ -202,23 +1049,32 @@ class DocumentManagementService:
         Function to encode text using BERT
         :param text:
         :param bert_model:
-        :return:
+        :return: pooled vector of the text
         """
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        return self.bert_encode_batch([text], bert_model)[0].tolist()
 
-        # Load the BERT model and tokenizer
-        tokenizer = BertTokenizer.from_pretrained(bert_model)
-        model = BertModel.from_pretrained(bert_model)
-        model = model.to(device)
-
-        # Tokenize the text
-        inputs = tokenizer(text, return_tensors="pt").to(device)
-
-        # Disable gradient calculation
-        with torch.no_grad():
-            # Get the dense vector from the BERT model
-            outputs = model(**inputs)
-            return outputs.last_hidden_state.cpu().tolist()
+    def bert_encode_batch(
+        self,
+        texts: List[str],
+        bert_model: Literal["bert-base-uncased", "bert-large-uncased"] = "bert-base-uncased"
+    )->np.ndarray:
+        """
+        Function to encode texts using BERT in length-bucketed batches. The model is loaded once
+        per process by the registry. The vectors must have the EMBEDDING_DIMENSIONS of the Milvus collection,
+        e.g. bert-large-uncased for 1024, or a Matryoshka model truncated with EMBEDDING_MATRYOSHKA.
+        :param texts:
+        :param bert_model:
+        :return: contiguous float32 (n_texts, dim) matrix of pooled vectors
+        """
+        return BertEncoder(
+            bert_model,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_length=settings.EMBEDDING_MAX_LENGTH,
+            pooling=settings.EMBEDDING_POOLING,
+            normalize=settings.EMBEDDING_NORMALIZE,
+            quantized=settings.EMBEDDING_QUANTIZED,
+            dimensions=settings.EMBEDDING_DIMENSIONS if settings.EMBEDDING_MATRYOSHKA else None,
+        ).encode(texts)
 
     def openai_embedding(self, text: str, model: str, token: str)->List[float]:
         """
@@ -228,18 +1084,8 @@ class DocumentManagementService:
         :param text:
         :return:
         """
-        # Initialize the OpenAI API
-        openai = OpenAI(
-            api_key=token
-        )
-
-        # Get the OpenAI embedding
-        response_openai = openai.embeddings.create(
-            input=text,
-            model=model,
-            dimensions=document_management_constants.BERT_LARGE_EMBEDDING_DIM,
-        )
-        return response_openai.data[0].embedding
+        _, dimensions = self.get_embedding_cache_model(model)
+        return get_openai_embedder(token, model, dimensions).embed([text])[0].tolist()
 
     def get_dense_vector_from_text(
         self,
@@ -260,16 +1106,96 @@ class DocumentManagementService:
         :param text:
         :return:
         """
-        # Implement the logic to convert text to a dense vector
-        response_vectors = []
+        return self.get_dense_vectors_from_texts([text], embedding_model, api_key)[0].tolist()
 
+    def get_dense_vectors_from_texts(
+        self,
+        texts: List[str],
+        embedding_model: Literal[
+            "text-embedding-3-small",
+            "text-embedding-3-large",
+            "text-embedding-ada-002",
+            "bert-base-uncased",
+            "bert-large-uncased",
+        ] = "text-embedding-3-small",
+        api_key: Optional[str] = None,
+    )->np.ndarray:
+        """
+        Function to get the dense vectors of texts through the embedding cache, only the texts
+        missing from the cache are embedded
+        :param texts:
+        :param embedding_model:
+        :param api_key:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        cache_model, dimensions = self.get_embedding_cache_model(embedding_model)
+        if "bert" in embedding_model:
+            embed_function = lambda missing_texts: self.bert_encode_batch(missing_texts, embedding_model)  # type: ignore
+        else:
+            embed_function = get_openai_embedder(api_key, embedding_model, dimensions).embed  # type: ignore
+
+        if embedding_cache is None:
+            return embed_function(texts)
+        return embedding_cache.get_or_embed(cache_model, dimensions, texts, embed_function)
+
+    async def aget_dense_vectors_from_texts(
+        self,
+        texts: List[str],
+        embedding_model: Literal[
+            "text-embedding-3-small",
+            "text-embedding-3-large",
+            "text-embedding-ada-002",
+            "bert-base-uncased",
+            "bert-large-uncased",
+        ] = "text-embedding-3-small",
+        api_key: Optional[str] = None,
+    )->np.ndarray:
+        """
+        Function to get the dense vectors of texts like get_dense_vectors_from_texts, without blocking
+        the event loop: the OpenAI models are called with the async client and the BERT models run
+        on the bounded embedding executor
+        :param texts:
+        :param embedding_model:
+        :param api_key:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        :raises EmbeddingQueueFullError: if the embedding executor queue is full
+        """
+        cache_model, dimensions = self.get_embedding_cache_model(embedding_model)
         if "bert" in embedding_model:
-            response_vectors = self.bert_encode(text, embedding_model)  # type: ignore
-        elif "text-embedding" in embedding_model:
-            # Implement the logic to convert text to a dense vector
-            response_vectors = self.openai_embedding(text, embedding_model, api_key)  # type: ignore
+            async def embed_function(missing_texts: List[str])->np.ndarray:
+                return await embedding_executor.run(self.bert_encode_batch, missing_texts, embedding_model)
+        else:
+            embed_function = get_openai_embedder(api_key, embedding_model, dimensions).aembed  # type: ignore
+
+        if embedding_cache is None:
+            return await embed_function(texts)
+        return await embedding_cache.aget_or_embed(cache_model, dimensions, texts, embed_function)
 
-        return response_vectors
+    def get_embedding_cache_model(self, embedding_model: str)->Tuple[str, Optional[int]]:
+        """
+        Function to get what the vectors of an embedding model depend on, besides the text
+        :param embedding_model:
+        :return: tuple of (the model and its settings, dimensions of the vectors)
+        :raises ValueError: if the model is not supported or does not embed EMBEDDING_DIMENSIONS dimensions
+        """
+        if "bert" in embedding_model:
+            # The BERT vectors also depend on the encoder settings
+            return (
+                f"{get_model_key(embedding_model, settings.EMBEDDING_QUANTIZED)}:{settings.EMBEDDING_POOLING}:"
+                f"{settings.EMBEDDING_NORMALIZE}:{settings.EMBEDDING_MAX_LENGTH}"
+            ), settings.EMBEDDING_DIMENSIONS if settings.EMBEDDING_MATRYOSHKA else None
+        if embedding_model.startswith(embeddings_constants.OPENAI_EMBEDDING_SHORTENABLE_MODEL_PREFIX):
+            # The text-embedding-3 models shorten their vectors server-side, Matryoshka-style
+            return embedding_model, settings.EMBEDDING_DIMENSIONS
+        if embedding_model in embeddings_constants.OPENAI_EMBEDDING_FIXED_DIMENSIONS:
+            model_dimensions = embeddings_constants.OPENAI_EMBEDDING_FIXED_DIMENSIONS[embedding_model]
+            if settings.EMBEDDING_DIMENSIONS != model_dimensions:
+                raise ValueError(
+                    f"{embedding_model} embeds {model_dimensions} dimensions, "
+                    f"EMBEDDING_DIMENSIONS is {settings.EMBEDDING_DIMENSIONS}"
+                )
+            return embedding_model, None
+        raise ValueError(f"Unsupported embedding model: {embedding_model}")
 
 
 document_management_service = DocumentManagementService()
@@ -0,0 +1,18 @@
+from services.embeddings.model_registry import (
+    EmbeddingModelRegistry,
+    LoadedEmbeddingModel,
+    embedding_model_registry,
+    get_model_key,
+    quantize_model,
+)
+from services.embeddings.bert_encoder import BertEncoder, iter_length_buckets, pool_hidden_states
+from services.embeddings.quantization import ParityReport, check_quantized_parity, get_cosine_agreement
+from services.embeddings.embedding_cache import EmbeddingCache, embedding_cache, normalize_text
+from services.embeddings.embedding_executor import EmbeddingExecutor, EmbeddingQueueFullError, embedding_executor
+from services.embeddings.openai_embedder import (
+    OpenAIEmbedder,
+    get_backoff_seconds,
+    get_openai_embedder,
+    is_retryable_error,
+    iter_token_batches,
+)
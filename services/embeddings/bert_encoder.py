@@ -0,0 +1,124 @@
+from typing import Iterator, Literal, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from services.embeddings.model_registry import EmbeddingModelRegistry, embedding_model_registry
+
+PoolingType = Literal["mean", "cls"]
+
+def iter_length_buckets(lengths: Sequence[int], batch_size: int)->Iterator[np.ndarray]:
+    """
+    Function to group the inputs into batches of similar lengths, so a batch is padded to
+    about the length of its inputs instead of the longest input
+    :param lengths: token count of every input
+    :param batch_size:
+    :return: iterator of the input indexes of every batch
+    """
+    sorted_indexes = np.argsort(np.asarray(lengths), kind="stable")
+    for start in range(0, len(sorted_indexes), batch_size):
+        yield sorted_indexes[start:start + batch_size]
+
+def pool_hidden_states(
+    last_hidden_state: torch.Tensor,
+    attention_mask: torch.Tensor,
+    pooling: PoolingType = "mean",
+)->torch.Tensor:
+    """
+    Function to pool the token states of a batch into one vector per input
+    :param last_hidden_state: (batch, tokens, dim)
+    :param attention_mask: (batch, tokens), 0 on the padding
+    :param pooling: mean of the non-padding tokens, or the [CLS] token
+    :return: (batch, dim)
+    """
+    if pooling == "cls":
+        return last_hidden_state[:, 0]
+    mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+    return (last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1.)
+
+class BertEncoder:
+    """
+    Batch encoder of texts into one fixed-size vector each with a BERT-like model of the registry.
+    The texts are tokenized once, truncated to the model max length, sorted into length buckets
+    and padded per batch.
+    """
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 32,
+        max_length: Optional[int] = None,
+        pooling: PoolingType = "mean",
+        normalize: bool = True,
+        quantized: bool = False,
+        dimensions: Optional[int] = None,
+        registry: EmbeddingModelRegistry = embedding_model_registry,
+    ):
+        """
+        Initialization function
+        :param model_name:
+        :param batch_size:
+        :param max_length: tokens kept of every text, the model max length when None
+        :param pooling:
+        :param normalize: L2-normalize the vectors, for the cosine metric
+        :param quantized: run the int8 dynamically quantized model, on CPU
+        :param dimensions: leading dimensions kept of every vector, before the normalization,
+            for Matryoshka-trained models, all of them when None
+        :param registry:
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.pooling = pooling
+        self.normalize = normalize
+        self.quantized = quantized
+        self.dimensions = dimensions
+        self.registry = registry
+
+    def get_max_length(self)->int:
+        """
+        Get the tokens kept of every text
+        :return:
+        """
+        loaded_model = self.registry.get(self.model_name, self.quantized)
+        model_max_length = min(
+            loaded_model.tokenizer.model_max_length,
+            getattr(loaded_model.model.config, "max_position_embeddings", loaded_model.tokenizer.model_max_length),
+        )
+        return min(self.max_length, model_max_length) if self.max_length else model_max_length
+
+    def encode(self, texts: Sequence[str])->np.ndarray:
+        """
+        Encode texts
+        :param texts:
+        :return: contiguous float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        loaded_model = self.registry.get(self.model_name, self.quantized)
+        hidden_size = loaded_model.model.config.hidden_size
+        if self.dimensions and self.dimensions > hidden_size:
+            raise ValueError(f"{self.model_name} vectors have {hidden_size} dimensions, not {self.dimensions}.")
+        embeddings = np.empty((len(texts), self.dimensions or hidden_size), dtype=np.float32)
+        if not len(texts):
+            return embeddings
+
+        input_ids = loaded_model.tokenizer(
+            list(texts),
+            truncation=True,
+            max_length=self.get_max_length(),
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )["input_ids"]
+        with torch.inference_mode():
+            for batch_indexes in iter_length_buckets([len(ids) for ids in input_ids], self.batch_size):
+                features = loaded_model.tokenizer.pad(
+                    {"input_ids": [input_ids[index] for index in batch_indexes]},
+                    return_tensors="pt",
+                ).to(loaded_model.device)
+                outputs = loaded_model.model(**features)
+                pooled = pool_hidden_states(outputs.last_hidden_state, features["attention_mask"], self.pooling)
+                if self.dimensions:
+                    pooled = pooled[:, :self.dimensions]
+                if self.normalize:
+                    pooled = F.normalize(pooled, p=2, dim=1)
+                embeddings[batch_indexes] = pooled.float().cpu().numpy()
+        return embeddings
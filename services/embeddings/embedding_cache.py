@@ -0,0 +1,245 @@
+from collections import OrderedDict
+import asyncio
+import hashlib
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import unicodedata
+
+import numpy as np
+
+from constants.services import embeddings as embeddings_constants
+from core.configs import settings
+from core.disk_cache import DiskLRUCache
+from core.logger import logger
+
+# Function embedding texts into a (n_texts, dim) matrix
+EmbedFunction = Callable[[List[str]], np.ndarray]
+AsyncEmbedFunction = Callable[[List[str]], Awaitable[np.ndarray]]
+# Embeddings of texts, None for the missing ones, and the indexes of the missing texts by key
+CacheLookup = Tuple[List[Optional[np.ndarray]], Dict[str, List[int]]]
+
+def normalize_text(text: str)->str:
+    """
+    Function to normalize a text before it is hashed, so texts differing only by their Unicode
+    composition or their whitespace share their embedding
+    :param text:
+    :return:
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+class EmbeddingCache:
+    """
+    Two-tier cache of embeddings keyed by the model, the dimensions and the hash of the normalized text:
+    an in-memory LRU in front of a persistent DiskLRUCache. Both tiers are bounded by the size of their vectors.
+    """
+    def __init__(self, cache_dir: str, max_size_bytes: int, memory_max_size_bytes: int):
+        """
+        Initialization function
+        :param cache_dir:
+        :param max_size_bytes: size of the vectors kept on disk
+        :param memory_max_size_bytes: size of the vectors kept in memory
+        """
+        self.disk_cache = DiskLRUCache(cache_dir, max_size_bytes)
+        self.memory_max_size_bytes = memory_max_size_bytes
+        self.memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.memory_size_bytes = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self._lock = threading.Lock()
+
+    def get_key(self, model: str, dimensions: Optional[int], text: str)->str:
+        """
+        Get the cache key of the embedding of a text
+        :param model: the model and every setting that changes its vectors
+        :param dimensions:
+        :param text:
+        :return:
+        """
+        raw_key = embeddings_constants.EMBEDDING_CACHE_KEY_FORMAT.format(
+            model=model,
+            dimensions=dimensions or "",
+            text_hash=hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest(),
+        )
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _set_memory(self, key: str, embedding: np.ndarray):
+        """
+        Set an embedding in the memory tier, evicting the least recently used ones when it is full
+        :param key:
+        :param embedding:
+        :return:
+        """
+        if embedding.nbytes > self.memory_max_size_bytes:
+            return
+        with self._lock:
+            previous_embedding = self.memory_cache.pop(key, None)
+            if previous_embedding is not None:
+                self.memory_size_bytes -= previous_embedding.nbytes
+            self.memory_cache[key] = embedding
+            self.memory_size_bytes += embedding.nbytes
+            while self.memory_size_bytes > self.memory_max_size_bytes:
+                _, evicted_embedding = self.memory_cache.popitem(last=False)
+                self.memory_size_bytes -= evicted_embedding.nbytes
+
+    def get(self, key: str)->Optional[np.ndarray]:
+        """
+        Get an embedding from the memory tier, else from the disk tier, promoted to the memory tier
+        :param key:
+        :return: read-only float32 vector, None on a miss
+        """
+        with self._lock:
+            embedding = self.memory_cache.get(key)
+            if embedding is not None:
+                self.memory_cache.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+            self.memory_misses += 1
+        cached_bytes = self.disk_cache.get(key)
+        if cached_bytes is None:
+            return None
+        embedding = np.frombuffer(cached_bytes, dtype=embeddings_constants.EMBEDDING_CACHE_DTYPE)
+        self._set_memory(key, embedding)
+        return embedding
+
+    def set(self, key: str, embedding: np.ndarray):
+        """
+        Set an embedding in both tiers
+        :param key:
+        :param embedding:
+        :return:
+        """
+        embedding = np.ascontiguousarray(embedding, dtype=embeddings_constants.EMBEDDING_CACHE_DTYPE)
+        embedding.flags.writeable = False
+        self._set_memory(key, embedding)
+        self.disk_cache.set(key, embedding.tobytes())
+
+    def lookup(self, model: str, dimensions: Optional[int], texts: Sequence[str])->CacheLookup:
+        """
+        Look up the embeddings of texts
+        :param model: the model and every setting that changes its vectors
+        :param dimensions:
+        :param texts:
+        :return: the embeddings, None for the missing texts, and the indexes of the missing texts by key
+        """
+        keys = [self.get_key(model, dimensions, text) for text in texts]
+        embeddings: List[Optional[np.ndarray]] = [self.get(key) for key in keys]
+
+        missing_indexes: Dict[str, List[int]] = {}
+        for index, (key, embedding) in enumerate(zip(keys, embeddings)):
+            if embedding is None:
+                missing_indexes.setdefault(key, []).append(index)
+        return embeddings, missing_indexes
+
+    def fill(
+        self,
+        dimensions: Optional[int],
+        cache_lookup: CacheLookup,
+        missing_embeddings: Sequence[np.ndarray],
+    )->np.ndarray:
+        """
+        Cache the embeddings of the missing texts of a lookup and assemble all the embeddings
+        :param dimensions:
+        :param cache_lookup:
+        :param missing_embeddings: embeddings of the missing texts, in the order of the lookup
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        embeddings, missing_indexes = cache_lookup
+        for (key, indexes), embedding in zip(missing_indexes.items(), missing_embeddings):
+            self.set(key, embedding)
+            for index in indexes:
+                embeddings[index] = embedding
+        logger.info(
+            f"get_or_embed: {len(embeddings) - sum(len(indexes) for indexes in missing_indexes.values())}/"
+            f"{len(embeddings)} embeddings from the cache, {len(missing_indexes)} texts embedded"
+        )
+        if not embeddings:
+            return np.empty((0, dimensions or 0), dtype=embeddings_constants.EMBEDDING_CACHE_DTYPE)
+        return np.vstack(embeddings).astype(embeddings_constants.EMBEDDING_CACHE_DTYPE, copy=False)
+
+    def get_or_embed(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        texts: Sequence[str],
+        embed_function: EmbedFunction,
+    )->np.ndarray:
+        """
+        Get the embeddings of texts, embedding only the texts missing from the cache, each once
+        :param model: the model and every setting that changes its vectors
+        :param dimensions:
+        :param texts:
+        :param embed_function: embeds the missing texts
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        cache_lookup = self.lookup(model, dimensions, texts)
+        missing_texts = [texts[indexes[0]] for indexes in cache_lookup[1].values()]
+        return self.fill(dimensions, cache_lookup, embed_function(missing_texts) if missing_texts else [])
+
+    async def aget_or_embed(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        texts: Sequence[str],
+        embed_function: AsyncEmbedFunction,
+    )->np.ndarray:
+        """
+        Get the embeddings of texts like get_or_embed, without blocking the event loop:
+        the disk tier is read and written on a thread
+        :param model:
+        :param dimensions:
+        :param texts:
+        :param embed_function: embeds the missing texts, asynchronously
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        cache_lookup = await asyncio.to_thread(self.lookup, model, dimensions, texts)
+        missing_texts = [texts[indexes[0]] for indexes in cache_lookup[1].values()]
+        missing_embeddings = await embed_function(missing_texts) if missing_texts else []
+        return await asyncio.to_thread(self.fill, dimensions, cache_lookup, missing_embeddings)
+
+    def get_hit_rate(self)->float:
+        """
+        Get the ratio of embeddings found in either tier to lookups since the cache was opened
+        :return:
+        """
+        lookups = self.memory_hits + self.memory_misses
+        return (self.memory_hits + self.disk_cache.hits) / lookups if lookups else 0.0
+
+    def get_stats(self)->Dict[str, Union[int, float]]:
+        """
+        Get the hits, misses and size of both tiers, and the overall hit rate
+        :return:
+        """
+        disk_stats = self.disk_cache.get_stats()
+        with self._lock:
+            memory_stats = {
+                "memory_hits": self.memory_hits,
+                "memory_misses": self.memory_misses,
+                "memory_entries": len(self.memory_cache),
+                "memory_size_bytes": self.memory_size_bytes,
+            }
+        return {
+            **memory_stats,
+            "disk_hits": disk_stats["hits"],
+            "disk_misses": disk_stats["misses"],
+            "disk_entries": disk_stats["entries"],
+            "disk_size_bytes": disk_stats["size_bytes"],
+            "hit_rate": self.get_hit_rate(),
+        }
+
+    def clear(self):
+        """
+        Delete all embeddings of both tiers and reset the statistics
+        :return:
+        """
+        with self._lock:
+            self.memory_cache.clear()
+            self.memory_size_bytes = 0
+            self.memory_hits = 0
+            self.memory_misses = 0
+        self.disk_cache.clear()
+
+embedding_cache = EmbeddingCache(
+    cache_dir=settings.EMBEDDING_CACHE_DIR,
+    max_size_bytes=settings.EMBEDDING_CACHE_MAX_SIZE_BYTES,
+    memory_max_size_bytes=settings.EMBEDDING_CACHE_MEMORY_MAX_SIZE_BYTES,
+) if settings.EMBEDDING_CACHE_ENABLED else None
@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+from core.configs import settings
+
+class EmbeddingQueueFullError(RuntimeError):
+    """Raised when the embedding executor has as many tasks waiting as its queue holds"""
+
+class EmbeddingExecutor:
+    """
+    Dedicated, bounded executor of the CPU-bound embedding tasks, e.g. torch forward passes, so they
+    neither block the event loop nor take the threadpool the other requests run on. A task submitted
+    while the queue is full is rejected instead of queued, for the caller to fail fast.
+    """
+    def __init__(self, max_workers: int = 1, max_queue_size: int = 64):
+        """
+        Initialization function
+        :param max_workers: tasks running at once, a torch forward pass already uses several cores
+        :param max_queue_size: tasks waiting for a worker
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get_executor(self)->ThreadPoolExecutor:
+        """
+        Get the thread pool, started on first use
+        :return:
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="embedding")
+        return self._executor
+
+    def get_queue_depth(self)->int:
+        """
+        Get the number of tasks waiting for a worker
+        :return:
+        """
+        return self.in_flight - self.running
+
+    def submit(self, function: Callable[..., Any], *args, **kwargs)->Future:
+        """
+        Submit a task
+        :param function:
+        :param args:
+        :param kwargs:
+        :return: future of the result of the task
+        :raises EmbeddingQueueFullError: if max_queue_size tasks are already waiting
+        """
+        submitted_at = time.perf_counter()
+
+        def run_task():
+            with self._lock:
+                self.running += 1
+                self.total_wait_seconds += time.perf_counter() - submitted_at
+            return function(*args, **kwargs)
+
+        def release_task(future: Future):
+            with self._lock:
+                self.in_flight -= 1
+                if future.cancelled():
+                    return
+                self.running -= 1
+                if future.exception() is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+        with self._lock:
+            if self.in_flight - self.running >= self.max_queue_size:
+                self.rejected += 1
+                raise EmbeddingQueueFullError(f"{self.max_queue_size} embedding tasks are already waiting.")
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.in_flight - self.running)
+            future = self.get_executor().submit(run_task)
+        future.add_done_callback(release_task)
+        return future
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs)->Any:
+        """
+        Run a task without blocking the event loop
+        :param function:
+        :param args:
+        :param kwargs:
+        :return: result of the task
+        :raises EmbeddingQueueFullError: if max_queue_size tasks are already waiting
+        """
+        return await asyncio.wrap_future(self.submit(function, *args, **kwargs))
+
+    def get_stats(self)->Dict[str, Union[int, float]]:
+        """
+        Get the queue depth, the task counts and the mean wait of the tasks for a worker
+        :return:
+        """
+        with self._lock:
+            started = self.completed + self.failed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self.in_flight - self.running,
+                "max_queue_depth": self.max_queue_depth,
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "mean_wait_seconds": self.total_wait_seconds / started if started else 0.,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the thread pool, it is started again on the next task
+        :param wait: wait for the submitted tasks
+        :return:
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+embedding_executor = EmbeddingExecutor(
+    max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+    max_queue_size=settings.EMBEDDING_EXECUTOR_MAX_QUEUE_SIZE,
+)
@@ -0,0 +1,215 @@
+from datetime import datetime
+import gc
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import torch
+from transformers import AutoModel, AutoTokenizer, PreTrainedModel, PreTrainedTokenizerBase
+
+from constants.core import DEVICE_CPU, DEVICE_CUDA
+from constants.services import embeddings as embeddings_constants
+from core.configs import settings
+from core.logger import logger
+from schemas import EmbeddingModelResponse
+
+def get_model_key(model_name: str, quantized: bool = False)->str:
+    """
+    Function to get the registry key of a model, e.g. "bert-base-uncased:int8" for its quantized variant
+    :param model_name:
+    :param quantized:
+    :return:
+    """
+    return f"{model_name}{embeddings_constants.QUANTIZED_MODEL_KEY_SUFFIX}" if quantized else model_name
+
+def quantize_model(model: PreTrainedModel)->PreTrainedModel:
+    """
+    Function to quantize the Linear layers of a CPU model to int8 weights, the activations are
+    quantized on the fly. The attention and feed-forward matmuls, most of the BERT compute,
+    run as int8 GEMMs.
+    :param model: in eval mode, on CPU
+    :return:
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+class LoadedEmbeddingModel:
+    """
+    An embedding model and its tokenizer, loaded on a device
+    """
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: PreTrainedTokenizerBase,
+        model: PreTrainedModel,
+        device: torch.device,
+        load_seconds: float,
+        quantized: bool = False,
+    ):
+        """
+        Initialization function
+        :param model_name: Huggingface model id or local path
+        :param tokenizer:
+        :param model: in eval mode, on device
+        :param device:
+        :param load_seconds:
+        :param quantized: the Linear layers are dynamically quantized to int8
+        """
+        self.model_name = model_name
+        self.tokenizer = tokenizer
+        self.model = model
+        self.device = device
+        self.load_seconds = load_seconds
+        self.quantized = quantized
+        self.loaded_at = datetime.now()
+
+    def get_memory_bytes(self)->int:
+        """
+        Get the memory of the parameters and buffers of the model. The packed weights of the
+        quantized layers are not parameters, so the tensors of the state dict are counted.
+        :return:
+        """
+        memory_bytes = 0
+        for value in self.model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if isinstance(tensor, torch.Tensor):
+                    memory_bytes += tensor.numel() * tensor.element_size()
+        return memory_bytes
+
+    def to_response(self)->EmbeddingModelResponse:
+        """
+        Describe the loaded model
+        :return:
+        """
+        return EmbeddingModelResponse(
+            model_name=get_model_key(self.model_name, self.quantized),
+            quantized=self.quantized,
+            device=str(self.device),
+            memory_bytes=self.get_memory_bytes(),
+            load_seconds=self.load_seconds,
+            loaded_at=self.loaded_at,
+        )
+
+class EmbeddingModelRegistry:
+    """
+    Registry of the embedding models of the process. A model is loaded once, on its first use
+    or on warmup, and kept until it is unloaded. Safe to share between threads: concurrent
+    first uses of a model load it once.
+    """
+    def __init__(self, device: Optional[str] = None, num_threads: Optional[int] = None):
+        """
+        Initialization function
+        :param device: e.g. "cpu" or "cuda", CUDA if available when None
+        :param num_threads: torch intra-op threads of the process, torch's default when None
+        """
+        self.device = torch.device(device or (DEVICE_CUDA if torch.cuda.is_available() else DEVICE_CPU))
+        self.num_threads = num_threads
+        self._models: Dict[str, LoadedEmbeddingModel] = {}
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._is_configured = False
+
+    def configure_threads(self):
+        """
+        Pin the torch thread counts of the process, once, before the first model is loaded
+        :return:
+        """
+        if self._is_configured:
+            return
+        self._is_configured = True
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+            try:
+                torch.set_num_interop_threads(self.num_threads)
+            except RuntimeError:
+                # The inter-op pool can only be sized before its first use
+                logger.warning("EmbeddingModelRegistry.configure_threads: Inter-op threads are already set.")
+        logger.info(f"EmbeddingModelRegistry.configure_threads: torch uses {torch.get_num_threads()} threads.")
+
+    def load_model(self, model_name: str, quantized: bool = False)->LoadedEmbeddingModel:
+        """
+        Load a model and its tokenizer on the device of the registry
+        :param model_name:
+        :param quantized: quantize the model to int8, on CPU only
+        :return:
+        """
+        if quantized and self.device.type != DEVICE_CPU:
+            raise ValueError(f"Quantized embedding models run on {DEVICE_CPU}, not on {self.device}.")
+        start_time = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).to(self.device)
+        model.eval()
+        if quantized:
+            model = quantize_model(model)
+        loaded_model = LoadedEmbeddingModel(
+            model_name,
+            tokenizer,
+            model,
+            self.device,
+            time.perf_counter() - start_time,
+            quantized=quantized,
+        )
+        logger.info(
+            f"EmbeddingModelRegistry.load_model: {get_model_key(model_name, quantized)} loaded on {self.device} "
+            f"in {loaded_model.load_seconds:.2f}s, {loaded_model.get_memory_bytes()} bytes."
+        )
+        return loaded_model
+
+    def get(self, model_name: str, quantized: bool = False)->LoadedEmbeddingModel:
+        """
+        Get a model, loading it on its first use. The quantized variant of a model is a separate entry.
+        :param model_name:
+        :param quantized:
+        :return:
+        """
+        model_key = get_model_key(model_name, quantized)
+        loaded_model = self._models.get(model_key)
+        if loaded_model is not None:
+            return loaded_model
+        with self._lock:
+            self.configure_threads()
+            model_lock = self._model_locks.setdefault(model_key, threading.Lock())
+        with model_lock:
+            loaded_model = self._models.get(model_key)
+            if loaded_model is None:
+                loaded_model = self.load_model(model_name, quantized)
+                self._models[model_key] = loaded_model
+        return loaded_model
+
+    def warmup(self, model_names: Iterable[str], quantized: bool = False):
+        """
+        Load models ahead of their first use, e.g. when a worker starts
+        :param model_names:
+        :param quantized:
+        :return:
+        """
+        for model_name in model_names:
+            self.get(model_name, quantized)
+
+    def unload(self, model_name: str)->bool:
+        """
+        Unload a model and release its memory
+        :param model_name: registry key, e.g. "bert-base-uncased:int8" for a quantized model
+        :return: whether the model was loaded
+        """
+        with self._lock:
+            loaded_model = self._models.pop(model_name, None)
+        if loaded_model is None:
+            return False
+        del loaded_model
+        gc.collect()
+        if self.device.type == DEVICE_CUDA:
+            torch.cuda.empty_cache()
+        logger.info(f"EmbeddingModelRegistry.unload: {model_name} unloaded.")
+        return True
+
+    def list_models(self)->List[EmbeddingModelResponse]:
+        """
+        Describe the loaded models
+        :return:
+        """
+        return [loaded_model.to_response() for loaded_model in list(self._models.values())]
+
+embedding_model_registry = EmbeddingModelRegistry(
+    device=settings.EMBEDDING_DEVICE,
+    num_threads=settings.EMBEDDING_TORCH_NUM_THREADS,
+)
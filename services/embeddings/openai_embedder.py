@@ -0,0 +1,282 @@
+import asyncio
+from concurrent.futures import Future
+from functools import lru_cache
+import random
+import threading
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import openai
+from openai import AsyncOpenAI
+
+from constants.services import embeddings as embeddings_constants
+from core.configs import settings
+from core.logger import logger
+from services.rag.token_chunking import encode, get_encoding
+
+def iter_token_batches(
+    token_counts: Sequence[int],
+    max_batch_tokens: int,
+    max_batch_items: int,
+)->Iterator[range]:
+    """
+    Function to group consecutive inputs into request-sized batches. An input larger than
+    max_batch_tokens is sent alone.
+    :param token_counts: token count of every input
+    :param max_batch_tokens:
+    :param max_batch_items:
+    :return: iterator of the input indexes of every batch, in order
+    """
+    start = 0
+    batch_tokens = 0
+    for index, token_count in enumerate(token_counts):
+        if index > start and (batch_tokens + token_count > max_batch_tokens or index - start >= max_batch_items):
+            yield range(start, index)
+            start = index
+            batch_tokens = 0
+        batch_tokens += token_count
+    if start < len(token_counts):
+        yield range(start, len(token_counts))
+
+def is_retryable_error(error: Exception)->bool:
+    """
+    Function to tell whether a failed request may succeed when sent again:
+    connection errors, timeouts, rate limits and server errors
+    :param error:
+    :return:
+    """
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return (
+            error.status_code in embeddings_constants.OPENAI_EMBEDDING_RETRY_STATUS_CODES
+            or error.status_code >= 500
+        )
+    return False
+
+def get_backoff_seconds(
+    attempt: int,
+    base_seconds: float = embeddings_constants.OPENAI_EMBEDDING_BACKOFF_BASE_SECONDS,
+    max_seconds: float = embeddings_constants.OPENAI_EMBEDDING_BACKOFF_MAX_SECONDS,
+    error: Optional[Exception] = None,
+)->float:
+    """
+    Function to get the wait before a retry: exponential backoff with full jitter, so the
+    concurrent requests limited together do not retry together, and at least the Retry-After
+    of the response
+    :param attempt: 0 for the first retry
+    :param base_seconds:
+    :param max_seconds:
+    :param error: the error of the failed request
+    :return:
+    """
+    backoff_seconds = random.uniform(0., min(max_seconds, base_seconds * 2 ** attempt))
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            retry_after_seconds = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            retry_after_seconds = 0.
+        backoff_seconds = max(backoff_seconds, min(retry_after_seconds, max_seconds))
+    return backoff_seconds
+
+class OpenAIEmbedder:
+    """
+    Embedder of texts with the OpenAI embeddings API. The texts are grouped into batches bounded by
+    tokens and items, up to max_concurrency batches are sent at once on one pooled async client,
+    and the rate-limited or failed batches are retried with jittered backoff.
+    The client lives on an event loop thread of the embedder, so it is reused by every caller.
+    """
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        dimensions: Optional[int] = None,
+        max_batch_tokens: int = embeddings_constants.OPENAI_EMBEDDING_MAX_BATCH_TOKENS,
+        max_batch_items: int = embeddings_constants.OPENAI_EMBEDDING_MAX_BATCH_ITEMS,
+        max_input_tokens: int = embeddings_constants.OPENAI_EMBEDDING_MAX_INPUT_TOKENS,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        timeout: float = 60.,
+        client: Optional[AsyncOpenAI] = None,
+    ):
+        """
+        Initialization function
+        :param api_key:
+        :param model: e.g. "text-embedding-3-large"
+        :param dimensions: size of the vectors, the model size when None
+        :param max_batch_tokens: tokens per request, capped to the API limit
+        :param max_batch_items: texts per request, capped to the API limit
+        :param max_input_tokens: tokens per text, capped to the API limit, the longer texts are truncated
+        :param max_concurrency: requests in flight
+        :param max_retries: retries of a batch before its error is raised
+        :param timeout: seconds per request
+        :param client: async client, created on first use when None
+        """
+        self.api_key = api_key
+        self.model = model
+        self.dimensions = dimensions
+        self.max_batch_tokens = min(max_batch_tokens, embeddings_constants.OPENAI_EMBEDDING_MAX_BATCH_TOKENS)
+        self.max_batch_items = min(max_batch_items, embeddings_constants.OPENAI_EMBEDDING_MAX_BATCH_ITEMS)
+        self.max_input_tokens = min(max_input_tokens, embeddings_constants.OPENAI_EMBEDDING_MAX_INPUT_TOKENS)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.client = client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get_loop(self)->asyncio.AbstractEventLoop:
+        """
+        Get the event loop of the embedder, started on a daemon thread on first use
+        :return:
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"openai-embedder-{self.model}",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    def get_client(self)->AsyncOpenAI:
+        """
+        Get the async client. The retries of the client are disabled, the embedder retries the batches.
+        :return:
+        """
+        if self.client is None:
+            self.client = AsyncOpenAI(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        return self.client
+
+    async def embed_batch(self, texts: List[str])->np.ndarray:
+        """
+        Embed a batch of texts in one request, retried on retryable errors
+        :param texts:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        request_kwargs = {"input": texts, "model": self.model}
+        if self.dimensions:
+            request_kwargs["dimensions"] = self.dimensions
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self.get_client().embeddings.create(**request_kwargs)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    raise
+                backoff_seconds = get_backoff_seconds(attempt, error=e)
+                logger.warning(
+                    f"embed_batch: {type(e).__name__} on a batch of {len(texts)} texts, "
+                    f"retry {attempt + 1}/{self.max_retries} in {backoff_seconds:.2f}s"
+                )
+                await asyncio.sleep(backoff_seconds)
+                attempt += 1
+        return np.asarray(
+            [embedding.embedding for embedding in sorted(response.data, key=lambda embedding: embedding.index)],
+            dtype=np.float32,
+        )
+
+    def truncate_inputs(self, texts: Sequence[str])->Tuple[List[str], List[int]]:
+        """
+        Truncate the texts longer than max_input_tokens to their leading tokens, with the encoding
+        of the model, the API rejects the whole request otherwise
+        :param texts:
+        :return: tuple of (texts, token count of every text)
+        """
+        encoding = get_encoding(self.model)
+        truncated_texts = []
+        token_counts = []
+        for text in texts:
+            text_tokens = encode(text, encoding)
+            if len(text_tokens) > self.max_input_tokens:
+                logger.warning(
+                    f"truncate_inputs: A text of {len(text_tokens)} tokens is truncated "
+                    f"to {self.max_input_tokens} tokens."
+                )
+                text_tokens = text_tokens[:self.max_input_tokens]
+                text = encoding.decode(text_tokens)
+            truncated_texts.append(text)
+            token_counts.append(len(text_tokens))
+        return truncated_texts, token_counts
+
+    async def embed_on_loop(self, texts: Sequence[str])->np.ndarray:
+        """
+        Embed texts in concurrent batches, to be run on the event loop of the embedder
+        :param texts:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        texts, token_counts = self.truncate_inputs(texts)
+        batches = list(iter_token_batches(token_counts, self.max_batch_tokens, self.max_batch_items))
+        batch_embeddings = await asyncio.gather(*(
+            self.embed_batch(texts[batch.start:batch.stop]) for batch in batches
+        ))
+        if not batch_embeddings:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        return np.ascontiguousarray(np.concatenate(batch_embeddings))
+
+    def submit(self, texts: Sequence[str])->Future:
+        """
+        Submit texts to embed to the event loop of the embedder
+        :param texts:
+        :return: future of the float32 (n_texts, dim) matrix
+        """
+        return asyncio.run_coroutine_threadsafe(self.embed_on_loop(texts), self.get_loop())
+
+    async def aembed(self, texts: Sequence[str])->np.ndarray:
+        """
+        Embed texts, from any event loop
+        :param texts:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def embed(self, texts: Sequence[str])->np.ndarray:
+        """
+        Embed texts, blocking until every batch is embedded
+        :param texts:
+        :return: float32 (n_texts, dim) matrix, in the order of the texts
+        """
+        return self.submit(texts).result()
+
+    def close(self):
+        """
+        Close the client and stop the event loop of the embedder
+        :return:
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self.client is not None:
+            asyncio.run_coroutine_threadsafe(self.client.close(), loop).result()
+            self.client = None
+        self._semaphore = None
+        loop.call_soon_threadsafe(loop.stop)
+
+@lru_cache(maxsize=None)
+def get_openai_embedder(api_key: str, model: str, dimensions: Optional[int] = None)->OpenAIEmbedder:
+    """
+    Function to get the embedder of a model, created once per process with the settings
+    :param api_key:
+    :param model:
+    :param dimensions:
+    :return:
+    """
+    return OpenAIEmbedder(
+        api_key,
+        model,
+        dimensions=dimensions,
+        max_batch_tokens=settings.OPENAI_EMBEDDING_BATCH_TOKENS,
+        max_batch_items=settings.OPENAI_EMBEDDING_BATCH_SIZE,
+        max_concurrency=settings.OPENAI_EMBEDDING_CONCURRENCY,
+        max_retries=settings.OPENAI_EMBEDDING_MAX_RETRIES,
+        timeout=settings.OPENAI_EMBEDDING_TIMEOUT,
+    )
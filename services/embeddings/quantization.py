@@ -0,0 +1,55 @@
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from constants.services import embeddings as embeddings_constants
+from services.embeddings.bert_encoder import BertEncoder
+from services.embeddings.model_registry import EmbeddingModelRegistry, embedding_model_registry
+
+class ParityReport(NamedTuple):
+    """
+    Agreement of the quantized vectors of texts with their fp32 vectors
+    """
+    n_texts: int
+    min_cosine: float
+    mean_cosine: float
+    min_cosine_threshold: float
+    passed: bool
+
+def get_cosine_agreement(reference: np.ndarray, candidate: np.ndarray)->np.ndarray:
+    """
+    Function to get the cosine similarity of every row of two matrices
+    :param reference: (n, dim)
+    :param candidate: (n, dim)
+    :return: (n,)
+    """
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    return np.einsum("ij,ij->i", reference, candidate) / np.maximum(norms, np.finfo(np.float32).tiny)
+
+def check_quantized_parity(
+    model_name: str,
+    texts: Sequence[str],
+    min_cosine_threshold: float = embeddings_constants.QUANTIZATION_PARITY_MIN_COSINE,
+    registry: EmbeddingModelRegistry = embedding_model_registry,
+    **encoder_kwargs,
+)->ParityReport:
+    """
+    Function to check that the int8 quantized model embeds texts like the fp32 model
+    :param model_name:
+    :param texts: sample of the texts to embed, e.g. chunks of the corpus
+    :param min_cosine_threshold: lowest cosine similarity accepted for a text
+    :param registry:
+    :param encoder_kwargs: settings of both BertEncoders, e.g. pooling
+    :return:
+    """
+    reference = BertEncoder(model_name, quantized=False, registry=registry, **encoder_kwargs).encode(texts)
+    candidate = BertEncoder(model_name, quantized=True, registry=registry, **encoder_kwargs).encode(texts)
+    cosines = get_cosine_agreement(reference, candidate)
+    min_cosine = float(cosines.min()) if len(cosines) else 1.
+    return ParityReport(
+        n_texts=len(cosines),
+        min_cosine=min_cosine,
+        mean_cosine=float(cosines.mean()) if len(cosines) else 1.,
+        min_cosine_threshold=min_cosine_threshold,
+        passed=min_cosine >= min_cosine_threshold,
+    )
@@ -0,0 +1 @@
+from services.extraction.pdf_extraction import PdfExtractionService, pdf_extraction_service
@@ -0,0 +1,92 @@
+import hashlib
+from typing import Dict, Optional, Union
+
+from constants.services import pdf_extraction as pdf_extraction_constants
+from core.disk_cache import DiskLRUCache
+from schemas import PageExtractionResult
+
+class OcrCache:
+    """
+    Persistent cache of OCR'd pages, keyed by the PDF hash, the page number and every setting
+    that changes the OCR output, so a re-extraction of a known document needs no rasterization or OCR
+    """
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_bytes: int,
+        dpi: int,
+        grayscale: bool,
+        language: Optional[str] = None,
+        tesseract_config: str = "",
+    ):
+        """
+        Initialization function
+        :param cache_dir:
+        :param max_size_bytes:
+        :param dpi: rasterization resolution of the cached pages
+        :param grayscale: rasterization color mode of the cached pages
+        :param language: tesseract language of the cached pages
+        :param tesseract_config: tesseract config of the cached pages, e.g. "--psm 6"
+        """
+        self.disk_cache = DiskLRUCache(cache_dir, max_size_bytes)
+        self.dpi = dpi
+        self.grayscale = grayscale
+        self.language = language
+        self.tesseract_config = tesseract_config
+
+    def get_key(self, document_hash: str, page_number: int)->str:
+        """
+        Get the cache key of a page
+        :param document_hash:
+        :param page_number:
+        :return:
+        """
+        raw_key = pdf_extraction_constants.OCR_CACHE_KEY_FORMAT.format(
+            document_hash=document_hash,
+            page_number=page_number,
+            dpi=self.dpi,
+            grayscale=self.grayscale,
+            language=self.language or "",
+            tesseract_config=self.tesseract_config,
+        )
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def get(self, document_hash: str, page_number: int)->Optional[PageExtractionResult]:
+        """
+        Get a cached page
+        :param document_hash:
+        :param page_number:
+        :return: the page extracted by ocr_cache, None on a miss
+        """
+        cached_text = self.disk_cache.get(self.get_key(document_hash, page_number))
+        if cached_text is None:
+            return None
+        return PageExtractionResult(
+            page_number=page_number,
+            text=cached_text.decode("utf-8"),
+            method=pdf_extraction_constants.EXTRACTION_METHOD_OCR_CACHE,
+            elapsed_seconds=0.0,
+        )
+
+    def set(self, document_hash: str, page: PageExtractionResult):
+        """
+        Cache an OCR'd page
+        :param document_hash:
+        :param page:
+        :return:
+        """
+        self.disk_cache.set(self.get_key(document_hash, page.page_number), page.text)
+
+    def get_hit_rate(self)->float:
+        """
+        Get the ratio of cached pages to page lookups since the cache was opened
+        :return:
+        """
+        return self.disk_cache.get_hit_rate()
+
+    def get_stats(self)->Dict[str, Union[int, float]]:
+        """
+        Get the hits, misses, hit rate, number of entries and total size of the cache
+        :return:
+        """
+        return self.disk_cache.get_stats()
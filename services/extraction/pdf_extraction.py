@@ -0,0 +1,428 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import hashlib
+from io import BytesIO
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from PIL.Image import Image
+from pdf2image import convert_from_bytes, convert_from_path, pdfinfo_from_bytes, pdfinfo_from_path
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+import pytesseract
+
+from constants.services import pdf_extraction as pdf_extraction_constants
+from core.configs import settings
+from core.logger import logger
+from core.utilities import hash_a_file
+from schemas import DocumentExtractionResult, PageExtractionResult
+from services.extraction.ocr_cache import OcrCache
+
+CID_PATTERN = re.compile(pdf_extraction_constants.TEXT_LAYER_CID_PATTERN)
+
+def ocr_page(
+    page: Tuple[int, Union[str, Image]],
+    language: Optional[str] = None,
+    tesseract_config: str = "",
+)->PageExtractionResult:
+    """
+    OCR a single rasterized page, module-level so it can be sent to a process pool
+    :param page: tuple of (page_number, image or path of the rasterized image)
+    :param language: tesseract language, e.g. "ind+eng", tesseract's default if None
+    :param tesseract_config: extra tesseract flags, e.g. "--psm 6"
+    :return:
+    """
+    page_number, image = page
+    started_at = time.perf_counter()
+    text = pytesseract.image_to_string(image, lang=language, config=tesseract_config)
+    return PageExtractionResult(
+        page_number=page_number,
+        text=text,
+        method=pdf_extraction_constants.EXTRACTION_METHOD_OCR,
+        elapsed_seconds=time.perf_counter() - started_at,
+    )
+
+def hash_a_document(the_document: Union[bytes, str])->str:
+    """
+    Hash a PDF document given as bytes or as a path
+    :param the_document:
+    :return:
+    """
+    if isinstance(the_document, bytes):
+        return hashlib.sha256(the_document).hexdigest()
+    with open(the_document, "rb") as document_file:
+        return hash_a_file(document_file)
+
+def is_text_layer_usable(text: Optional[str])->bool:
+    """
+    Check whether the embedded text layer of a page is good enough to skip OCR.
+    Empty layers, layers of unmapped glyphs, e.g. "(cid:12)", and layers of mostly
+    symbols are rejected.
+    :param text:
+    :return:
+    """
+    if not text:
+        return False
+    stripped_text = text.strip()
+    n_chars = len(stripped_text)
+    if n_chars < pdf_extraction_constants.TEXT_LAYER_MIN_CHARS:
+        return False
+
+    cid_chars = sum(len(match) for match in CID_PATTERN.findall(stripped_text))
+    if cid_chars / n_chars > pdf_extraction_constants.TEXT_LAYER_MAX_CID_RATIO:
+        return False
+
+    non_space_chars = [char for char in stripped_text if not char.isspace()]
+    alphanumeric_chars = sum(1 for char in non_space_chars if char.isalnum())
+    if alphanumeric_chars / len(non_space_chars) < pdf_extraction_constants.TEXT_LAYER_MIN_ALPHANUMERIC_RATIO:
+        return False
+
+    printable_chars = sum(1 for char in stripped_text if char.isprintable() or char.isspace())
+    return printable_chars / n_chars >= pdf_extraction_constants.TEXT_LAYER_MIN_PRINTABLE_RATIO
+
+def group_page_ranges(page_numbers: List[int])->List[Tuple[int, int]]:
+    """
+    Group sorted page numbers into contiguous (first_page, last_page) ranges
+    :param page_numbers:
+    :return:
+    """
+    page_ranges: List[Tuple[int, int]] = []
+    for page_number in page_numbers:
+        if page_ranges and page_ranges[-1][1] == page_number - 1:
+            page_ranges[-1] = (page_ranges[-1][0], page_number)
+        else:
+            page_ranges.append((page_number, page_number))
+    return page_ranges
+
+def split_page_windows(page_ranges: List[Tuple[int, int]], window_size: int)->Iterator[Tuple[int, int]]:
+    """
+    Split (first_page, last_page) ranges into windows of at most window_size pages
+    :param page_ranges:
+    :param window_size:
+    :return:
+    """
+    for first_page, last_page in page_ranges:
+        for window_first_page in range(first_page, last_page + 1, window_size):
+            yield window_first_page, min(window_first_page + window_size - 1, last_page)
+
+class PdfExtractionService:
+    """
+    Service to extract the text of PDF documents page by page
+    """
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        dpi: int = 200,
+        grayscale: bool = True,
+        streaming_window_size: Optional[int] = None,
+        language: Optional[str] = None,
+        tesseract_config: str = "",
+        ocr_cache: Optional[OcrCache] = None,
+    ):
+        """
+        :param max_workers: size of the OCR process pool, defaults to the number of CPUs of the host
+        :param dpi: rasterization resolution
+        :param grayscale: rasterize in grayscale, a third of the RGB size
+        :param streaming_window_size: pages rasterized at once in streaming mode,
+            defaults to a few pages per OCR worker
+        :param language: tesseract language
+        :param tesseract_config: extra tesseract flags
+        :param ocr_cache: persistent cache of OCR'd pages, pages are always OCR'd if None
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.grayscale = grayscale
+        self.language = language
+        self.tesseract_config = tesseract_config
+        self.ocr_cache = ocr_cache
+        self.streaming_window_size = streaming_window_size or (
+            self.max_workers * pdf_extraction_constants.STREAMING_WINDOW_PAGES_PER_WORKER
+        )
+        self._ocr_pool: Optional[ProcessPoolExecutor] = None
+        self._ocr_pool_lock = threading.Lock()
+
+    def get_ocr_pool(self)->ProcessPoolExecutor:
+        """
+        Get the shared OCR process pool, created on first use
+        :return:
+        """
+        with self._ocr_pool_lock:
+            if self._ocr_pool is None:
+                self._ocr_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(pdf_extraction_constants.OCR_POOL_MP_CONTEXT),
+                )
+            return self._ocr_pool
+
+    def shutdown(self):
+        """
+        Shut the OCR process pool down
+        :return:
+        """
+        with self._ocr_pool_lock:
+            if self._ocr_pool is not None:
+                self._ocr_pool.shutdown()
+                self._ocr_pool = None
+
+    def extract_text_layer(
+        self,
+        the_document: Union[bytes, str],
+    )->Tuple[int, Dict[int, PageExtractionResult]]:
+        """
+        Extract the embedded text layer of every page with pypdf.
+        Only the pages with a usable text layer are returned.
+        :param the_document: bytes or path of the PDF document
+        :return: tuple of (number of pages, text layer results keyed by page number)
+        """
+        reader = PdfReader(BytesIO(the_document) if isinstance(the_document, bytes) else the_document)
+        text_layer_pages: Dict[int, PageExtractionResult] = {}
+        for page_number, page in enumerate(reader.pages, start=1):
+            started_at = time.perf_counter()
+            try:
+                text = page.extract_text()
+            except (PyPdfError, KeyError, ValueError) as e:
+                logger.warning(f"extract_text_layer: Page {page_number} has an unreadable text layer: {e}")
+                continue
+            if is_text_layer_usable(text):
+                text_layer_pages[page_number] = PageExtractionResult(
+                    page_number=page_number,
+                    text=text,
+                    method=pdf_extraction_constants.EXTRACTION_METHOD_TEXT_LAYER,
+                    elapsed_seconds=time.perf_counter() - started_at,
+                )
+        return len(reader.pages), text_layer_pages
+
+    def map_ocr_pages(
+        self,
+        numbered_images: List[Tuple[int, Union[str, Image]]],
+        parallel: bool = True,
+    )->List[PageExtractionResult]:
+        """
+        OCR rasterized pages, on the OCR process pool in parallel mode, the page order is kept
+        :param numbered_images:
+        :param parallel:
+        :return:
+        """
+        ocr_numbered_image = functools.partial(
+            ocr_page,
+            language=self.language,
+            tesseract_config=self.tesseract_config,
+        )
+        if parallel and len(numbered_images) > 1:
+            return list(self.get_ocr_pool().map(ocr_numbered_image, numbered_images))
+        return [ocr_numbered_image(numbered_image) for numbered_image in numbered_images]
+
+    def ocr_pages(
+        self,
+        the_document: Union[bytes, str],
+        page_numbers: Optional[List[int]] = None,
+        parallel: bool = True,
+    )->List[PageExtractionResult]:
+        """
+        Rasterize and OCR the given pages of a PDF document, or all of its pages.
+        Every requested page is rendered in memory before OCR starts, see ocr_pages_streaming
+        for large documents.
+        :param the_document: bytes or path of the PDF document
+        :param page_numbers:
+        :param parallel:
+        :return:
+        """
+        thread_count = self.max_workers if parallel else 1
+        convert_document = convert_from_bytes if isinstance(the_document, bytes) else convert_from_path
+        # Convert PDF to a list of PIL images for each page
+        # Because not all PDFs are text-based, we need to convert them to images
+        numbered_images: List[Tuple[int, Union[str, Image]]] = []
+        if page_numbers is None:
+            images = convert_document(
+                the_document,
+                dpi=self.dpi,
+                grayscale=self.grayscale,
+                thread_count=thread_count,
+            )
+            numbered_images = list(enumerate(images, start=1))
+        else:
+            for first_page, last_page in group_page_ranges(sorted(page_numbers)):
+                images = convert_document(
+                    the_document,
+                    dpi=self.dpi,
+                    grayscale=self.grayscale,
+                    first_page=first_page,
+                    last_page=last_page,
+                    thread_count=thread_count,
+                )
+                numbered_images.extend(enumerate(images, start=first_page))
+
+        return self.map_ocr_pages(numbered_images, parallel=parallel)
+
+    def ocr_pages_streaming(
+        self,
+        the_document: Union[bytes, str],
+        page_numbers: Optional[List[int]] = None,
+        parallel: bool = True,
+    )->List[PageExtractionResult]:
+        """
+        Rasterize and OCR the given pages of a PDF document, or all of its pages, in windows of
+        streaming_window_size pages. Each window is rendered to files in a temporary directory and
+        removed after its OCR, so the peak memory does not depend on the number of pages.
+        :param the_document: bytes or path of the PDF document
+        :param page_numbers:
+        :param parallel:
+        :return:
+        """
+        thread_count = self.max_workers if parallel else 1
+        pages: List[PageExtractionResult] = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if isinstance(the_document, bytes):
+                # Write the PDF once, instead of once per window as convert_from_bytes would do
+                pdf_path = os.path.join(temp_dir, pdf_extraction_constants.STREAMING_PDF_FILE_NAME)
+                with open(pdf_path, "wb") as pdf_file:
+                    pdf_file.write(the_document)
+            else:
+                pdf_path = the_document
+
+            if page_numbers is None:
+                page_ranges = [(1, int(pdfinfo_from_path(pdf_path)["Pages"]))]
+            else:
+                page_ranges = group_page_ranges(sorted(page_numbers))
+
+            for first_page, last_page in split_page_windows(page_ranges, self.streaming_window_size):
+                with tempfile.TemporaryDirectory(dir=temp_dir) as window_dir:
+                    image_paths = convert_from_path(
+                        pdf_path,
+                        dpi=self.dpi,
+                        grayscale=self.grayscale,
+                        first_page=first_page,
+                        last_page=last_page,
+                        output_folder=window_dir,
+                        fmt=pdf_extraction_constants.RASTER_IMAGE_FORMAT,
+                        paths_only=True,
+                        thread_count=thread_count,
+                    )
+                    pages.extend(self.map_ocr_pages(
+                        list(enumerate(image_paths, start=first_page)),
+                        parallel=parallel,
+                    ))
+        return pages
+
+    def count_pages(self, the_document: Union[bytes, str])->int:
+        """
+        Count the pages of a PDF document with pdfinfo
+        :param the_document: bytes or path of the PDF document
+        :return:
+        """
+        if isinstance(the_document, bytes):
+            return int(pdfinfo_from_bytes(the_document)["Pages"])
+        return int(pdfinfo_from_path(the_document)["Pages"])
+
+    def ocr_pages_cached(
+        self,
+        the_document: Union[bytes, str],
+        document_hash: str,
+        page_numbers: Optional[List[int]] = None,
+        parallel: bool = True,
+        streaming: bool = True,
+    )->List[PageExtractionResult]:
+        """
+        OCR the given pages of a PDF document, or all of its pages. Cached pages are taken from
+        the OCR cache, only the missing pages are rasterized and OCR'd, then cached.
+        :param the_document: bytes or path of the PDF document
+        :param document_hash: hash of the PDF document, part of the cache key
+        :param page_numbers:
+        :param parallel:
+        :param streaming:
+        :return:
+        """
+        ocr_pages = self.ocr_pages_streaming if streaming else self.ocr_pages
+        if self.ocr_cache is None:
+            return ocr_pages(the_document, page_numbers=page_numbers, parallel=parallel)
+
+        if page_numbers is None:
+            page_numbers = list(range(1, self.count_pages(the_document) + 1))
+        pages: List[PageExtractionResult] = []
+        missing_page_numbers: List[int] = []
+        for page_number in page_numbers:
+            cached_page = self.ocr_cache.get(document_hash, page_number)
+            if cached_page is None:
+                missing_page_numbers.append(page_number)
+            else:
+                pages.append(cached_page)
+
+        if missing_page_numbers:
+            ocr_results = ocr_pages(the_document, page_numbers=missing_page_numbers, parallel=parallel)
+            for page in ocr_results:
+                self.ocr_cache.set(document_hash, page)
+            pages.extend(ocr_results)
+        logger.info(
+            f"ocr_pages_cached: {len(pages) - len(missing_page_numbers)}/{len(pages)} pages from the OCR cache, "
+            f"cache hit rate {self.ocr_cache.get_hit_rate():.1%}"
+        )
+        pages.sort(key=lambda page: page.page_number)
+        return pages
+
+    def extract_pages(
+        self,
+        the_document: Union[bytes, str],
+        parallel: bool = True,
+        text_layer_first: bool = True,
+        streaming: bool = True,
+        document_hash: Optional[str] = None,
+    )->DocumentExtractionResult:
+        """
+        Extract the text of every page of a PDF document.
+        With text_layer_first, the embedded text layer is used and only the pages
+        without a usable text layer are rasterized and OCR'd.
+        :param the_document: bytes or path of the PDF document
+        :param parallel:
+        :param text_layer_first:
+        :param streaming: rasterize in bounded windows of pages instead of all at once
+        :param document_hash: SHA-256 of the PDF document to look the OCR cache up,
+            computed from the document if None
+        :return:
+        """
+        started_at = time.perf_counter()
+        if self.ocr_cache is not None and document_hash is None:
+            document_hash = hash_a_document(the_document)
+        ocr_pages = functools.partial(self.ocr_pages_cached, document_hash=document_hash, streaming=streaming)
+        pages: List[PageExtractionResult] = []
+        if text_layer_first:
+            try:
+                n_pages, text_layer_pages = self.extract_text_layer(the_document)
+                ocr_page_numbers = [
+                    page_number for page_number in range(1, n_pages + 1) if page_number not in text_layer_pages
+                ]
+                pages = list(text_layer_pages.values())
+                if ocr_page_numbers:
+                    pages.extend(ocr_pages(the_document, page_numbers=ocr_page_numbers, parallel=parallel))
+                pages.sort(key=lambda page: page.page_number)
+            except PyPdfError as e:
+                logger.warning(f"extract_pages: Text layer is not readable, falling back to OCR: {e}")
+                pages = ocr_pages(the_document, parallel=parallel)
+        else:
+            pages = ocr_pages(the_document, parallel=parallel)
+
+        return DocumentExtractionResult(
+            pages=pages,
+            elapsed_seconds=time.perf_counter() - started_at,
+        )
+
+pdf_extraction_service = PdfExtractionService(
+    max_workers=settings.OCR_MAX_WORKERS,
+    dpi=settings.OCR_DPI,
+    grayscale=settings.OCR_GRAYSCALE,
+    streaming_window_size=settings.OCR_STREAMING_WINDOW_SIZE,
+    language=settings.OCR_LANGUAGE,
+    tesseract_config=settings.OCR_TESSERACT_CONFIG,
+    ocr_cache=OcrCache(
+        cache_dir=settings.OCR_CACHE_DIR,
+        max_size_bytes=settings.OCR_CACHE_MAX_SIZE_BYTES,
+        dpi=settings.OCR_DPI,
+        grayscale=settings.OCR_GRAYSCALE,
+        language=settings.OCR_LANGUAGE,
+        tesseract_config=settings.OCR_TESSERACT_CONFIG,
+    ) if settings.OCR_CACHE_ENABLED else None,
+)
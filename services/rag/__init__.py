@@ -1,2 +1,11 @@
 from services.rag.init_nltk_data import init_nltk_data
+from services.rag.chunk_records import ChunkDiff, diff_chunk_hashes, get_content_hash
+from services.rag.sentence_tokenizer import (
+    SentenceTokenizer,
+    read_corpus,
+    sentence_tokenizer,
+    train_sentence_tokenizer,
+)
+from services.rag.token_chunking import TokenOffsets, count_tokens, get_encoding
+from services.rag.semantic_chunking import SemanticChunkingEngine
 from services.rag.chunking import Chunking
@@ -0,0 +1,218 @@
+from array import array
+from bisect import bisect_right
+from collections import defaultdict, deque
+import hashlib
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union, overload
+
+from constants.services import chunking as chunking_constants
+
+def get_content_hash(text: str)->str:
+    """
+    Get the SHA-256 of the text of a chunk
+    :param text:
+    :return:
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def get_page_number(page_offsets: Optional[Sequence[int]], offset: int)->Optional[int]:
+    """
+    Get the 1-based page number of a character offset
+    :param page_offsets: sorted start offsets of the pages in the source
+    :param offset:
+    :return: None without page offsets
+    """
+    if not page_offsets:
+        return None
+    return max(bisect_right(page_offsets, offset), 1)
+
+class ChunkRecord:
+    """
+    A chunk as a span of its source text. The text is sliced from the source on access,
+    the content hash is computed on first access.
+    """
+    __slots__ = ("source", "start", "end", "page_number", "hierarchy", "_content_hash")
+
+    def __init__(
+        self,
+        source: str,
+        start: int,
+        end: int,
+        page_number: Optional[int] = None,
+        hierarchy: Optional[List[str]] = None,
+    ):
+        """
+        :param source: the whole text the chunk is a span of, shared by all the chunks, not copied
+        :param start: start offset in the source
+        :param end: end offset in the source, exclusive
+        :param page_number: page of the start offset
+        :param hierarchy: place of the chunk in the document structure, e.g. for legal chunks
+        """
+        self.source = source
+        self.start = start
+        self.end = end
+        self.page_number = page_number
+        self.hierarchy = hierarchy
+        self._content_hash: Optional[str] = None
+
+    @property
+    def text(self)->str:
+        """
+        Text of the chunk
+        :return:
+        """
+        return self.source[self.start:self.end]
+
+    @property
+    def content_hash(self)->str:
+        """
+        SHA-256 of the text of the chunk
+        :return:
+        """
+        if self._content_hash is None:
+            self._content_hash = get_content_hash(self.text)
+        return self._content_hash
+
+    def __len__(self)->int:
+        return self.end - self.start
+
+    def __eq__(self, other)->bool:
+        if not isinstance(other, ChunkRecord):
+            return NotImplemented
+        return (self.start, self.end, self.page_number, self.hierarchy, self.text) == (
+            other.start, other.end, other.page_number, other.hierarchy, other.text
+        )
+
+    def __repr__(self)->str:
+        return f"ChunkRecord(start={self.start}, end={self.end}, page_number={self.page_number})"
+
+class ChunkRecordList(Sequence[ChunkRecord]):
+    """
+    Compact list of the chunks of a source text. The spans and page numbers are kept in
+    arrays of integers, a ChunkRecord is only built when a chunk is accessed.
+    """
+    def __init__(self, source: str, page_offsets: Optional[Sequence[int]] = None):
+        """
+        :param source:
+        :param page_offsets: sorted start offsets of the pages in the source
+        """
+        self.source = source
+        self.page_offsets = page_offsets
+        self.starts = array(chunking_constants.CHUNK_OFFSET_TYPECODE)
+        self.ends = array(chunking_constants.CHUNK_OFFSET_TYPECODE)
+        self.page_numbers = array(chunking_constants.CHUNK_OFFSET_TYPECODE)
+        self.hierarchies: Optional[List[Optional[List[str]]]] = None
+
+    def append(self, start: int, end: int, hierarchy: Optional[List[str]] = None):
+        """
+        Append the span of a chunk
+        :param start:
+        :param end:
+        :param hierarchy:
+        :return:
+        """
+        self.starts.append(start)
+        self.ends.append(end)
+        page_number = get_page_number(self.page_offsets, start)
+        self.page_numbers.append(page_number if page_number is not None else chunking_constants.NO_PAGE_NUMBER)
+        if hierarchy is not None and self.hierarchies is None:
+            self.hierarchies = [None] * (len(self.starts) - 1)
+        if self.hierarchies is not None:
+            self.hierarchies.append(hierarchy)
+
+    def get_record(self, index: int)->ChunkRecord:
+        """
+        Build the record of a chunk
+        :param index:
+        :return:
+        """
+        page_number = self.page_numbers[index]
+        return ChunkRecord(
+            self.source,
+            self.starts[index],
+            self.ends[index],
+            page_number=None if page_number == chunking_constants.NO_PAGE_NUMBER else page_number,
+            hierarchy=self.hierarchies[index] if self.hierarchies is not None else None,
+        )
+
+    @overload
+    def __getitem__(self, index: int)->ChunkRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice)->List[ChunkRecord]: ...
+
+    def __getitem__(self, index: Union[int, slice])->Union[ChunkRecord, List[ChunkRecord]]:
+        if isinstance(index, slice):
+            return [self.get_record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.get_record(index)
+
+    def __len__(self)->int:
+        return len(self.starts)
+
+    def get_texts(self)->List[str]:
+        """
+        Slice the text of every chunk
+        :return:
+        """
+        return [self.source[start:end] for start, end in zip(self.starts, self.ends)]
+
+    def get_content_hashes(self)->List[str]:
+        """
+        Hash the text of every chunk
+        :return:
+        """
+        return [get_content_hash(self.source[start:end]) for start, end in zip(self.starts, self.ends)]
+
+def iter_chunk_spans(source: str, chunks: Iterable[str], overlapping: bool = False)->Iterator[Tuple[int, int]]:
+    """
+    Locate chunks, given in order, in their source. A chunk that is not a span of the source,
+    e.g. a chunk whose whitespace was normalized, is skipped.
+    :param source:
+    :param chunks:
+    :param overlapping: the chunks may overlap, e.g. recursive chunks with an overlap
+    :return: iterator of (start, end)
+    """
+    cursor = 0
+    for chunk in chunks:
+        start = source.find(chunk, cursor)
+        if start < 0:
+            continue
+        end = start + len(chunk)
+        cursor = start + 1 if overlapping else end
+        yield start, end
+
+class ChunkDiff(NamedTuple):
+    """
+    Difference between the stored chunks of a document and its new chunks, by content hash
+    """
+    # (stored index, new index) of the chunks found in both
+    kept: List[Tuple[int, int]]
+    # new indexes of the chunks that are not stored
+    added: List[int]
+    # stored indexes of the chunks that are not in the new chunks
+    deleted: List[int]
+
+def diff_chunk_hashes(stored_hashes: Sequence[str], new_hashes: Sequence[str])->ChunkDiff:
+    """
+    Match the new chunks to the stored chunks by content hash. A hash found several times is
+    matched as many times as it is found in both, in order.
+    :param stored_hashes:
+    :param new_hashes:
+    :return:
+    """
+    stored_indexes: Dict[str, Deque[int]] = defaultdict(deque)
+    for stored_index, stored_hash in enumerate(stored_hashes):
+        stored_indexes[stored_hash].append(stored_index)
+
+    kept: List[Tuple[int, int]] = []
+    added: List[int] = []
+    for new_index, new_hash in enumerate(new_hashes):
+        if stored_indexes.get(new_hash):
+            kept.append((stored_indexes[new_hash].popleft(), new_index))
+        else:
+            added.append(new_index)
+    deleted = sorted(stored_index for indexes in stored_indexes.values() for stored_index in indexes)
+    return ChunkDiff(kept=kept, added=added, deleted=deleted)
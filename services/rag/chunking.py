@@ -1,71 +1,516 @@
-from typing import List, Literal, Optional
+from collections import deque
+import re
+from typing import Iterable, Iterator, List, Literal, Optional, Sequence, Tuple, Union
 
 from pydantic import SecretStr
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_experimental.text_splitter import SemanticChunker
 from langchain_openai import OpenAIEmbeddings
-from nltk.tokenize import sent_tokenize
 
-from services.rag.init_nltk_data import init_nltk_data
+from constants.services import chunking as chunking_constants
+from core.logger import logger
+from schemas import LegalChunk
+from services.rag.chunk_records import ChunkRecordList, iter_chunk_spans
+from services.rag.semantic_chunking import EmbedFunction, SemanticChunkingEngine
+from services.rag.sentence_tokenizer import sentence_tokenizer
+from services.rag.token_chunking import TokenOffsets, get_encoding
+
+LEGAL_BAB_PATTERN = re.compile(chunking_constants.LEGAL_BAB_PATTERN)
+LEGAL_BAGIAN_PATTERN = re.compile(chunking_constants.LEGAL_BAGIAN_PATTERN)
+LEGAL_PARAGRAF_PATTERN = re.compile(chunking_constants.LEGAL_PARAGRAF_PATTERN)
+LEGAL_PASAL_PATTERN = re.compile(chunking_constants.LEGAL_PASAL_PATTERN, re.IGNORECASE)
+LEGAL_AYAT_PATTERN = re.compile(chunking_constants.LEGAL_AYAT_PATTERN)
+LEGAL_HURUF_PATTERN = re.compile(chunking_constants.LEGAL_HURUF_PATTERN)
+LEGAL_PENJELASAN_PATTERN = re.compile(chunking_constants.LEGAL_PENJELASAN_PATTERN)
+# Divisions above the articles, from the highest to the lowest
+LEGAL_DIVISION_PATTERNS = (LEGAL_BAB_PATTERN, LEGAL_BAGIAN_PATTERN, LEGAL_PARAGRAF_PATTERN)
+# Units an oversize article is split by, from the highest to the lowest, with their labels
+LEGAL_UNIT_LEVELS = (
+    (LEGAL_AYAT_PATTERN, chunking_constants.LEGAL_AYAT_LABEL, chunking_constants.LEGAL_AYAT_RANGE_LABEL),
+    (LEGAL_HURUF_PATTERN, chunking_constants.LEGAL_HURUF_LABEL, chunking_constants.LEGAL_HURUF_RANGE_LABEL),
+)
+
+def format_sentence(sentence: str)->str:
+    """
+    Strip a sentence and end it with a period
+    :param sentence:
+    :return:
+    """
+    stripped_sentence = sentence.strip()
+    if not stripped_sentence:
+        return stripped_sentence
+    return stripped_sentence + '.' if stripped_sentence[-1] != "." else stripped_sentence
+
+def split_legal_units(lines: List[str], unit_pattern: re.Pattern)->List[Tuple[Optional[str], List[str]]]:
+    """
+    Split the lines of an article into units, e.g. ayat, each starting at a line matching unit_pattern.
+    The lines before the first unit are a unit without label.
+    :param lines:
+    :param unit_pattern:
+    :return: list of (unit label, unit lines)
+    """
+    units: List[Tuple[Optional[str], List[str]]] = []
+    for line in lines:
+        match = unit_pattern.match(line.strip())
+        if match or not units:
+            units.append((match.group(1) if match else None, [line]))
+        else:
+            units[-1][1].append(line)
+    return units
+
+def iter_legal_unit_chunks(
+    hierarchy: List[str],
+    lines: List[str],
+    max_chunk_size: int,
+    unit_levels: Sequence[Tuple[re.Pattern, str, str]] = LEGAL_UNIT_LEVELS,
+    with_hierarchy: bool = False,
+)->Iterator[LegalChunk]:
+    """
+    Chunk an article under max_chunk_size characters. An oversize article is split into groups of
+    consecutive units of the first level, e.g. ayat (1)-(3), an oversize unit is split by the next
+    level, e.g. huruf, and the lowest level is split by characters.
+    :param hierarchy: hierarchy of the article
+    :param lines:
+    :param max_chunk_size:
+    :param unit_levels: tuples of (unit pattern, label format, range label format)
+    :param with_hierarchy: count the hierarchy prefix of get_text_with_hierarchy in the size of a chunk
+    :return:
+    """
+    text = chunking_constants.LINE_SEPARATOR.join(lines).strip()
+    if not text:
+        return
+    legal_chunk = LegalChunk(text=text, hierarchy=hierarchy)
+    text_budget = max_chunk_size
+    if with_hierarchy:
+        text_budget = max(max_chunk_size - len(legal_chunk.get_hierarchy_prefix()), 1)
+    if len(text) <= text_budget:
+        yield legal_chunk
+        return
+    if not unit_levels:
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=text_budget, chunk_overlap=0)
+        for split_text in text_splitter.split_text(text):
+            yield LegalChunk(text=split_text, hierarchy=hierarchy)
+        return
+
+    unit_pattern, label_format, range_label_format = unit_levels[0]
+    units = split_legal_units(lines, unit_pattern)
+    if len(units) == 1:
+        yield from iter_legal_unit_chunks(hierarchy, lines, max_chunk_size, unit_levels[1:], with_hierarchy)
+        return
+
+    unit_groups: List[Tuple[List[str], List[str]]] = []
+    group_size = 0
+    for label, unit_lines in units:
+        unit_size = sum(len(line) + 1 for line in unit_lines)
+        if unit_groups and group_size + unit_size <= text_budget:
+            unit_groups[-1][0].append(label)
+            unit_groups[-1][1].extend(unit_lines)
+            group_size += unit_size
+        else:
+            unit_groups.append(([label], list(unit_lines)))
+            group_size = unit_size
+
+    for labels, group_lines in unit_groups:
+        unit_labels = [label for label in labels if label is not None]
+        group_hierarchy = hierarchy
+        if len(unit_labels) == 1:
+            group_hierarchy = hierarchy + [label_format.format(first=unit_labels[0])]
+        elif unit_labels:
+            group_hierarchy = hierarchy + [range_label_format.format(first=unit_labels[0], last=unit_labels[-1])]
+        yield from iter_legal_unit_chunks(group_hierarchy, group_lines, max_chunk_size, unit_levels[1:], with_hierarchy)
 
 class Chunking:
     """
     Chunking class to handle chunking of documents.
+    The text is given whole, or as a stream of pieces, e.g. the text of every page, that the
+    iter_* methods chunk lazily with a bounded buffer. The text of a stream is the concatenation
+    of its pieces.
+    With with_offsets, the chunking methods return a ChunkRecordList of spans of the text instead
+    of strings, with the page number of every chunk if the page offsets are known.
     """
-    def __init__(self, full_text: str):
+    def __init__(
+        self,
+        full_text: str = "",
+        text_stream: Optional[Iterable[str]] = None,
+        page_offsets: Optional[Sequence[int]] = None,
+    ):
         """
         Initialize the Chunking class with the full text to be chunked.
         :param full_text:
+        :param text_stream: pieces of the text to be chunked, used instead of full_text if given.
+            A stream can only be chunked once.
+        :param page_offsets: sorted start offsets of the pages in the text
         """
-        init_nltk_data()
         self.full_text = full_text
+        self.text_stream = text_stream
+        self.page_offsets = page_offsets
+
+    @classmethod
+    def from_pages(cls, page_texts: Iterable[str], separator: str = chunking_constants.PAGE_SEPARATOR)->"Chunking":
+        """
+        Initialize the Chunking class with the text of every page, joined by separator
+        :param page_texts:
+        :param separator:
+        :return:
+        """
+        page_offsets: List[int] = []
+        offset = 0
+        page_text_list = list(page_texts)
+        for page_text in page_text_list:
+            page_offsets.append(offset)
+            offset += len(page_text) + len(separator)
+        return cls(separator.join(page_text_list), page_offsets=page_offsets)
+
+    def get_source(self)->str:
+        """
+        Get the whole text the chunk records are spans of, a text stream is joined once
+        :return:
+        """
+        if self.text_stream is not None:
+            self.full_text = "".join(self.text_stream)
+            self.text_stream = None
+        return self.full_text
+
+    def to_chunk_records(
+        self,
+        chunks: Iterable[Union[str, LegalChunk]],
+        overlapping: bool = False,
+    )->ChunkRecordList:
+        """
+        Locate chunks, given in order, in the text and keep them as spans
+        :param chunks:
+        :param overlapping: the chunks may overlap
+        :return:
+        """
+        source = self.get_source()
+        chunk_records = ChunkRecordList(source, self.page_offsets)
+        cursor = 0
+        n_unlocated_chunks = 0
+        for chunk in chunks:
+            chunk_text, hierarchy = (chunk.text, chunk.hierarchy) if isinstance(chunk, LegalChunk) else (chunk, None)
+            start = source.find(chunk_text, cursor)
+            if start < 0:
+                n_unlocated_chunks += 1
+                continue
+            end = start + len(chunk_text)
+            cursor = start + 1 if overlapping else end
+            chunk_records.append(start, end, hierarchy)
+        if n_unlocated_chunks:
+            logger.warning(f"to_chunk_records: {n_unlocated_chunks} chunks are not spans of the text, skipped.")
+        return chunk_records
+
+    def get_sentence_spans(self)->List[Tuple[int, int]]:
+        """
+        Get the (start, end) span of every sentence of the text
+        :return:
+        """
+        return list(iter_chunk_spans(self.get_source(), self.iter_sentences()))
+
+    def iter_text(self)->Iterator[str]:
+        """
+        Iterate the pieces of the text to be chunked
+        :return:
+        """
+        if self.text_stream is not None:
+            yield from self.text_stream
+        elif self.full_text:
+            yield self.full_text
+
+    def iter_lines(self)->Iterator[str]:
+        """
+        Lazily split the text into lines
+        :return:
+        """
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            *lines, buffer = buffer.split(chunking_constants.LINE_SEPARATOR)
+            yield from lines
+        if buffer:
+            yield buffer
+
+    def iter_fixed_length(self, chunk_length: int = 1000) -> Iterator[str]:
+        """
+        Lazily chunk the text into fixed length chunks.
+        :param chunk_length:
+        :return:
+        """
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            n_full_chunks = len(buffer) // chunk_length
+            for i in range(n_full_chunks):
+                yield buffer[i * chunk_length:(i + 1) * chunk_length]
+            buffer = buffer[n_full_chunks * chunk_length:]
+        if buffer:
+            yield buffer
 
-    def fixed_length(self, chunk_length: int = 1000) -> List[str]:
+    def fixed_length(self, chunk_length: int = 1000, with_offsets: bool = False) -> Union[List[str], ChunkRecordList]:
         """
         Chunk the text into fixed length chunks.
         :param chunk_length:
+        :param with_offsets: return chunk records instead of strings
         :return:
         """
-        chunks = []
-        for i in range(0, len(self.full_text), chunk_length):
-            chunks.append(self.full_text[i:i + chunk_length])
-        return chunks
+        if with_offsets:
+            source = self.get_source()
+            chunk_records = ChunkRecordList(source, self.page_offsets)
+            for start in range(0, len(source), chunk_length):
+                chunk_records.append(start, min(start + chunk_length, len(source)))
+            return chunk_records
+        return list(self.iter_fixed_length(chunk_length))
 
-    def sentence_based(self) -> List[str]:
+    def iter_token_based(
+        self,
+        max_tokens: int = 512,
+        overlap_tokens: int = 64,
+        model_name: Optional[str] = None,
+    ) -> Iterator[str]:
         """
-        Chunk the text into sentence based chunks.
+        Lazily chunk the text into chunks of at most max_tokens tokens of the model's tokenizer.
+        The buffer is encoded once it holds about STREAM_TOKEN_WINDOW_CHUNKS chunks, every chunk
+        but the last one is yielded and the buffer restarts at the last chunk.
+        :param max_tokens:
+        :param overlap_tokens: tokens shared by consecutive chunks
+        :param model_name: model whose tokenizer counts the tokens, e.g. "text-embedding-3-large"
+        :return:
+        """
+        encoding = get_encoding(model_name)
+        window_size = (
+            max_tokens * chunking_constants.STREAM_TOKEN_CHARS_PER_TOKEN * chunking_constants.STREAM_TOKEN_WINDOW_CHUNKS
+        )
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            if len(buffer) < window_size:
+                continue
+            windows = list(TokenOffsets(buffer, encoding).iter_windows(max_tokens, overlap_tokens))
+            if len(windows) > 1 and windows[-1][0] > 0:
+                for start, end in windows[:-1]:
+                    yield buffer[start:end]
+                buffer = buffer[windows[-1][0]:]
+        if buffer:
+            for start, end in TokenOffsets(buffer, encoding).iter_windows(max_tokens, overlap_tokens):
+                yield buffer[start:end]
+
+    def token_based(
+        self,
+        max_tokens: int = 512,
+        overlap_tokens: int = 64,
+        model_name: Optional[str] = None,
+        with_offsets: bool = False,
+    ) -> Union[List[str], ChunkRecordList]:
+        """
+        Chunk the text into chunks of at most max_tokens tokens of the model's tokenizer.
+        The text is encoded once, the chunks are cut at the prefix sums of the token lengths.
+        :param max_tokens:
+        :param overlap_tokens: tokens shared by consecutive chunks
+        :param model_name: model whose tokenizer counts the tokens, e.g. "text-embedding-3-large"
+        :param with_offsets: return chunk records instead of strings
+        :return:
+        """
+        source = self.get_source()
+        windows = TokenOffsets(source, get_encoding(model_name)).iter_windows(max_tokens, overlap_tokens)
+        if with_offsets:
+            chunk_records = ChunkRecordList(source, self.page_offsets)
+            for start, end in windows:
+                chunk_records.append(start, end)
+            return chunk_records
+        return [source[start:end] for start, end in windows]
+
+    def iter_sentences(self)->Iterator[str]:
+        """
+        Lazily split the text into sentences. The last sentence of the buffer may continue in the
+        next piece, so it is kept until a later sentence starts or the stream ends.
+        A buffer without any sentence boundary is flushed at STREAM_MAX_SENTENCE_BUFFER_SIZE.
         :return:
         """
-        chunks = []
-        sentences = sent_tokenize(self.full_text)
-        for sentence in sentences:
-            current_chunk = sentence.strip() + '.' if sentence.strip()[-1] != "." else sentence.strip()
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            sentence_spans = sentence_tokenizer.span_tokenize(buffer)
+            if len(sentence_spans) > 1:
+                yield from (buffer[start:end] for start, end in sentence_spans[:-1])
+                buffer = buffer[sentence_spans[-1][0]:]
+            elif len(buffer) > chunking_constants.STREAM_MAX_SENTENCE_BUFFER_SIZE:
+                yield from (buffer[start:end] for start, end in sentence_spans)
+                buffer = ""
+        if buffer:
+            yield from sentence_tokenizer.tokenize(buffer)
+
+    def iter_sentence_based(self) -> Iterator[str]:
+        """
+        Lazily chunk the text into sentence based chunks.
+        :return:
+        """
+        for sentence in self.iter_sentences():
+            current_chunk = format_sentence(sentence)
             if len(current_chunk) > 1:
-                chunks.append(current_chunk)
-        return chunks
+                yield current_chunk
+
+    def sentence_based(self, with_offsets: bool = False) -> Union[List[str], ChunkRecordList]:
+        """
+        Chunk the text into sentence based chunks.
+        :param with_offsets: return chunk records instead of strings, a record is the span of the
+            sentence in the text, without the period added to the string chunk
+        :return:
+        """
+        if with_offsets:
+            source = self.get_source()
+            chunk_records = ChunkRecordList(source, self.page_offsets)
+            for start, end in self.get_sentence_spans():
+                if len(format_sentence(source[start:end])) > 1:
+                    chunk_records.append(start, end)
+            return chunk_records
+        return list(self.iter_sentence_based())
+
+    def iter_paragraph_based(self) -> Iterator[str]:
+        """
+        Lazily chunk the text into paragraph based chunks.
+        :return:
+        """
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            *paragraphs, buffer = buffer.split(chunking_constants.PARAGRAPH_SEPARATOR)
+            for paragraph in paragraphs:
+                current_chunk = paragraph.strip()
+                if len(current_chunk) > 0:
+                    yield current_chunk
+        current_chunk = buffer.strip()
+        if len(current_chunk) > 0:
+            yield current_chunk
 
-    def paragraph_based(self) -> List[str]:
+    def paragraph_based(self, with_offsets: bool = False) -> Union[List[str], ChunkRecordList]:
         """
         Chunk the text into paragraph based chunks.
+        :param with_offsets: return chunk records instead of strings
         :return:
         """
-        chunks = []
-        paragraphs = self.full_text.split('\n\n')
-        for paragraph in paragraphs:
-            current_chunk = paragraph.strip()
-            if len(current_chunk) > 0:
-                chunks.append(current_chunk)
-        return chunks
+        if with_offsets:
+            return self.to_chunk_records(self.iter_paragraph_based())
+        return list(self.iter_paragraph_based())
 
-    def sliding_windows(self, n_slide: int = 1) -> List[str]:
+    def iter_sliding_windows(self, n_slide: int = 1) -> Iterator[str]:
+        """
+        Lazily chunk the text into sliding windows of n_slide sentences.
+        :param n_slide:
+        :return:
+        """
+        window = deque(maxlen=n_slide)
+        for sentence in self.iter_sentences():
+            window.append(sentence)
+            if len(window) == n_slide:
+                yield " ".join(window)
+
+    def sliding_windows(self, n_slide: int = 1, with_offsets: bool = False) -> Union[List[str], ChunkRecordList]:
         """
         Chunk the text into sliding windows.
+        :param n_slide:
+        :param with_offsets: return chunk records instead of strings, a record spans from the start
+            of the first sentence of the window to the end of the last one
         :return:
         """
-        sentences = sent_tokenize(self.full_text)
-        chunks = [" ".join(sentences[i:i + n_slide]) for i in range(len(sentences) - n_slide + 1)]
-        return chunks
+        if with_offsets:
+            sentence_spans = self.get_sentence_spans()
+            chunk_records = ChunkRecordList(self.get_source(), self.page_offsets)
+            for i in range(len(sentence_spans) - n_slide + 1):
+                chunk_records.append(sentence_spans[i][0], sentence_spans[i + n_slide - 1][1])
+            return chunk_records
+        return list(self.iter_sliding_windows(n_slide))
+
+    def iter_legal_structure_based(
+        self,
+        max_chunk_size: int = 2000,
+        with_hierarchy: bool = False,
+    ) -> Iterator[LegalChunk]:
+        """
+        Lazily chunk an Indonesian statute by its structure, in one pass over its lines.
+        Every Pasal is a chunk under its BAB, Bagian and Paragraf, a Pasal larger than max_chunk_size
+        is split by its ayat, then by its huruf. The text outside the articles, e.g. the preamble, is
+        chunked under the division it is in, and the elucidation is put under PENJELASAN.
+        :param max_chunk_size: size budget of a chunk, in characters
+        :param with_hierarchy: the budget is of get_text_with_hierarchy, hierarchy prefix included
+        :return:
+        """
+        root: List[str] = []
+        divisions: List[Optional[str]] = [None] * len(LEGAL_DIVISION_PATTERNS)
+        pending_title_level: Optional[int] = None
+        article_hierarchy: List[str] = []
+        article_lines: List[str] = []
+
+        for line in self.iter_lines():
+            stripped_line = line.strip()
+            if not stripped_line:
+                if article_lines:
+                    article_lines.append(line)
+                continue
+
+            is_penjelasan = LEGAL_PENJELASAN_PATTERN.match(stripped_line) is not None
+            is_pasal = LEGAL_PASAL_PATTERN.match(stripped_line) is not None
+            division_level, division_match = None, None
+            for level, division_pattern in enumerate(LEGAL_DIVISION_PATTERNS):
+                division_match = division_pattern.match(stripped_line)
+                if division_match:
+                    division_level = level
+                    break
+
+            if is_penjelasan or is_pasal or division_level is not None:
+                yield from iter_legal_unit_chunks(
+                    article_hierarchy,
+                    article_lines,
+                    max_chunk_size,
+                    with_hierarchy=with_hierarchy,
+                )
+                article_lines = []
+                pending_title_level = None
+                if is_penjelasan:
+                    root = [stripped_line]
+                    divisions = [None] * len(LEGAL_DIVISION_PATTERNS)
+                    article_hierarchy = list(root)
+                elif division_level is not None:
+                    divisions[division_level] = stripped_line
+                    for lower_level in range(division_level + 1, len(divisions)):
+                        divisions[lower_level] = None
+                    # The title of a division is usually on the line below its heading
+                    if division_match.end() == len(stripped_line):
+                        pending_title_level = division_level
+                    article_hierarchy = root + [division for division in divisions if division]
+                else:
+                    article_hierarchy = root + [division for division in divisions if division] + [stripped_line]
+                    article_lines = [line]
+                continue
+
+            if pending_title_level is not None:
+                title_level, pending_title_level = pending_title_level, None
+                if len(stripped_line) <= chunking_constants.LEGAL_TITLE_MAX_LENGTH:
+                    divisions[title_level] = f"{divisions[title_level]} {stripped_line}"
+                    article_hierarchy = root + [division for division in divisions if division]
+                    continue
+            article_lines.append(line)
+
+        yield from iter_legal_unit_chunks(
+            article_hierarchy,
+            article_lines,
+            max_chunk_size,
+            with_hierarchy=with_hierarchy,
+        )
+
+    def legal_structure_based(
+        self,
+        max_chunk_size: int = 2000,
+        with_offsets: bool = False,
+    ) -> Union[List[LegalChunk], ChunkRecordList]:
+        """
+        Chunk an Indonesian statute by its structure, see iter_legal_structure_based
+        :param max_chunk_size:
+        :param with_offsets: return chunk records, with their hierarchy, instead of legal chunks
+        :return:
+        """
+        if with_offsets:
+            return self.to_chunk_records(self.iter_legal_structure_based(max_chunk_size))
+        return list(self.iter_legal_structure_based(max_chunk_size))
 
     def semantic_chunking(
         self,
@@ -74,7 +519,8 @@ class Chunking:
         embedding_model: Literal["text-embedding-3-small", "text-embedding-3-large"] = "text-embedding-3-large",
         threshold_type: Literal["percentile", "standard_deviation", "interquartile", "gradient"] = "gradient",
         breakpoint_threshold_amount: Optional[float] = 95.,
-    )->List[str]:
+        with_offsets: bool = False,
+    )->Union[List[str], ChunkRecordList]:
         """
         Chunk the text by its semantic meaning
         :param openai_embedding_api_key:
@@ -82,6 +528,8 @@ class Chunking:
         :param embedding_model:
         :param threshold_type:
         :param breakpoint_threshold_amount:
+        :param with_offsets: return chunk records instead of strings, the chunks that are not
+            spans of the text are skipped
         :return:
         """
         text_splitter = SemanticChunker(
@@ -93,12 +541,55 @@ class Chunking:
             breakpoint_threshold_amount=breakpoint_threshold_amount,
             breakpoint_threshold_type=threshold_type,
         )
-        lang_documents = text_splitter.create_documents([self.full_text])
-        return [lang_document.page_content for lang_document in lang_documents]
+        lang_documents = text_splitter.create_documents([self.get_source()])
+        chunks = [lang_document.page_content for lang_document in lang_documents]
+        if with_offsets:
+            return self.to_chunk_records(chunks)
+        return chunks
 
-    def recursive_chunking(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
+    def local_semantic_chunking(
+        self,
+        embed_function: Optional[EmbedFunction] = None,
+        sentence_embeddings: Optional[Sequence[Sequence[float]]] = None,
+        threshold_type: Literal["percentile", "standard_deviation", "interquartile", "gradient"] = "percentile",
+        breakpoint_threshold_amount: Optional[float] = None,
+        buffer_size: int = 1,
+        min_chunk_size: Optional[int] = None,
+        with_offsets: bool = False,
+    )->Union[List[str], ChunkRecordList]:
         """
-        Chunk the text into recursive chunks.
+        Chunk the text by its semantic meaning without any API call: the sentences are embedded in
+        one batch by a local embed_function, or their embeddings are given, and the breakpoints
+        are computed with NumPy. The chunks are spans of the text.
+        :param embed_function: embeds a list of texts into a (n_texts, dim) matrix
+        :param sentence_embeddings: precomputed embeddings of the sentences of the text, in order
+        :param threshold_type:
+        :param breakpoint_threshold_amount:
+        :param buffer_size: neighbours of a sentence embedded with it on each side
+        :param min_chunk_size: a chunk shorter than this, in characters, is merged with the next one
+        :param with_offsets: return chunk records instead of strings
+        :return:
+        """
+        source = self.get_source()
+        chunk_spans = SemanticChunkingEngine(
+            embed_function=embed_function,
+            threshold_type=threshold_type,
+            breakpoint_threshold_amount=breakpoint_threshold_amount,
+            buffer_size=buffer_size,
+            min_chunk_size=min_chunk_size,
+        ).chunk_spans(source, sentence_embeddings)
+        if with_offsets:
+            chunk_records = ChunkRecordList(source, self.page_offsets)
+            for start, end in chunk_spans:
+                chunk_records.append(start, end)
+            return chunk_records
+        return [source[start:end] for start, end in chunk_spans]
+
+    def iter_recursive_chunking(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> Iterator[str]:
+        """
+        Lazily chunk the text into recursive chunks. The buffer is split once it holds
+        STREAM_RECURSIVE_WINDOW_CHUNKS chunks, every chunk but the last one is yielded and
+        the buffer restarts at the last chunk, which may continue in the next piece.
         :param chunk_size:
         :param chunk_overlap:
         :return:
@@ -106,7 +597,37 @@ class Chunking:
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            length_function=len
+            length_function=len,
+            add_start_index=True,
         )
-        chunks = text_splitter.split_text(self.full_text)
-        return chunks
+        window_size = chunk_size * chunking_constants.STREAM_RECURSIVE_WINDOW_CHUNKS
+        buffer = ""
+        for text in self.iter_text():
+            buffer += text
+            if len(buffer) < window_size:
+                continue
+            lang_documents = text_splitter.create_documents([buffer])
+            last_start_index = lang_documents[-1].metadata["start_index"] if lang_documents else -1
+            if len(lang_documents) > 1 and last_start_index > 0:
+                for lang_document in lang_documents[:-1]:
+                    yield lang_document.page_content
+                buffer = buffer[last_start_index:]
+        if buffer:
+            yield from text_splitter.split_text(buffer)
+
+    def recursive_chunking(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        with_offsets: bool = False,
+    ) -> Union[List[str], ChunkRecordList]:
+        """
+        Chunk the text into recursive chunks.
+        :param chunk_size:
+        :param chunk_overlap:
+        :param with_offsets: return chunk records instead of strings
+        :return:
+        """
+        if with_offsets:
+            return self.to_chunk_records(self.iter_recursive_chunking(chunk_size, chunk_overlap), overlapping=True)
+        return list(self.iter_recursive_chunking(chunk_size, chunk_overlap))
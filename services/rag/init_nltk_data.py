@@ -6,9 +6,9 @@ def init_nltk_data():
     :return:
     """
     try:
-        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('tokenizers/punkt_tab')
     except LookupError:
-        nltk.download('punkt')
+        nltk.download('punkt_tab')
 
 if __name__ == "__main__":
     init_nltk_data()
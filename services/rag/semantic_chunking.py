@@ -0,0 +1,164 @@
+from typing import Callable, List, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from constants.services import chunking as chunking_constants
+from services.rag.sentence_tokenizer import sentence_tokenizer
+
+EmbedFunction = Callable[[List[str]], Union[np.ndarray, Sequence[Sequence[float]]]]
+ThresholdType = Literal["percentile", "standard_deviation", "interquartile", "gradient"]
+
+def combine_sentences(sentences: Sequence[str], buffer_size: int = 1)->List[str]:
+    """
+    Function to join every sentence with its buffer_size neighbours on each side, the text
+    embedded for the sentence
+    :param sentences:
+    :param buffer_size:
+    :return:
+    """
+    return [
+        chunking_constants.SEMANTIC_SENTENCE_SEPARATOR.join(sentences[max(0, i - buffer_size):i + buffer_size + 1])
+        for i in range(len(sentences))
+    ]
+
+def get_adjacent_distances(embeddings: np.ndarray)->np.ndarray:
+    """
+    Function to compute the cosine distance between every embedding and the next one
+    :param embeddings: (n_sentences, dim) matrix
+    :return: (n_sentences - 1,) vector
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.where(norms == 0., 1., norms)
+    return 1. - np.einsum("ij,ij->i", normalized[:-1], normalized[1:])
+
+def get_breakpoint_threshold(
+    distances: np.ndarray,
+    threshold_type: ThresholdType,
+    breakpoint_threshold_amount: float,
+)->Tuple[float, np.ndarray]:
+    """
+    Function to compute the breakpoint threshold of the distances, as LangChain's SemanticChunker does
+    :param distances:
+    :param threshold_type:
+    :param breakpoint_threshold_amount:
+    :return: tuple of (threshold, values compared to the threshold)
+    """
+    if threshold_type == chunking_constants.SEMANTIC_THRESHOLD_PERCENTILE:
+        return float(np.percentile(distances, breakpoint_threshold_amount)), distances
+    if threshold_type == chunking_constants.SEMANTIC_THRESHOLD_STANDARD_DEVIATION:
+        return float(np.mean(distances) + breakpoint_threshold_amount * np.std(distances)), distances
+    if threshold_type == chunking_constants.SEMANTIC_THRESHOLD_INTERQUARTILE:
+        first_quartile, third_quartile = np.percentile(distances, [25, 75])
+        return float(np.mean(distances) + breakpoint_threshold_amount * (third_quartile - first_quartile)), distances
+    if threshold_type == chunking_constants.SEMANTIC_THRESHOLD_GRADIENT:
+        distance_gradient = np.gradient(distances) if len(distances) > 1 else np.zeros_like(distances)
+        return float(np.percentile(distance_gradient, breakpoint_threshold_amount)), distance_gradient
+    raise ValueError(f"Unexpected threshold type: {threshold_type}")
+
+class SemanticChunkingEngine:
+    """
+    Semantic chunking computed locally: the text is split into sentences, a chunk ends after
+    every sentence whose distance to the next one is above the breakpoint threshold.
+    The sentences are embedded in a single call to embed_function, e.g. a local model, or the
+    embeddings are given, and the distances and breakpoints are computed with NumPy.
+    The chunks are identical for identical sentence embeddings.
+    """
+    def __init__(
+        self,
+        embed_function: Optional[EmbedFunction] = None,
+        threshold_type: ThresholdType = "percentile",
+        breakpoint_threshold_amount: Optional[float] = None,
+        buffer_size: int = 1,
+        min_chunk_size: Optional[int] = None,
+    ):
+        """
+        Initialization function
+        :param embed_function: embeds a list of texts into a (n_texts, dim) matrix
+        :param threshold_type:
+        :param breakpoint_threshold_amount: SEMANTIC_THRESHOLD_DEFAULT_AMOUNTS of threshold_type if None
+        :param buffer_size: neighbours of a sentence embedded with it on each side
+        :param min_chunk_size: a chunk shorter than this, in characters, is merged with the next one
+        """
+        self.embed_function = embed_function
+        self.threshold_type = threshold_type
+        self.breakpoint_threshold_amount = (
+            breakpoint_threshold_amount
+            if breakpoint_threshold_amount is not None
+            else chunking_constants.SEMANTIC_THRESHOLD_DEFAULT_AMOUNTS[threshold_type]
+        )
+        self.buffer_size = buffer_size
+        self.min_chunk_size = min_chunk_size
+
+    def embed_sentences(self, sentences: List[str])->np.ndarray:
+        """
+        Embed every sentence with its neighbours
+        :param sentences:
+        :return: (n_sentences, dim) matrix
+        """
+        if self.embed_function is None:
+            raise ValueError("An embed_function or the sentence embeddings are required")
+        return np.asarray(self.embed_function(combine_sentences(sentences, self.buffer_size)))
+
+    def get_breakpoints(self, sentence_embeddings: np.ndarray)->np.ndarray:
+        """
+        Get the indexes of the sentences a chunk ends after
+        :param sentence_embeddings:
+        :return:
+        """
+        distances = get_adjacent_distances(sentence_embeddings)
+        if not len(distances):
+            return np.empty(0, dtype=np.int64)
+        threshold, values = get_breakpoint_threshold(
+            distances, self.threshold_type, self.breakpoint_threshold_amount
+        )
+        return np.flatnonzero(values > threshold)
+
+    def chunk_spans(
+        self,
+        text: str,
+        sentence_embeddings: Optional[Union[np.ndarray, Sequence[Sequence[float]]]] = None,
+    )->List[Tuple[int, int]]:
+        """
+        Get the (start, end) span of every chunk of a text
+        :param text:
+        :param sentence_embeddings: embeddings of the sentences of the text, in order, computed
+            with embed_function if None
+        :return:
+        """
+        sentence_spans = sentence_tokenizer.span_tokenize(text)
+        if len(sentence_spans) <= 1:
+            return sentence_spans
+        if sentence_embeddings is None:
+            sentence_embeddings = self.embed_sentences([text[start:end] for start, end in sentence_spans])
+        sentence_embeddings = np.asarray(sentence_embeddings)
+        if sentence_embeddings.shape[0] != len(sentence_spans):
+            raise ValueError(
+                f"Got {sentence_embeddings.shape[0]} sentence embeddings for {len(sentence_spans)} sentences"
+            )
+
+        chunk_spans: List[Tuple[int, int]] = []
+        first_sentence = 0
+        for last_sentence in self.get_breakpoints(sentence_embeddings).tolist():
+            start, end = sentence_spans[first_sentence][0], sentence_spans[last_sentence][1]
+            if self.min_chunk_size is not None and end - start < self.min_chunk_size:
+                continue
+            chunk_spans.append((start, end))
+            first_sentence = last_sentence + 1
+        if first_sentence < len(sentence_spans):
+            chunk_spans.append((sentence_spans[first_sentence][0], sentence_spans[-1][1]))
+        return chunk_spans
+
+    def chunk(
+        self,
+        text: str,
+        sentence_embeddings: Optional[Union[np.ndarray, Sequence[Sequence[float]]]] = None,
+    )->List[str]:
+        """
+        Chunk a text by its semantic meaning
+        :param text:
+        :param sentence_embeddings: embeddings of the sentences of the text, in order, computed
+            with embed_function if None
+        :return:
+        """
+        return [text[start:end] for start, end in self.chunk_spans(text, sentence_embeddings)]
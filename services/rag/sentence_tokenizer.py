@@ -0,0 +1,161 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import threading
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import nltk
+from nltk.tokenize.punkt import (
+    PunktParameters,
+    PunktSentenceTokenizer,
+    PunktTrainer,
+    load_punkt_params,
+    save_punkt_params,
+)
+
+from constants.services import chunking as chunking_constants
+from core.configs import settings
+from core.logger import logger
+from services.rag.init_nltk_data import init_nltk_data
+
+class SentenceTokenizer:
+    """
+    Punkt sentence tokenizer loaded once per process, on the first tokenization.
+    It loads the Punkt model stored in model_dir, e.g. one trained on our Indonesian corpus
+    with train_sentence_tokenizer, and falls back to the NLTK model of fallback_language.
+    The abbreviations are added to the model, so "No." or "Thn." never end a sentence.
+    """
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        fallback_language: str = chunking_constants.SENTENCE_TOKENIZER_FALLBACK_LANGUAGE,
+        abbreviations: Sequence[str] = chunking_constants.INDONESIAN_ABBREVIATIONS,
+    ):
+        """
+        Initialization function, the model is not loaded yet
+        :param model_dir: directory of a Punkt model saved by train_sentence_tokenizer
+        :param fallback_language: NLTK punkt_tab model used when there is no model in model_dir
+        :param abbreviations: lowercased abbreviations without their final period
+        """
+        self.model_dir = model_dir
+        self.fallback_language = fallback_language
+        self.abbreviations = abbreviations
+        self._tokenizer: Optional[PunktSentenceTokenizer] = None
+        self._lock = threading.Lock()
+
+    def load_params(self)->PunktParameters:
+        """
+        Load the Punkt parameters of the model and add the abbreviations
+        :return:
+        """
+        if self.model_dir and os.path.isdir(self.model_dir):
+            logger.info(f"SentenceTokenizer.load_params: Loading the Punkt model in {self.model_dir}.")
+            params = load_punkt_params(self.model_dir)
+        else:
+            resource = chunking_constants.SENTENCE_TOKENIZER_NLTK_RESOURCE.format(language=self.fallback_language)
+            try:
+                resource_path = nltk.data.find(resource)
+            except LookupError:
+                logger.info(f"SentenceTokenizer.load_params: No Punkt model for {self.fallback_language}, downloading it.")
+                init_nltk_data()
+                # An untrained model would split on every period, so a failed download raises the LookupError
+                resource_path = nltk.data.find(resource)
+            params = load_punkt_params(resource_path)
+        params.abbrev_types.update(self.abbreviations)
+        return params
+
+    def get_tokenizer(self)->PunktSentenceTokenizer:
+        """
+        Get the Punkt tokenizer, loading it on the first call
+        :return:
+        """
+        if self._tokenizer is None:
+            with self._lock:
+                if self._tokenizer is None:
+                    self._tokenizer = PunktSentenceTokenizer(self.load_params())
+        return self._tokenizer
+
+    def reload(self):
+        """
+        Drop the loaded model, e.g. after a new model is trained, so the next call loads it again
+        :return:
+        """
+        with self._lock:
+            self._tokenizer = None
+
+    def tokenize(self, text: str)->List[str]:
+        """
+        Split a text into sentences
+        :param text:
+        :return:
+        """
+        return self.get_tokenizer().tokenize(text)
+
+    def span_tokenize(self, text: str)->List[Tuple[int, int]]:
+        """
+        Get the (start, end) span of every sentence of a text
+        :param text:
+        :return:
+        """
+        return list(self.get_tokenizer().span_tokenize(text))
+
+    def tokenize_batch(self, texts: Iterable[str], max_workers: Optional[int] = None)->List[List[str]]:
+        """
+        Split many texts into sentences with a single model
+        :param texts:
+        :param max_workers: number of processes to tokenize with, the texts are tokenized in this
+            process if it is None or 1. Punkt is pure Python, so threads would not help.
+        :return: the sentences of every text, in order
+        """
+        tokenizer = self.get_tokenizer()
+        if max_workers is None or max_workers <= 1:
+            return [tokenizer.tokenize(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                tokenizer.tokenize, texts, chunksize=chunking_constants.SENTENCE_TOKENIZER_BATCH_CHUNK_SIZE
+            ))
+
+def train_sentence_tokenizer(
+    texts: Iterable[str],
+    model_dir: str,
+    abbreviations: Sequence[str] = chunking_constants.INDONESIAN_ABBREVIATIONS,
+)->PunktParameters:
+    """
+    Function to train a Punkt model on a corpus and save it in model_dir
+    :param texts: documents of the corpus, trained on one at a time
+    :param model_dir:
+    :param abbreviations: abbreviations known beforehand, added to the learnt ones
+    :return: parameters of the model
+    """
+    trainer = PunktTrainer()
+    trainer.INCLUDE_ALL_COLLOCS = True
+    n_texts = 0
+    for text in texts:
+        trainer.train(text, finalize=False)
+        n_texts += 1
+    trainer.finalize_training()
+    params = trainer.get_params()
+    params.abbrev_types.update(abbreviations)
+    os.makedirs(model_dir, exist_ok=True)
+    save_punkt_params(params, dir=model_dir)
+    logger.info(
+        f"train_sentence_tokenizer: Trained on {n_texts} documents, "
+        f"{len(params.abbrev_types)} abbreviations, saved in {model_dir}."
+    )
+    return params
+
+def read_corpus(file_paths: Iterable[str])->Iterator[str]:
+    """
+    Function to read the documents of a corpus of text files lazily, one at a time
+    :param file_paths: UTF-8 text files
+    :return: iterator of the text of every file, in order
+    """
+    for file_path in file_paths:
+        with open(file_path, encoding="utf-8") as corpus_file:
+            yield corpus_file.read()
+
+sentence_tokenizer = SentenceTokenizer(settings.SENTENCE_TOKENIZER_MODEL_DIR)
+
+if __name__ == "__main__":
+    # Train on text files, e.g. python -m services.rag.sentence_tokenizer corpus/*.txt
+    train_sentence_tokenizer(read_corpus(sys.argv[1:]), settings.SENTENCE_TOKENIZER_MODEL_DIR)
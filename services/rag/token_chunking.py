@@ -0,0 +1,100 @@
+from array import array
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+import tiktoken
+
+from constants.services import chunking as chunking_constants
+
+@lru_cache(maxsize=chunking_constants.TOKEN_ENCODINGS_CACHE_SIZE)
+def get_encoding(model_name: Optional[str] = None)->tiktoken.Encoding:
+    """
+    Function to get the tiktoken encoding of a model, loaded once per process
+    :param model_name: e.g. "gpt-4o" or "text-embedding-3-large", TOKEN_DEFAULT_ENCODING if None
+        or unknown to tiktoken
+    :return:
+    """
+    if model_name:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            pass
+    return tiktoken.get_encoding(chunking_constants.TOKEN_DEFAULT_ENCODING)
+
+def encode(text: str, encoding: tiktoken.Encoding)->list:
+    """
+    Function to encode a text, special tokens like "<|endoftext|>" are encoded as plain text
+    :param text:
+    :param encoding:
+    :return:
+    """
+    return encoding.encode(text, disallowed_special=())
+
+def count_tokens(text: str, model_name: Optional[str] = None)->int:
+    """
+    Function to count the tokens of a text for a model
+    :param text:
+    :param model_name:
+    :return:
+    """
+    return len(encode(text, get_encoding(model_name)))
+
+class TokenOffsets:
+    """
+    Tokens of a text, encoded once, with the prefix sums of their lengths in characters,
+    so the character span of any run of tokens is found without encoding again
+    """
+    def __init__(self, text: str, encoding: tiktoken.Encoding):
+        """
+        Initialization function
+        :param text:
+        :param encoding:
+        """
+        self.text = text
+        self.encoding = encoding
+        self.tokens = encode(text, encoding)
+        _, token_offsets = encoding.decode_with_offsets(self.tokens)
+        # offsets[i] is the start of token i, offsets[n_tokens] is the end of the text
+        self.offsets = array(chunking_constants.CHUNK_OFFSET_TYPECODE, token_offsets)
+        self.offsets.append(len(text))
+
+    def __len__(self)->int:
+        return len(self.tokens)
+
+    def get_char_span(self, start_token: int, end_token: int)->Tuple[int, int]:
+        """
+        Get the character span of the tokens [start_token, end_token)
+        :param start_token:
+        :param end_token:
+        :return:
+        """
+        return self.offsets[start_token], self.offsets[end_token]
+
+    def iter_windows(self, max_tokens: int, overlap_tokens: int = 0)->Iterator[Tuple[int, int]]:
+        """
+        Iterate the character spans of windows of at most max_tokens tokens, every window starting
+        overlap_tokens tokens before the end of the previous one.
+        A span is sliced at token offsets, but a slice can still encode differently at its edges,
+        e.g. when a token starts inside a multi-byte character, so every span is counted again and
+        shrunk by one token until it fits: the budget is guaranteed.
+        :param max_tokens:
+        :param overlap_tokens:
+        :return: iterator of (start, end) character offsets
+        """
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be at least 0 and less than max_tokens")
+        n_tokens = len(self.tokens)
+        start_token = 0
+        while start_token < n_tokens:
+            end_token = min(start_token + max_tokens, n_tokens)
+            start, end = self.get_char_span(start_token, end_token)
+            while end_token - start_token > 1 and len(encode(self.text[start:end], self.encoding)) > max_tokens:
+                end_token -= 1
+                start, end = self.get_char_span(start_token, end_token)
+            if end > start:
+                yield start, end
+            if end_token == n_tokens:
+                break
+            start_token = max(end_token - overlap_tokens, start_token + 1)
@@ -0,0 +1,23 @@
+"""
+Recreate the Milvus documents collection after a change of EMBEDDING_DIMENSIONS or
+EMBEDDING_VECTOR_PRECISION, or to migrate a collection whose vectors have no content_id,
+and enqueue the ingestion of every document content again:
+
+    python services/recreate_vector_collection.py
+
+The API and the ingestion workers never drop the collection on start.
+"""
+from core.db_connection import database
+from core.logger import logger
+from services.document_management_service import document_management_service
+
+if __name__ == '__main__':
+    db = database.SessionLocal()
+    try:
+        ingestion_jobs = document_management_service.recreate_vector_collection(db)
+        print(f"recreate_vector_collection: {len(ingestion_jobs)} ingestion jobs enqueued.")
+    except Exception as e:
+        logger.error(f"recreate_vector_collection: Error: {e}", exc_info=True)
+        raise e
+    finally:
+        db.close()
@@ -39,6 +39,9 @@ title Ask Employment Law - Run Unit Tests
 echo "Running unit tests..."
 pytest . --disable-pytest-warnings
 
+echo "Running document ingestion worker..."
+start "Ask Employment Law - Ingestion Worker" python .\services\document_ingestion_worker.py
+
 echo "Running backend server..."
 cls
 :: Enable Ctrl+C to immediately terminate the script
@@ -0,0 +1,41 @@
+from benchmarks.chunking_benchmark import (
+    FIXTURES_DIR,
+    generate_synthetic_corpus,
+    load_corpus,
+    run_benchmark,
+    to_roman_numeral,
+)
+from services.rag import Chunking
+
+def test_generate_synthetic_corpus():
+    """Test that the synthetic corpus is the same for the same seed."""
+    corpus = generate_synthetic_corpus(n_documents=2, n_articles=5)
+
+    assert len(corpus) == 2
+    assert "Pasal 5" in corpus[0]
+    assert corpus == generate_synthetic_corpus(n_documents=2, n_articles=5)
+
+def test_generate_synthetic_corpus_chapters():
+    """Test that the chapters of the synthetic corpus are numbered in Roman numerals, as the legal chunking expects."""
+    corpus = generate_synthetic_corpus(n_documents=1, n_articles=25)
+    legal_chunks = Chunking(corpus[0]).legal_structure_based(max_chunk_size=2000)
+
+    assert [to_roman_numeral(number) for number in (1, 4, 9, 14, 40, 1994)] == ["I", "IV", "IX", "XIV", "XL", "MCMXCIV"]
+    assert "BAB III" in corpus[0]
+    assert {legal_chunk.hierarchy[0] for legal_chunk in legal_chunks if legal_chunk.hierarchy} == {
+        "BAB I KETENTUAN",
+        "BAB II KETENTUAN",
+        "BAB III KETENTUAN",
+    }
+
+def test_run_benchmark():
+    """Test that the benchmark reports the throughput, memory and chunk sizes of a strategy."""
+    corpora = {"synthetic": generate_synthetic_corpus(n_documents=2, n_articles=5), "fixture": load_corpus(FIXTURES_DIR)}
+    results = run_benchmark(corpora, ["paragraph_based", "legal_structure_based"], repeats=1)
+
+    for corpus_results in results["corpora"].values():
+        for strategy_results in corpus_results.values():
+            assert strategy_results["n_chunks"] > 0
+            assert strategy_results["chars_per_second"] > 0
+            assert strategy_results["peak_memory_bytes"] > 0
+            assert strategy_results["chunk_size_chars"]["max"] >= strategy_results["chunk_size_chars"]["p50"]
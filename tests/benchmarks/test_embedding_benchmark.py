@@ -0,0 +1,14 @@
+from benchmarks.chunking_benchmark import generate_synthetic_corpus
+from benchmarks.embedding_benchmark import format_results, get_benchmark_chunks, run_benchmark
+from tests.services.embeddings.tiny_bert import save_tiny_bert
+
+def test_run_benchmark(tmp_path):
+    """Test that the benchmark reports the throughput of both backends and their parity."""
+    chunks = get_benchmark_chunks(generate_synthetic_corpus(n_documents=1, n_articles=5), max_chunks=8)
+    results = run_benchmark(save_tiny_bert(str(tmp_path)), chunks, batch_size=4, repeats=1, min_cosine=0.9)
+
+    assert len(chunks) == 8
+    assert results["backends"]["fp32"]["chunks_per_second"] > 0
+    assert results["backends"]["int8"]["chunks_per_second"] > 0
+    assert results["parity"]["passed"]
+    assert "int8 speedup" in format_results(results)
@@ -0,0 +1,21 @@
+from benchmarks.vector_storage_benchmark import (
+    format_results,
+    generate_matryoshka_embeddings,
+    generate_queries,
+    run_benchmark,
+)
+
+def test_run_benchmark():
+    """Test that the full float32 vectors have a perfect recall and the smaller options less memory."""
+    corpus = generate_matryoshka_embeddings(n_vectors=500, dimensions=64)
+    results = run_benchmark(corpus, generate_queries(corpus, n_queries=20), [64, 32], ["float32", "float16"], k=5)
+    configurations = {
+        (configuration["dimensions"], configuration["precision"]): configuration
+        for configuration in results["configurations"]
+    }
+
+    assert configurations[(64, "float32")]["recall_at_k"] == 1.
+    assert configurations[(64, "float16")]["memory_ratio"] == 0.5
+    assert configurations[(32, "float16")]["memory_ratio"] == 0.25
+    assert 0. < configurations[(32, "float32")]["recall_at_k"] <= 1.
+    assert "recall@5" in format_results(results)
@@ -0,0 +1,36 @@
+from io import BytesIO
+import tarfile
+import zipfile
+
+from core.archives import is_archive_file_name, iter_archive_files
+
+def test_iter_zip_archive_files():
+    """
+    Function to test reading the regular files of a zip archive, skipping OS metadata
+    :return:
+    """
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_archive:
+        zip_archive.writestr("uu/uu_13_2003.pdf", b"%PDF-1.4 uu")
+        zip_archive.writestr("__MACOSX/uu/._uu_13_2003.pdf", b"metadata")
+        zip_archive.writestr("pp_35_2021.pdf", b"%PDF-1.4 pp")
+    archive.seek(0)
+    archive_files = [(name, file.read()) for name, file in iter_archive_files(archive, "corpus.zip")]
+    assert archive_files == [("uu/uu_13_2003.pdf", b"%PDF-1.4 uu"), ("pp_35_2021.pdf", b"%PDF-1.4 pp")]
+
+def test_iter_tar_archive_files():
+    """
+    Function to test reading the regular files of a gzipped tar archive
+    :return:
+    """
+    archive = BytesIO()
+    with tarfile.open(fileobj=archive, mode="w:gz") as tar_archive:
+        member_content = b"%PDF-1.4 uu"
+        member = tarfile.TarInfo("uu/uu_13_2003.pdf")
+        member.size = len(member_content)
+        tar_archive.addfile(member, BytesIO(member_content))
+    archive.seek(0)
+    archive_files = [(name, file.read()) for name, file in iter_archive_files(archive, "corpus.tar.gz")]
+    assert archive_files == [("uu/uu_13_2003.pdf", b"%PDF-1.4 uu")]
+    assert is_archive_file_name("corpus.TGZ")
+    assert not is_archive_file_name("uu_13_2003.pdf")
@@ -0,0 +1,71 @@
+import sqlite3
+
+from core.disk_cache import DiskLRUCache
+
+def test_disk_lru_cache(tmp_path):
+    """
+    Function to test the hits, misses and persistence of the disk LRU cache
+    :return:
+    """
+    disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=1024)
+    assert disk_cache.get("page-1") is None
+    disk_cache.set("page-1", "Pasal 1")
+    assert disk_cache.get("page-1") == b"Pasal 1"
+    assert disk_cache.get_stats()["hits"] == 1
+    assert disk_cache.get_stats()["misses"] == 1
+    assert disk_cache.get_hit_rate() == 0.5
+
+    reopened_disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=1024)
+    assert reopened_disk_cache.get("page-1") == b"Pasal 1"
+
+def test_disk_lru_cache_eviction(tmp_path):
+    """
+    Function to test that the least recently used entries are evicted first
+    :return:
+    """
+    disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=300)
+    disk_cache.set("page-1", b"a" * 100)
+    disk_cache.set("page-2", b"b" * 100)
+    disk_cache.set("page-3", b"c" * 100)
+    disk_cache.get("page-1")
+    disk_cache.set("page-4", b"d" * 100)
+    assert disk_cache.get("page-2") is None
+    assert disk_cache.get("page-1") is not None
+    assert disk_cache.get("page-4") is not None
+    assert disk_cache.get_stats()["size_bytes"] <= 300
+
+    disk_cache.set("too-large", b"e" * 301)
+    assert disk_cache.get("too-large") is None
+
+def test_disk_lru_cache_shared_recency(tmp_path):
+    """
+    Function to test that the recency of the entries is shared by the caches opened on the same file
+    :return:
+    """
+    disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=300)
+    other_disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=300)
+    disk_cache.set("page-1", b"a" * 100)
+    disk_cache.set("page-2", b"b" * 100)
+    disk_cache.set("page-3", b"c" * 100)
+    other_disk_cache.get("page-1")
+    other_disk_cache.set("page-4", b"d" * 100)
+    assert other_disk_cache.get("page-2") is None
+    assert other_disk_cache.get("page-1") is not None
+
+def test_disk_lru_cache_locked(tmp_path):
+    """
+    Function to test that the writes locked out by another process are skipped as misses
+    :return:
+    """
+    disk_cache = DiskLRUCache(str(tmp_path), max_size_bytes=1024, lock_timeout_seconds=0.01)
+    disk_cache.set("page-1", "Pasal 1")
+    other_connection = sqlite3.connect(disk_cache.path, isolation_level=None)
+    other_connection.execute("BEGIN EXCLUSIVE")
+
+    disk_cache.set("page-2", "Pasal 2")
+    disk_cache.delete("page-1")
+
+    other_connection.execute("ROLLBACK")
+    other_connection.close()
+    assert disk_cache.get("page-2") is None
+    assert disk_cache.get("page-1") == b"Pasal 1"
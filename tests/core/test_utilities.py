@@ -1,4 +1,8 @@
-from datetime import date
+from datetime import date, datetime
+import hashlib
+from io import BytesIO
+
+import pytest
 
 from constants.tests.utilities import (
     ASSERTED_BASE_URL_1,
@@ -20,13 +24,25 @@ from constants.tests.utilities import (
     SNAKE_CASE_3,
     SNAKE_CASE_4,
     SNAKE_CASE_5,
+    TEST_CURSOR_ID,
+    TEST_FILE_CHUNK_SIZE,
+    TEST_FILE_CONTENT,
     TEST_INDONESIAN_DATE_1,
     TEST_INDONESIAN_DATE_2,
+    TEST_INVALID_CURSOR,
     TEST_URL_1,
     TEST_URL_2,
     TEST_URL_3,
 )
-from core.utilities import camel_to_snake, get_base_url, parse_indonesian_date
+from core.utilities import (
+    camel_to_snake,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    FileTooLargeError,
+    get_base_url,
+    hash_and_measure_a_file,
+    parse_indonesian_date,
+)
 
 def test_camel_to_snake():
     """
@@ -65,3 +81,27 @@ def test_parse_indonesian_date():
     assert str(parsed_test_2.year) == str(ASSERTED_YEAR_2), "Wrong year."
     assert parsed_test_2.month == ASSERTED_MONTH_2, "Wrong month."
     assert parsed_test_2.day == ASSERTED_DATE_2, "Wrong date."
+
+def test_keyset_cursor():
+    """
+    Function to test that a keyset cursor decodes to the row it was encoded from
+    :return:
+    """
+    uploaded_at = datetime.now()
+    cursor = encode_keyset_cursor(uploaded_at, TEST_CURSOR_ID)
+    assert decode_keyset_cursor(cursor) == (uploaded_at, TEST_CURSOR_ID)
+    with pytest.raises(ValueError):
+        decode_keyset_cursor(TEST_INVALID_CURSOR)
+
+def test_hash_and_measure_a_file():
+    """
+    Function to test hashing a file in chunks, its size limit and its file pointer reset
+    :return:
+    """
+    file = BytesIO(TEST_FILE_CONTENT)
+    file_hash, file_size = hash_and_measure_a_file(file, chunk_size=TEST_FILE_CHUNK_SIZE)
+    assert file_hash == hashlib.sha256(TEST_FILE_CONTENT).hexdigest()
+    assert file_size == len(TEST_FILE_CONTENT)
+    assert file.tell() == 0
+    with pytest.raises(FileTooLargeError):
+        hash_and_measure_a_file(file, max_size_bytes=len(TEST_FILE_CONTENT) - 1)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from core.vector_storage import round_trip_vectors, to_vector_field_values, truncate_vectors
+
+def test_truncate_vectors():
+    """
+    Function to test that the truncated vectors are normalized again
+    :return:
+    """
+    vectors = np.asarray([[3., 4., 12.], [0., 2., 1.]], dtype=np.float32)
+    truncated_vectors = truncate_vectors(vectors, 2)
+
+    assert truncated_vectors.shape == (2, 2)
+    assert np.allclose(truncated_vectors, [[0.6, 0.8], [0., 1.]])
+
+def test_vector_precisions():
+    """
+    Function to test the half-precision round trips and Milvus field values
+    :return:
+    """
+    vectors = np.asarray([[1., -0.333333, 65504.]], dtype=np.float32)
+
+    assert np.allclose(round_trip_vectors(vectors, "float16"), vectors, rtol=1e-3)
+    assert np.allclose(round_trip_vectors(vectors, "bfloat16"), vectors, rtol=1e-2)
+    assert round_trip_vectors(vectors, "bfloat16")[0, 0] == 1.
+    assert to_vector_field_values(vectors, "float32") == vectors.tolist()
+    assert to_vector_field_values(vectors, "float16") == [np.asarray(vectors[0], dtype="<f2").tobytes()]
+    assert len(to_vector_field_values(vectors, "bfloat16")[0]) == 6
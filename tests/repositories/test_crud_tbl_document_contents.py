@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from constants.services import document_management as document_management_constants
+from core.db_connection import database
+from repositories import crud_tbl_document_contents
+
+def test_crud_document_contents_claim():
+    """Unit test for the claims of Tbl_Document_Contents, including the redelivery of a job whose worker died"""
+    db = database.SessionLocal()
+    claimable_statuses = [
+        document_management_constants.CONTENT_STATUS_PENDING,
+        document_management_constants.CONTENT_STATUS_FAILED,
+    ]
+    document_content, is_created = crud_tbl_document_contents.get_or_create_by_hash(
+        db,
+        uuid4().hex,
+        status=document_management_constants.CONTENT_STATUS_PENDING,
+    )
+    assert is_created, "Test case 1: Content not created."
+
+    def claim(job_id: str, stale_before: datetime)->bool:
+        return crud_tbl_document_contents.claim(
+            db,
+            document_content.id,
+            job_id,
+            from_statuses=claimable_statuses,
+            to_status=document_management_constants.CONTENT_STATUS_PROCESSING,
+            stale_before=stale_before,
+        )
+
+    recent_claims = datetime.now() - timedelta(hours=1)
+    assert claim("job-1", recent_claims), "Test case 2: Pending content not claimed."
+    assert not claim("job-2", recent_claims), "Test case 3: Content claimed twice."
+    # The worker of job-1 died, RabbitMQ redelivers job-1
+    assert claim("job-1", recent_claims), "Test case 4: Redelivered job not allowed to resume its claim."
+    assert not claim("job-2", recent_claims), "Test case 5: Content claimed twice after a redelivery."
+
+    # The claim of job-1 is older than the timeout
+    assert claim("job-2", datetime.now() + timedelta(seconds=1)), "Test case 6: Stale claim not taken over."
+    db.refresh(document_content)
+    assert document_content.claimed_by_job_id == "job-2", "Test case 6: Claim owner mismatch."
+    assert crud_tbl_document_contents.is_claim_stale(document_content, datetime.now() + timedelta(seconds=1))
+
+    crud_tbl_document_contents.delete_by_id(db=db, id=document_content.id)
+    db.close()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from services.embeddings import BertEncoder, EmbeddingModelRegistry, iter_length_buckets
+from tests.services.embeddings.tiny_bert import save_tiny_bert
+
+TEXTS = ["upah", "upah lembur pekerja", "cuti", "pekerja cuti upah lembur upah lembur", "lembur"]
+
+def test_iter_length_buckets():
+    """Test that the batches group similar lengths and cover every input once."""
+    batches = list(iter_length_buckets([5, 1, 4, 2, 3], batch_size=2))
+
+    assert [batch.tolist() for batch in batches] == [[1, 3], [4, 2], [0]]
+
+def test_bert_encoder_encode(tmp_path):
+    """Test that the batches give the vectors of the texts encoded one by one, in order."""
+    encoder = BertEncoder(save_tiny_bert(str(tmp_path)), batch_size=2, registry=EmbeddingModelRegistry(device="cpu"))
+    embeddings = encoder.encode(TEXTS)
+    single_embeddings = np.vstack([encoder.encode([text]) for text in TEXTS])
+
+    assert embeddings.shape == (len(TEXTS), 16)
+    assert embeddings.dtype == np.float32 and embeddings.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(embeddings, axis=1), 1., atol=1e-5)
+    assert np.allclose(embeddings, single_embeddings, atol=1e-5)
+    assert encoder.encode([]).shape == (0, 16)
+
+def test_bert_encoder_dimensions(tmp_path):
+    """Test that the vectors are truncated to their leading dimensions, then normalized."""
+    registry = EmbeddingModelRegistry(device="cpu")
+    model_name = save_tiny_bert(str(tmp_path))
+    full_embeddings = BertEncoder(model_name, normalize=False, registry=registry).encode(TEXTS)
+    embeddings = BertEncoder(model_name, dimensions=8, registry=registry).encode(TEXTS)
+
+    assert embeddings.shape == (len(TEXTS), 8)
+    truncated_norms = np.linalg.norm(full_embeddings[:, :8], axis=1, keepdims=True)
+    assert np.allclose(embeddings * truncated_norms, full_embeddings[:, :8], atol=1e-5)
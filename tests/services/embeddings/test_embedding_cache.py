@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from services.embeddings import EmbeddingCache
+
+def embed_lengths(texts):
+    """Embed a text as [its length, 1.], recording the embedded texts."""
+    embed_lengths.calls.append(list(texts))
+    return np.asarray([[float(len(text)), 1.] for text in texts], dtype=np.float32)
+
+def test_embedding_cache_get_or_embed(tmp_path):
+    """Test that only the missing texts are embedded, each once, and the vectors persist on disk."""
+    embed_lengths.calls = []
+    embedding_cache = EmbeddingCache(str(tmp_path), max_size_bytes=1024, memory_max_size_bytes=1024)
+
+    embeddings = embedding_cache.get_or_embed("model", 2, ["upah", "cuti", "upah"], embed_lengths)
+    cached_embeddings = embedding_cache.get_or_embed("model", 2, [" upah\n", "lembur"], embed_lengths)
+
+    assert embeddings[:, 0].tolist() == [4., 4., 4.]
+    assert cached_embeddings[:, 0].tolist() == [4., 6.]
+    assert embed_lengths.calls == [["upah", "cuti"], ["lembur"]]
+    assert embedding_cache.get_stats()["memory_hits"] == 1
+
+    reopened_cache = EmbeddingCache(str(tmp_path), max_size_bytes=1024, memory_max_size_bytes=1024)
+    assert reopened_cache.get_or_embed("model", 2, ["cuti"], embed_lengths)[0].tolist() == [4., 1.]
+    assert reopened_cache.get_or_embed("other model", 2, ["cuti"], embed_lengths)[0].tolist() == [4., 1.]
+    assert embed_lengths.calls[-1] == ["cuti"] and len(embed_lengths.calls) == 3
+    assert reopened_cache.get_stats()["disk_hits"] == 1
+
+def test_embedding_cache_memory_eviction(tmp_path):
+    """Test that the memory tier keeps the most recently used vectors within its size."""
+    embedding_cache = EmbeddingCache(str(tmp_path), max_size_bytes=1024, memory_max_size_bytes=16)
+    keys = [embedding_cache.get_key("model", 2, text) for text in ("upah", "cuti", "lembur")]
+    for key in keys:
+        embedding_cache.set(key, np.ones(2, dtype=np.float32))
+
+    assert list(embedding_cache.memory_cache) == keys[1:]
+    assert embedding_cache.memory_size_bytes == 16
+    assert embedding_cache.get(keys[0]) is not None
+    assert list(embedding_cache.memory_cache) == [keys[2], keys[0]]
+
+@pytest.mark.asyncio
+async def test_embedding_cache_aget_or_embed(tmp_path):
+    """Test that the async lookup embeds the missing texts with an async embed function."""
+    embed_lengths.calls = []
+    embedding_cache = EmbeddingCache(str(tmp_path), max_size_bytes=1024, memory_max_size_bytes=1024)
+
+    async def aembed_lengths(texts):
+        return embed_lengths(texts)
+
+    embedding_cache.get_or_embed("model", 2, ["upah"], embed_lengths)
+    embeddings = await embedding_cache.aget_or_embed("model", 2, ["upah", "cuti"], aembed_lengths)
+
+    assert embeddings[:, 0].tolist() == [4., 4.]
+    assert embed_lengths.calls == [["upah"], ["cuti"]]
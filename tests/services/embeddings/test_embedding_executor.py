@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from services.embeddings import EmbeddingExecutor, EmbeddingQueueFullError
+
+@pytest.mark.asyncio
+async def test_embedding_executor_run():
+    """Test that a task runs off the event loop and is counted."""
+    embedding_executor = EmbeddingExecutor(max_workers=1, max_queue_size=1)
+
+    assert await embedding_executor.run(lambda texts: [len(text) for text in texts], ["upah", "cuti"]) == [4, 4]
+    assert embedding_executor.get_stats()["completed"] == 1
+    assert embedding_executor.get_stats()["queue_depth"] == 0
+    embedding_executor.shutdown()
+
+def test_embedding_executor_queue_full():
+    """Test that a task is rejected when the queue is full, and the queue depth is reported."""
+    embedding_executor = EmbeddingExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked_task():
+        started.set()
+        release.wait()
+
+    running_future = embedding_executor.submit(blocked_task)
+    started.wait()
+    queued_future = embedding_executor.submit(lambda: None)
+    with pytest.raises(EmbeddingQueueFullError):
+        embedding_executor.submit(lambda: None)
+    stats = embedding_executor.get_stats()
+    release.set()
+    running_future.result()
+    queued_future.result()
+    embedding_executor.shutdown()
+
+    assert stats["running"] == 1 and stats["queue_depth"] == 1 and stats["rejected"] == 1
+    assert embedding_executor.get_stats()["completed"] == 2
+    assert embedding_executor.get_stats()["max_queue_depth"] == 1
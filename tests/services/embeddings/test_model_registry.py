@@ -0,0 +1,15 @@
+from services.embeddings import EmbeddingModelRegistry
+from tests.services.embeddings.tiny_bert import save_tiny_bert
+
+def test_embedding_model_registry_loads_once(tmp_path):
+    """Test that a model is loaded once, listed with its memory, and unloaded."""
+    model_name = save_tiny_bert(str(tmp_path))
+    registry = EmbeddingModelRegistry(device="cpu")
+    loaded_model = registry.get(model_name)
+
+    assert registry.get(model_name) is loaded_model
+    assert [model.model_name for model in registry.list_models()] == [model_name]
+    assert registry.list_models()[0].memory_bytes > 0
+    assert registry.unload(model_name)
+    assert not registry.unload(model_name)
+    assert registry.list_models() == []
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+
+from services.embeddings import OpenAIEmbedder, iter_token_batches
+from services.embeddings import openai_embedder as openai_embedder_module
+
+class FakeEmbeddings:
+    """
+    Embeddings endpoint embedding a text as [its length, its batch size], rate limited on its first request
+    """
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, input, model, dimensions=None):
+        self.requests.append(list(input))
+        if len(self.requests) == 1:
+            request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+            raise openai.RateLimitError("rate limited", response=httpx.Response(429, request=request), body=None)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        data = [
+            SimpleNamespace(index=index, embedding=[float(len(text)), float(len(input))])
+            for index, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])
+
+class FakeEncoding:
+    """
+    Encoding of a text as one token per character
+    """
+    def encode(self, text, disallowed_special=()):
+        return [ord(character) for character in text]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+class FakeClient:
+    """
+    Async client of the fake embeddings endpoint
+    """
+    def __init__(self):
+        self.embeddings = FakeEmbeddings()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+def test_iter_token_batches():
+    """Test that the batches are bounded by tokens and items, and an oversized input is sent alone."""
+    batches = list(iter_token_batches([3, 3, 3, 10, 1, 1, 1], max_batch_tokens=6, max_batch_items=2))
+
+    assert [list(batch) for batch in batches] == [[0, 1], [2], [3], [4, 5], [6]]
+
+def test_openai_embedder_embed(monkeypatch):
+    """Test that the batches are sent concurrently, retried when rate limited, and returned in order."""
+    monkeypatch.setattr(openai_embedder_module, "get_encoding", lambda model_name=None: FakeEncoding())
+    monkeypatch.setattr(openai_embedder_module, "get_backoff_seconds", lambda attempt, error=None: 0.)
+    client = FakeClient()
+    embedder = OpenAIEmbedder(
+        "api-key",
+        "text-embedding-3-large",
+        max_batch_items=2,
+        max_concurrency=2,
+        client=client,
+    )
+    texts = ["a" * length for length in range(1, 8)]
+
+    embeddings = embedder.embed(texts)
+    embedder.close()
+
+    assert embeddings.dtype == np.float32
+    assert embeddings[:, 0].tolist() == [float(len(text)) for text in texts]
+    assert len(client.embeddings.requests) == 5
+    assert client.embeddings.max_in_flight == 2
+    assert client.closed
+
+def test_openai_embedder_truncates_long_inputs(monkeypatch):
+    """Test that the texts longer than max_input_tokens are truncated before they are sent."""
+    monkeypatch.setattr(openai_embedder_module, "get_encoding", lambda model_name=None: FakeEncoding())
+    monkeypatch.setattr(openai_embedder_module, "get_backoff_seconds", lambda attempt, error=None: 0.)
+    client = FakeClient()
+    embedder = OpenAIEmbedder("api-key", "text-embedding-3-large", max_input_tokens=4, client=client)
+
+    embeddings = embedder.embed(["abcdefgh", "abc"])
+    embedder.close()
+
+    assert client.embeddings.requests[-1] == ["abcd", "abc"]
+    assert embeddings[:, 0].tolist() == [4., 3.]
@@ -0,0 +1,25 @@
+import numpy as np
+
+from services.embeddings import EmbeddingModelRegistry, check_quantized_parity, get_cosine_agreement
+from tests.services.embeddings.tiny_bert import save_tiny_bert
+
+def test_get_cosine_agreement():
+    """Test the cosine similarity of the rows of two matrices."""
+    reference = np.asarray([[1., 0.], [1., 1.]], dtype=np.float32)
+    candidate = np.asarray([[2., 0.], [-1., -1.]], dtype=np.float32)
+
+    assert np.allclose(get_cosine_agreement(reference, candidate), [1., -1.])
+
+def test_check_quantized_parity(tmp_path):
+    """Test that the quantized model is a separate registry entry embedding like the fp32 model."""
+    model_name = save_tiny_bert(str(tmp_path))
+    registry = EmbeddingModelRegistry(device="cpu")
+
+    parity = check_quantized_parity(model_name, ["upah lembur", "cuti pekerja", "upah"], 0.9, registry=registry)
+
+    assert parity.passed and parity.n_texts == 3
+    assert parity.min_cosine <= parity.mean_cosine
+    assert sorted((model.model_name, model.quantized) for model in registry.list_models()) == [
+        (model_name, False), (f"{model_name}:int8", True)
+    ]
+    assert registry.unload(f"{model_name}:int8")
@@ -0,0 +1,18 @@
+from transformers import BertConfig, BertModel, BertTokenizer
+
+TINY_BERT_VOCABULARY = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "upah", "lembur", "cuti", "pekerja"]
+
+def save_tiny_bert(model_dir: str)->str:
+    """Save a tiny random BERT model with its tokenizer, so the tests run without downloads."""
+    vocabulary_file = f"{model_dir}/vocab.txt"
+    with open(vocabulary_file, "w", encoding="utf-8") as vocabulary:
+        vocabulary.write("\n".join(TINY_BERT_VOCABULARY))
+    BertTokenizer(vocabulary_file).save_pretrained(model_dir)
+    BertModel(BertConfig(
+        vocab_size=len(TINY_BERT_VOCABULARY),
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+    )).save_pretrained(model_dir)
+    return model_dir
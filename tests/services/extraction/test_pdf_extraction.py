@@ -0,0 +1,22 @@
+from services.extraction.pdf_extraction import group_page_ranges, is_text_layer_usable, split_page_windows
+
+def test_is_text_layer_usable():
+    """Unit test to test the text layer quality check before falling back to OCR"""
+    assert is_text_layer_usable("Pasal 1\nDalam Undang-Undang ini yang dimaksud dengan Ketenagakerjaan adalah ...")
+    assert not is_text_layer_usable(None)
+    assert not is_text_layer_usable("")
+    assert not is_text_layer_usable("   \n\n  ")
+    assert not is_text_layer_usable("Pasal 1")  # too short
+    assert not is_text_layer_usable("(cid:12)(cid:34)(cid:56)(cid:78)(cid:90)(cid:11)(cid:22)")
+    assert not is_text_layer_usable("~~~ ### @@@ ^^^ ||| ___ +++ === --- ***")
+
+def test_group_page_ranges():
+    """Unit test to test grouping the OCR fallback pages into contiguous rasterization ranges"""
+    assert group_page_ranges([]) == []
+    assert group_page_ranges([3]) == [(3, 3)]
+    assert group_page_ranges([1, 2, 3, 7, 8, 10]) == [(1, 3), (7, 8), (10, 10)]
+
+def test_split_page_windows():
+    """Unit test to test splitting page ranges into bounded streaming rasterization windows"""
+    assert list(split_page_windows([(1, 10)], 4)) == [(1, 4), (5, 8), (9, 10)]
+    assert list(split_page_windows([(1, 2), (5, 5), (7, 12)], 3)) == [(1, 2), (5, 5), (7, 9), (10, 12)]
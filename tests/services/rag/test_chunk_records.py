@@ -0,0 +1,48 @@
+import hashlib
+
+from services.rag import Chunking
+from services.rag.chunk_records import ChunkRecordList, diff_chunk_hashes, get_page_number
+
+def test_get_page_number():
+    """Test mapping a character offset to its page."""
+    page_offsets = [0, 100, 250]
+    assert get_page_number(page_offsets, 0) == 1
+    assert get_page_number(page_offsets, 99) == 1
+    assert get_page_number(page_offsets, 100) == 2
+    assert get_page_number(page_offsets, 1000) == 3
+    assert get_page_number(None, 10) is None
+
+def test_chunk_record_list():
+    """Test that chunk records slice their source lazily and hash their text."""
+    source = "Pasal 1\nCukup jelas.\nPasal 2\nCukup jelas."
+    chunk_records = ChunkRecordList(source, page_offsets=[0, 21])
+    chunk_records.append(0, 20)
+    chunk_records.append(21, 41)
+
+    assert len(chunk_records) == 2
+    assert chunk_records[1].text == "Pasal 2\nCukup jelas."
+    assert chunk_records[1].page_number == 2
+    assert chunk_records[-1].start == 21
+    assert chunk_records[0].content_hash == hashlib.sha256(b"Pasal 1\nCukup jelas.").hexdigest()
+    assert chunk_records.get_texts() == [record.text for record in chunk_records]
+
+def test_chunking_with_offsets_from_pages():
+    """Test the chunk records of a chunking method on a text given page by page."""
+    chunking = Chunking.from_pages(["Pasal 1\n\nCukup jelas.", "Pasal 2\n\nCukup jelas."])
+    chunk_records = chunking.paragraph_based(with_offsets=True)
+
+    assert chunk_records.get_texts() == Chunking(chunking.full_text).paragraph_based()
+    # The last paragraph of page 1 continues on page 2, a chunk is on the page it starts on
+    assert [record.page_number for record in chunk_records] == [1, 1, 2]
+    assert chunk_records[2].text == chunking.full_text[chunk_records[2].start:chunk_records[2].end]
+
+def test_diff_chunk_hashes():
+    """Test that only the changed chunks are added or deleted, duplicates matched once each."""
+    stored_hashes = ["a", "b", "c", "b"]
+    new_hashes = ["a", "b", "d", "c", "e"]
+    chunk_diff = diff_chunk_hashes(stored_hashes, new_hashes)
+
+    assert chunk_diff.kept == [(0, 0), (1, 1), (2, 3)]
+    assert chunk_diff.added == [2, 4]
+    assert chunk_diff.deleted == [3]
+    assert diff_chunk_hashes([], new_hashes).added == list(range(len(new_hashes)))
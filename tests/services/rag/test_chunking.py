@@ -45,3 +45,83 @@ def test_chunking_sliding_windows():
     assert all(isinstance(chunk, str) for chunk in chunks)  # All chunks should be strings
     assert chunks[0] == "This is a test text. It is used to test the chunking functionality."  # First chunk
     assert chunks[-1] == "It is used to test the chunking functionality. It is a just simple test."  # Last chunk
+
+def test_chunking_iter_fixed_length_from_stream():
+    """Test that the streaming fixed length chunking matches the chunking of the whole text."""
+    text_pieces = ["This is a test ", "text. It is used to test", " the chunking functionality."]
+    chunk_length = 10
+    chunks = list(Chunking(text_stream=iter(text_pieces)).iter_fixed_length(chunk_length))
+
+    assert chunks == Chunking("".join(text_pieces)).fixed_length(chunk_length)
+
+def test_chunking_iter_paragraph_based_from_stream():
+    """Test that the streaming paragraph based chunking joins paragraphs split across pieces."""
+    text_pieces = ["Pasal 1\n", "\nPekerja berhak ", "atas upah.\n\n", "Pasal 2"]
+    chunks = list(Chunking(text_stream=iter(text_pieces)).iter_paragraph_based())
+
+    assert chunks == ["Pasal 1", "Pekerja berhak atas upah.", "Pasal 2"]
+
+def test_chunking_legal_structure_based():
+    """Test the legal structure chunking of an Indonesian statute, with its hierarchy and ayat split."""
+    full_text = (
+        "BAB X\nPERLINDUNGAN, PENGUPAHAN, DAN KESEJAHTERAAN\n"
+        "Bagian Kesatu\nPerlindungan\n"
+        "Pasal 67\n"
+        "(1) Pengusaha yang mempekerjakan tenaga kerja penyandang cacat wajib memberikan perlindungan.\n"
+        "(2) Pemberian perlindungan dilaksanakan sesuai dengan peraturan perundang-undangan.\n"
+        "Pasal 68\nPengusaha dilarang mempekerjakan anak.\n"
+    )
+    chunks = Chunking(full_text).legal_structure_based(max_chunk_size=120)
+
+    assert len(chunks) == 3  # Pasal 67 is split by its 2 ayat
+    assert chunks[0].hierarchy == [
+        "BAB X PERLINDUNGAN, PENGUPAHAN, DAN KESEJAHTERAAN",
+        "Bagian Kesatu Perlindungan",
+        "Pasal 67",
+        "ayat (1)",
+    ]
+    assert chunks[0].text.startswith("Pasal 67\n(1) Pengusaha")
+    assert chunks[1].hierarchy[-1] == "ayat (2)"
+    assert chunks[-1].get_hierarchy_path().endswith("> Pasal 68")
+    assert chunks[-1].text == "Pasal 68\nPengusaha dilarang mempekerjakan anak."
+
+def test_chunking_legal_structure_based_with_hierarchy():
+    """Test that the hierarchy prefix does not repeat the article heading and fits in the chunk size."""
+    full_text = (
+        "BAB X\nPERLINDUNGAN, PENGUPAHAN, DAN KESEJAHTERAAN\n"
+        "Pasal 67\n"
+        "(1) Pengusaha yang mempekerjakan tenaga kerja penyandang cacat wajib memberikan perlindungan.\n"
+        "(2) Pemberian perlindungan dilaksanakan sesuai dengan peraturan perundang-undangan.\n"
+        "Pasal 68\nPengusaha dilarang mempekerjakan anak.\n"
+    )
+    chunks = list(Chunking(full_text).iter_legal_structure_based(max_chunk_size=150, with_hierarchy=True))
+
+    assert chunks[-1].get_text_with_hierarchy() == (
+        "BAB X PERLINDUNGAN, PENGUPAHAN, DAN KESEJAHTERAAN\nPasal 68\nPengusaha dilarang mempekerjakan anak."
+    )
+    assert chunks[0].get_text_with_hierarchy().count("Pasal 67") == 1
+    assert all(len(chunk.get_text_with_hierarchy()) <= 150 for chunk in chunks)
+
+def test_chunking_legal_structure_based_lowercase_body_line():
+    """Test that a body line starting with a lowercase "bagian" is not taken for a Bagian heading."""
+    full_text = (
+        "BAB I\nKETENTUAN UMUM\n"
+        "Pasal 1\n"
+        "Upah dibayarkan dalam dua bagian.\n"
+        "bagian kedua dari upah dibayarkan pada akhir bulan.\n"
+        "Pasal 2\nPengusaha wajib membayar upah.\n"
+    )
+    chunks = Chunking(full_text).legal_structure_based(max_chunk_size=200)
+
+    assert len(chunks) == 2
+    assert chunks[0].hierarchy == ["BAB I KETENTUAN UMUM", "Pasal 1"]
+    assert chunks[0].text.endswith("bagian kedua dari upah dibayarkan pada akhir bulan.")
+    assert chunks[1].hierarchy == ["BAB I KETENTUAN UMUM", "Pasal 2"]
+    assert chunks[1].text == "Pasal 2\nPengusaha wajib membayar upah."
+
+def test_chunking_sentence_based_abbreviations():
+    """Test that the sentence based chunking does not split on abbreviations like "No." and "Thn."."""
+    full_text = "Lihat UU No. 13 Thn. 2003 tentang Ketenagakerjaan. Pasal 1 memuat definisi."
+    chunks = Chunking(full_text).sentence_based()
+
+    assert chunks == ["Lihat UU No. 13 Thn. 2003 tentang Ketenagakerjaan.", "Pasal 1 memuat definisi."]
@@ -1,4 +1,25 @@
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont
+
 from services import document_management_service
+from services.extraction import PdfExtractionService
+
+def build_image_only_pdf(page_texts):
+    """
+    Build a PDF without text layer, one rasterized page per text, so its pages have to be OCR'd
+    :param page_texts:
+    :return: bytes of the PDF
+    """
+    font = ImageFont.load_default(size=48)
+    images = []
+    for page_text in page_texts:
+        image = Image.new("L", (1240, 1754), color=255)
+        ImageDraw.Draw(image).text((100, 100), page_text, fill=0, font=font)
+        images.append(image)
+    pdf_file = BytesIO()
+    images[0].save(pdf_file, format="PDF", save_all=True, append_images=images[1:], resolution=150)
+    return pdf_file.getvalue()
 
 def test_extract_text_from_pdf():
     """Unit test to test PyTesseract OCR functionality"""
@@ -14,3 +35,19 @@ def test_extract_text_from_pdf():
         assert "UNDANG-UNDANG" in extracted_text
         assert "PRESIDEN REPUBLIK INDONESIA" in extracted_text
         assert "BADAN USAHA MILIK NEGARA" in extracted_text
+
+def test_extract_text_from_pdf_parallel():
+    """Unit test to test the parallel per-page OCR gives the sequential OCR text, in the page order"""
+    page_texts = ["Pasal 1", "Pasal 2", "Pasal 3", "Pasal 4"]
+    pdf_bytes = build_image_only_pdf(page_texts)
+    pdf_extractor = PdfExtractionService(max_workers=2, ocr_cache=None)
+    try:
+        sequential_result = pdf_extractor.extract_pages(pdf_bytes, parallel=False, text_layer_first=False)
+        parallel_result = pdf_extractor.extract_pages(pdf_bytes, parallel=True, text_layer_first=False)
+    finally:
+        pdf_extractor.shutdown()
+
+    assert [page.page_number for page in parallel_result.pages] == list(range(1, len(page_texts) + 1))
+    assert [page.text for page in parallel_result.pages] == [page.text for page in sequential_result.pages]
+    assert all(page_text in page.text for page_text, page in zip(page_texts, parallel_result.pages))
+    assert all(page.elapsed_seconds >= 0 for page in parallel_result.pages)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from services.rag import Chunking, SemanticChunkingEngine
+
+FULL_TEXT = (
+    "Upah lembur dibayar per jam. Upah lembur dihitung dari upah sebulan. "
+    "Cuti tahunan paling sedikit 12 hari. Cuti diberikan setelah 12 bulan bekerja."
+)
+# Two topics: the sentences of a topic point in the same direction
+SENTENCE_EMBEDDINGS = np.array([[1., 0.1], [1., 0.], [0., 1.], [0.1, 1.]])
+
+def test_semantic_chunking_engine_breakpoints():
+    """Test that the threshold types split the text between the two topics."""
+    threshold_amounts = {"percentile": 50., "standard_deviation": 0., "interquartile": 0.}
+    for threshold_type, breakpoint_threshold_amount in threshold_amounts.items():
+        engine = SemanticChunkingEngine(
+            threshold_type=threshold_type, breakpoint_threshold_amount=breakpoint_threshold_amount
+        )
+        chunks = engine.chunk(FULL_TEXT, SENTENCE_EMBEDDINGS)
+
+        assert chunks == [FULL_TEXT[:FULL_TEXT.index("Cuti") - 1], FULL_TEXT[FULL_TEXT.index("Cuti"):]]
+
+    gradient_engine = SemanticChunkingEngine(threshold_type="gradient")
+    assert gradient_engine.get_breakpoints(SENTENCE_EMBEDDINGS).tolist() == [0]
+
+def test_chunking_local_semantic_chunking():
+    """Test the local semantic chunking with an embed function, batched and deterministic."""
+    embedded_batches = []
+
+    def embed_function(texts):
+        embedded_batches.append(texts)
+        return [[text.count("Upah"), text.count("Cuti")] for text in texts]
+
+    chunking = Chunking(FULL_TEXT)
+    chunks = chunking.local_semantic_chunking(embed_function=embed_function, buffer_size=0)
+
+    assert len(embedded_batches) == 1 and len(embedded_batches[0]) == 4
+    assert chunks == [FULL_TEXT[:FULL_TEXT.index("Cuti") - 1], FULL_TEXT[FULL_TEXT.index("Cuti"):]]
+    assert chunking.local_semantic_chunking(embed_function=embed_function, buffer_size=0) == chunks
+    assert chunking.local_semantic_chunking(
+        sentence_embeddings=SENTENCE_EMBEDDINGS, with_offsets=True
+    ).get_texts() == chunks
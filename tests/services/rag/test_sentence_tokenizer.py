@@ -0,0 +1,55 @@
+import importlib
+
+import pytest
+
+from services.rag import SentenceTokenizer, read_corpus, train_sentence_tokenizer
+
+# services.rag exports the sentence_tokenizer singleton under the name of its module
+sentence_tokenizer_module = importlib.import_module("services.rag.sentence_tokenizer")
+
+INDONESIAN_TEXT = (
+    "Hal ini diatur dalam Undang-Undang No. 13 Thn. 2003 tentang Ketenagakerjaan. "
+    "Pekerja berhak atas upah lembur sesuai Psl. 78 ayat (2)."
+)
+
+def test_sentence_tokenizer_abbreviations():
+    """Test that the Indonesian abbreviations do not end a sentence."""
+    sentences = SentenceTokenizer(model_dir=None).tokenize(INDONESIAN_TEXT)
+
+    assert len(sentences) == 2
+    assert sentences[0].endswith("Ketenagakerjaan.")
+
+def test_sentence_tokenizer_batch():
+    """Test that a batch is tokenized like each of its texts."""
+    tokenizer = SentenceTokenizer(model_dir=None)
+    texts = [INDONESIAN_TEXT, "Kalimat pertama. Kalimat kedua.", ""]
+
+    assert tokenizer.tokenize_batch(texts) == [tokenizer.tokenize(text) for text in texts]
+    assert tokenizer.tokenize_batch(texts, max_workers=2) == tokenizer.tokenize_batch(texts)
+
+def test_sentence_tokenizer_missing_nltk_data(monkeypatch):
+    """Test that a missing NLTK model is downloaded, and that a failed download raises instead of using an untrained model."""
+    downloads = []
+    def find(resource_name):
+        raise LookupError(resource_name)
+    monkeypatch.setattr(sentence_tokenizer_module.nltk.data, "find", find)
+    monkeypatch.setattr(sentence_tokenizer_module, "init_nltk_data", lambda: downloads.append(True))
+
+    with pytest.raises(LookupError):
+        SentenceTokenizer(model_dir=None).load_params()
+    assert downloads == [True]
+
+def test_train_sentence_tokenizer(tmp_path):
+    """Test that a trained model is saved and loaded from its directory."""
+    model_dir = str(tmp_path / "punkt")
+    corpus_file_paths = []
+    for index in range(3):
+        corpus_file_path = tmp_path / f"document-{index}.txt"
+        corpus_file_path.write_text(INDONESIAN_TEXT, encoding="utf-8")
+        corpus_file_paths.append(str(corpus_file_path))
+    params = train_sentence_tokenizer(read_corpus(corpus_file_paths), model_dir)
+    loaded_params = SentenceTokenizer(model_dir=model_dir).load_params()
+
+    assert {"no", "thn"} <= loaded_params.abbrev_types
+    assert loaded_params.abbrev_types == params.abbrev_types
+    assert loaded_params.sent_starters == params.sent_starters
@@ -0,0 +1,32 @@
+from services.rag import Chunking, TokenOffsets, count_tokens, get_encoding
+
+FULL_TEXT = (
+    "Pengusaha wajib membayar upah lembur. Waktu kerja lembur paling banyak 4 jam dalam 1 hari. "
+    "Ketentuan ini berlaku bagi pekerja/buruh yang dipekerjakan di luar waktu kerja. "
+) * 20
+
+def test_token_offsets_windows():
+    """Test that the token windows cover the text within the token budget."""
+    token_offsets = TokenOffsets(FULL_TEXT, get_encoding())
+    windows = list(token_offsets.iter_windows(max_tokens=50, overlap_tokens=0))
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(FULL_TEXT)
+    assert all(previous[1] == window[0] for previous, window in zip(windows, windows[1:]))
+    assert all(count_tokens(FULL_TEXT[start:end]) <= 50 for start, end in windows)
+
+def test_chunking_token_based():
+    """Test the token based chunking method with an overlap."""
+    chunks = Chunking(FULL_TEXT).token_based(max_tokens=40, overlap_tokens=10)
+
+    assert all(count_tokens(chunk) <= 40 for chunk in chunks)
+    assert all(chunk[-10:] in next_chunk for chunk, next_chunk in zip(chunks[:-1], chunks[1:]))
+    assert chunks[-1].endswith(FULL_TEXT[-20:])
+    assert Chunking(FULL_TEXT).token_based(max_tokens=40, overlap_tokens=10, with_offsets=True)[0].text == chunks[0]
+
+def test_chunking_token_based_stream():
+    """Test that a stream is chunked within the token budget, covering the whole text."""
+    text_pieces = [FULL_TEXT[i:i + 100] for i in range(0, len(FULL_TEXT), 100)]
+    chunks = list(Chunking(text_stream=iter(text_pieces)).iter_token_based(max_tokens=8, overlap_tokens=0))
+
+    assert all(count_tokens(chunk) <= 8 for chunk in chunks)
+    assert "".join(chunks) == FULL_TEXT